@@ -1,6 +1,10 @@
 import streamlit as st
 from ui_modules.input_ui.input_panel import render_input_panel
 from ui_modules.output_ui.output_panel import render_output_panel
+from utils.warmup import start_warmup
+
+# 后台预热（每个进程一次）：导入输出模块、解析数据并预计算默认 / 常用配置
+start_warmup()
 
 # 页面配置
 st.set_page_config(page_title="农村光伏经济评估系统", layout="wide")
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from utils.allocation import (
+    STAKEHOLDERS, allocate, build_item_matrix, build_share_matrix, conservation_error, resolve_shares,
+    stakeholder_table,
+)
+
+
+@pytest.fixture
+def item_matrix():
+    rng = np.random.default_rng(1)
+    income = [{"使用年份": y, "售电收益（元）": a, "自用收益（元）": b, "总收入（元）": a + b}
+              for y, (a, b) in enumerate(rng.uniform(0, 5_000, size=(20, 2)), start=1)]
+    expense = [{"使用年份": y, "运维费用（元）": a, "税费（元）": b, "总支出（元）": a + b}
+               for y, (a, b) in enumerate(rng.uniform(0, 1_000, size=(20, 2)), start=1)]
+    return build_item_matrix(income, expense)
+
+
+def project_totals(item_matrix):
+    values, kinds = item_matrix["values"], item_matrix["kinds"]
+    income = values[:, kinds > 0].sum(axis=1)
+    expense = values[:, kinds < 0].sum(axis=1)
+    return income, expense
+
+
+def test_item_matrix_excludes_totals(item_matrix):
+    assert item_matrix["items"] == ["售电收益（元）", "自用收益（元）", "运维费用（元）", "税费（元）"]
+    assert list(item_matrix["years"]) == list(range(1, 21))
+
+
+def test_allocation_conserves_project_totals(item_matrix):
+    items = item_matrix["items"]
+    shares = {"农户": dict(zip(items, [0.6, 1.0, 0.2, 0.5])), "企业": dict(zip(items, [0.3, 0.0, 0.8, 0.5]))}
+    matrix = build_share_matrix(items, shares)
+    assert np.allclose(conservation_error(matrix), 0.0)
+
+    result = allocate(item_matrix, matrix)
+    income, expense = project_totals(item_matrix)
+    assert np.allclose(result["income"].sum(axis=1), income)
+    assert np.allclose(result["expense"].sum(axis=1), expense)
+    assert np.allclose(result["net"], result["income"] - result["expense"])
+
+    # 村集体承接余额
+    village = result["income"][:, STAKEHOLDERS.index("村集体")]
+    assert np.allclose(village, item_matrix["values"][:, 0] * 0.1)
+
+
+def test_batched_share_matrices_conserve(item_matrix):
+    items = item_matrix["items"]
+    rng = np.random.default_rng(2)
+    farmer = rng.uniform(0, 1, size=(50, len(items)))
+    batch = np.stack([build_share_matrix(items, {"农户": dict(zip(items, row))}) for row in farmer])
+    result = allocate(item_matrix, batch)
+    income, expense = project_totals(item_matrix)
+    assert result["net"].shape == (50, 20, len(STAKEHOLDERS))
+    assert np.allclose(result["net"].sum(axis=-1), income - expense)
+
+
+def test_unbalanced_shares_are_rejected(item_matrix):
+    items = item_matrix["items"]
+    shares = {"农户": dict.fromkeys(items, 0.7), "企业": dict.fromkeys(items, 0.7), "村集体": {}}
+    with pytest.raises(ValueError):
+        allocate(item_matrix, build_share_matrix(items, shares))
+
+
+def test_page_defaults_conserve(item_matrix):
+    items = item_matrix["items"]
+    shares = resolve_shares(items, {"农户": dict.fromkeys(items, 0.4)})
+    assert shares["企业"] == pytest.approx(dict.fromkeys(items, 0.6))
+    assert np.allclose(conservation_error(build_share_matrix(items, shares)), 0.0)
+    assert np.allclose(conservation_error(build_share_matrix(items, resolve_shares(items, {}))), 0.0)
+
+
+def test_stakeholder_table_totals(item_matrix):
+    items = item_matrix["items"]
+    result = allocate(item_matrix, build_share_matrix(items, {"农户": dict.fromkeys(items, 0.25)}))
+    table = stakeholder_table(item_matrix, result, "农户")
+    income, _ = project_totals(item_matrix)
+    assert [row["农户总收入（元）"] for row in table] == pytest.approx(income * 0.25)
@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+from utils.export import iter_portfolio_tables, portfolio_params
+from utils.param_paths import series_from_inputs
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "user_inputs.yaml")
+
+
+@pytest.fixture
+def inputs():
+    with open(INPUT_PATH, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+def test_ids_only_table_yields_one_project_per_row(inputs):
+    df = pd.DataFrame({"项目编号": [f"P{i:04d}" for i in range(1, 1001)]})
+    params = portfolio_params(df, inputs)
+    assert {len(values) for values in params.values()} == {1000}
+
+    tables = list(iter_portfolio_tables(params, df["项目编号"].to_numpy(), chunk_size=300))
+    investment = pd.concat([t["初始投入"] for t in tables], ignore_index=True)
+    assert investment["项目编号"].tolist() == df["项目编号"].tolist()
+    assert investment["初始投入总计"].nunique() == 1
+
+
+def test_uploaded_columns_override_inputs(inputs):
+    df = pd.DataFrame({"项目编号": ["A", "B"], "太阳能板面积（㎡）": [20.0, 80.0]})
+    params = portfolio_params(df, inputs)
+    assert params["area"].tolist() == [20.0, 80.0]
+    net = next(iter_portfolio_tables(params, df["项目编号"].to_numpy()))["净现金流"]
+    first_year = net[net["使用年份"] == 1].set_index("项目编号")["当年净现金流（元）"]
+    assert first_year["A"] > first_year["B"]
+
+
+def test_per_year_table_applies_to_portfolio(inputs):
+    inputs["逐年参数"] = [{"使用年份": 3, "售电电价": 1.0}]
+    params = portfolio_params(pd.DataFrame({"项目编号": ["A"]}), inputs)
+    plain = next(iter_portfolio_tables(params))["年度收支"]
+    stepped = next(iter_portfolio_tables(params, series=series_from_inputs(inputs)))["年度收支"]
+
+    column = "售电收益（元）"
+    assert np.allclose(plain[column].iloc[:2], stepped[column].iloc[:2])
+    assert np.all(stepped[column].iloc[2:].to_numpy() > plain[column].iloc[2:].to_numpy())
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from utils.irradiance import _build_index, _neighbours, build_dataset, get_grid, lookup, lookup_place
+
+
+def _brute_force(grid, lat, lon, k):
+    lats, lons = np.array(grid["lat"]), np.array(grid["lon"])
+    scale = np.cos(np.radians(lat)) ** 2
+    d2 = (lats - lat) ** 2 + scale * (lons - lon) ** 2
+    return np.sort(d2)[:k]
+
+
+@pytest.fixture(scope="module")
+def grid():
+    rng = np.random.default_rng(0)
+    # 均匀分布叠加一簇密集点，网格中既有空格也有拥挤的格子
+    lat = np.concatenate([rng.uniform(20, 45, 3000), rng.normal(30, 0.05, 500)])
+    lon = np.concatenate([rng.uniform(100, 120, 3000), rng.normal(110, 0.05, 500)])
+    data = {"lat": lat.astype(np.float32), "lon": lon.astype(np.float32),
+            "annual": rng.uniform(1000, 1800, lat.size).astype(np.float32)}
+    return _build_index(data, cell=0.5)
+
+
+@pytest.mark.parametrize("k", [1, 4, 16])
+def test_neighbours_match_brute_force(grid, k):
+    rng = np.random.default_rng(k)
+    queries = np.column_stack([rng.uniform(15, 50, 200), rng.uniform(95, 125, 200)])
+    queries = np.vstack([queries, [[30.0, 110.0], [60.0, 80.0], [20.0, 100.0]]])
+    for lat, lon in queries:
+        found = np.array([d for d, _ in _neighbours(grid, lat, lon, k)])
+        assert np.allclose(found, _brute_force(grid, lat, lon, k))
+
+
+def test_neighbours_returns_all_points_when_k_exceeds_size():
+    data = {"lat": np.array([30.0, 30.2], np.float32), "lon": np.array([110.0, 110.3], np.float32),
+            "annual": np.array([1200.0, 1400.0], np.float32)}
+    grid = _build_index(data, cell=0.1)
+    assert len(_neighbours(grid, 30.1, 110.1, 5)) == 2
+
+
+def test_lookup_exact_point_and_place(tmp_path):
+    csv = tmp_path / "grid.csv"
+    csv.write_text("纬度,经度,年辐射量,地名\n30.0,110.0,1200,甲\n30.5,110.5,1600,乙\n31.0,111.0,1400,丙\n",
+                   encoding="utf-8")
+    npz = str(tmp_path / "grid.npz")
+    assert build_dataset(str(csv), npz) == 3
+    assert get_grid(npz) is get_grid(npz)
+
+    assert lookup(30.5, 110.5, path=npz)["年辐射量"] == 1600
+    assert lookup_place("丙", path=npz)["年辐射量"] == 1400
+    assert lookup_place("丁", path=npz) is None
+    assert lookup(30.0, 110.0, path=str(tmp_path / "missing.npz")) is None
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from utils.loan import amortize, amortize_grid, annual_schedule, loan_payment_matrix
+
+
+def check_schedule(schedule, amount):
+    assert np.allclose(schedule["payment"], schedule["interest"] + schedule["principal"])
+    assert np.allclose(schedule["principal"].sum(axis=1), amount)
+    assert np.allclose(schedule["balance"][:, -1], 0.0, atol=1e-6)
+    assert np.all(schedule["balance"] >= -1e-9)
+
+
+@pytest.mark.parametrize("method", ["等额本息", "等额本金"])
+@pytest.mark.parametrize("compounding", ["按年计息", "按月计息"])
+def test_principal_repaid_in_full(method, compounding):
+    amount = np.array([10_000.0, 50_000.0, 123_456.0])
+    schedule = amortize(amount, [0.0, 0.04, 0.09], [5, 10, 20], method, compounding=compounding)
+    check_schedule(schedule, amount)
+    check_schedule(annual_schedule(schedule), amount)
+
+
+def test_equal_payment_is_constant_and_matches_annuity():
+    schedule = amortize(100_000.0, 0.05, 10, "等额本息")
+    payment = schedule["payment"][0]
+    expected = 100_000.0 * 0.05 / (1 - 1.05 ** -10)
+    assert np.allclose(payment, expected)
+
+
+def test_equal_principal_repays_same_principal_each_period():
+    schedule = amortize(120_000.0, 0.06, 12, "等额本金", compounding="按月计息")
+    assert np.allclose(schedule["principal"][0], 120_000.0 / 144)
+
+
+def test_grace_period_pays_interest_only():
+    schedule = amortize(100_000.0, 0.05, 10, "等额本息", grace_years=3)
+    check_schedule(schedule, 100_000.0)
+    assert np.allclose(schedule["principal"][0, :3], 0.0)
+    assert np.allclose(schedule["interest"][0, :3], 5_000.0)
+    # 宽限期后按剩余 7 期等额本息摊还
+    assert np.allclose(schedule["payment"][0, 3:], 100_000.0 * 0.05 / (1 - 1.05 ** -7))
+
+
+def test_grace_not_shorter_than_term_is_rejected():
+    with pytest.raises(ValueError):
+        amortize([10_000.0, 10_000.0], 0.05, [5, 3], "等额本息", grace_years=3)
+
+
+@pytest.mark.parametrize("method", ["等额本息", "等额本金"])
+def test_prepayment_reduces_interest_and_keeps_term(method):
+    base = amortize(100_000.0, 0.05, 10, method)
+    prepaid = amortize(100_000.0, 0.05, 10, method, prepay_year=3, prepay_amount=30_000.0)
+    check_schedule(prepaid, 100_000.0)
+    assert prepaid["interest"].sum() < base["interest"].sum()
+    assert prepaid["balance"][0, 2] == pytest.approx(base["balance"][0, 2] - 30_000.0)
+    assert prepaid["payment"][0, -1] > 0
+
+
+def test_prepayment_can_settle_the_loan():
+    schedule = amortize(100_000.0, 0.05, 10, "等额本息", prepay_year=4, prepay_amount=np.inf)
+    check_schedule(schedule, 100_000.0)
+    assert np.allclose(schedule["payment"][0, 4:], 0.0)
+
+
+def test_grid_matches_individual_loans():
+    loans = amortize_grid([20_000.0, 40_000.0], [0.03, 0.06], [5, 8], ["等额本息", "等额本金"])
+    grid = loans["grid"]
+    payments = loan_payment_matrix(grid["loan_amount"], grid["annual_rate"], grid["years"], grid["method"])
+    for i in range(len(grid["loan_amount"])):
+        single = loan_payment_matrix(grid["loan_amount"][i], grid["annual_rate"][i], grid["years"][i],
+                                     grid["method"][i], horizon=payments.shape[1])
+        assert np.allclose(payments[i], single[0])
@@ -0,0 +1,55 @@
+import numpy as np
+import numpy_financial as npf
+import pytest
+
+from utils.economics import batch_irr, batch_npv
+from utils.metrics import batch_payback, breakeven_period, cashflow_metrics
+
+
+@pytest.fixture
+def cashflows():
+    rng = np.random.default_rng(0)
+    flows = rng.uniform(500.0, 5_000.0, size=(200, 25))
+    flows[:, 0] = -rng.uniform(5_000.0, 60_000.0, size=200)
+    return flows
+
+
+def test_batch_npv_matches_numpy_financial(cashflows):
+    rates = np.linspace(0.0, 0.12, len(cashflows))
+    expected = [npf.npv(r, row) for r, row in zip(rates, cashflows)]
+    assert np.allclose(batch_npv(cashflows, rates), expected)
+    assert np.allclose(batch_npv(cashflows, 0.05), [npf.npv(0.05, row) for row in cashflows])
+
+
+def test_batch_irr_matches_numpy_financial(cashflows):
+    expected = np.array([npf.irr(row) for row in cashflows])
+    assert np.allclose(batch_irr(cashflows), expected, atol=1e-8)
+
+
+def test_batch_irr_handles_negative_rates_and_missing_roots():
+    flows = np.array([
+        [-10_000.0] + [500.0] * 10,   # 未回本，IRR 为负
+        [-10_000.0] + [-100.0] * 10,  # 无变号，IRR 不存在
+    ])
+    irr = batch_irr(flows)
+    assert irr[0] == pytest.approx(npf.irr(flows[0]), abs=1e-8)
+    assert np.isnan(irr[1])
+
+
+def test_payback_interpolates_first_crossing():
+    flows = np.array([[-1_000.0, 400.0, 400.0, 400.0], [-1_000.0, 100.0, 100.0, 100.0]])
+    years = np.arange(1, 5)
+    assert batch_payback(flows, years)[0] == pytest.approx(3.5)
+    assert np.isnan(batch_payback(flows, years)[1])
+    assert breakeven_period(flows, years)[0] == 4
+
+
+def test_cashflow_metrics_dynamic_payback_and_roi(cashflows):
+    years = np.arange(1, cashflows.shape[1] + 1)
+    metrics = cashflow_metrics(cashflows, years, rate=np.full(len(cashflows), 0.05),
+                               investment=-cashflows[:, 0])
+    present = cashflows * 1.05 ** -np.arange(cashflows.shape[1])
+    assert np.allclose(metrics["present"], present)
+    assert np.allclose(metrics["dynamic_payback"], batch_payback(present, years), equal_nan=True)
+    assert np.all((metrics["dynamic_payback"] >= metrics["payback"]) | np.isnan(metrics["dynamic_payback"]))
+    assert np.allclose(metrics["roi"], cashflows.sum(axis=1) / -cashflows[:, 0])
@@ -0,0 +1,70 @@
+import os
+
+import numpy as np
+import pytest
+import yaml
+
+from utils.economics import batch_npv, evaluate_projects, extract_project_params, stakeholder_cashflows
+from utils.negotiation import feasible_mask, negotiation_frontier, splits_table, sweep_splits
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "user_inputs.yaml")
+AXES = {
+    "investment_ratio": np.linspace(0, 1, 5),
+    "income_ratio": np.linspace(0.2, 0.8, 4),
+    "expense_ratio": [0.0, 0.5, 1.0],
+    "rent_price": [0.0, 5.0, 10.0],
+}
+
+
+@pytest.fixture(scope="module")
+def inputs():
+    with open(INPUT_PATH, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+@pytest.fixture(scope="module")
+def result(inputs):
+    return sweep_splits(inputs, AXES, loans={}, rent_area=100.0, rent_years=10, batch_size=37)
+
+
+def test_split_conserves_project_npv(inputs, result):
+    params = extract_project_params(inputs)
+    project = evaluate_projects(params)
+    total = batch_npv(stakeholder_cashflows(project), params["discount_rate"])[0]
+    # 分成与租金只在双方之间转移，双方 NPV 之和恒等于整体项目 NPV
+    assert result["n_splits"] == 5 * 4 * 3 * 3
+    assert np.allclose(result["农户"]["npv"] + result["企业"]["npv"], total)
+    assert np.allclose(result["农户"]["upfront"] + result["企业"]["upfront"], project["initial_investment"])
+
+
+def test_loans_shift_npv_by_a_constant(inputs, result):
+    loans = {"农户": {"amount": 20000, "rate": 0.06, "years": 5}}
+    with_loan = sweep_splits(inputs, AXES, loans=loans, rent_area=100.0, rent_years=10)
+    shift = with_loan["农户"]["npv"] - result["农户"]["npv"]
+    assert np.allclose(shift, shift[0])
+    assert np.allclose(with_loan["企业"]["npv"], result["企业"]["npv"])
+
+
+def test_frontier_is_exactly_the_non_dominated_set(result):
+    mask = feasible_mask(result, min_npv={"企业": 0.0})
+    front = negotiation_frontier(result, "npv", "irr", mask=mask)
+    farmer, enterprise = result["农户"]["npv"], result["企业"]["irr"]
+
+    rows = np.flatnonzero(mask & np.isfinite(farmer) & np.isfinite(enterprise))
+    expected = [i for i in rows
+                if not np.any((farmer[rows] >= farmer[i]) & (enterprise[rows] >= enterprise[i])
+                              & ((farmer[rows] > farmer[i]) | (enterprise[rows] > enterprise[i])))]
+    assert sorted(front.tolist()) == sorted(expected)
+    assert np.all(np.diff(farmer[front]) <= 0)
+    assert np.all(np.diff(enterprise[front]) >= 0)
+
+
+def test_feasible_mask_and_table(result):
+    mask = feasible_mask(result, min_irr={"农户": 0.05}, max_payback={"企业": 15})
+    assert np.all(result["农户"]["irr"][mask] >= 0.05)
+    assert np.all(result["企业"]["payback"][mask] <= 15)
+    assert feasible_mask(result).all()
+
+    table = splits_table(result, [0, result["n_splits"] - 1])
+    assert table["农户出资比例（%）"].tolist() == [0.0, 100.0]
+    assert table["屋顶租金单价（元/㎡·年）"].tolist() == [0.0, 10.0]
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.online_stats import _merge, _update, correlations, empty_stats, sample_size, sync_stats, update_stats
+from utils.param_store import append_shared_yaml_list
+
+OUTPUT = "[输出]静态净现值（NPV）"
+
+
+def make_entries(n, seed=0, day="2026-01-01"):
+    rng = np.random.default_rng(seed)
+    area = rng.uniform(10, 100, n)
+    price = rng.uniform(0.3, 0.6, n)
+    npv = 300 * area + 20_000 * price + rng.normal(0, 2_000, n)
+    entries = [{
+        "timestamp": f"{day} 12:00:{i % 60:02d}",
+        "input_parameters": {"光伏发电参数": {"太阳能板面积（㎡）": float(a), "城市": "北京"},
+                             "经济分析方法参数配置": {"售电电价": float(p)}},
+        "output_results": {"静态净现值（NPV）": float(v)},
+    } for i, (a, p, v) in enumerate(zip(area, price, npv))]
+    return entries, {"[输入]光伏发电参数/太阳能板面积（㎡）": area, "[输入]经济分析方法参数配置/售电电价": price}, npv
+
+
+def test_welford_matches_numpy():
+    rng = np.random.default_rng(3)
+    x = rng.normal(5, 2, 500)
+    y = 3 * x + rng.normal(0, 4, 500)
+    s = [0.0] * 6
+    for a, b in zip(x, y):
+        _update(s, a, b)
+    assert s[0] == 500
+    assert s[1] == pytest.approx(x.mean())
+    assert s[3] / s[0] == pytest.approx(x.var())
+    assert s[5] / (s[3] * s[4]) ** 0.5 == pytest.approx(np.corrcoef(x, y)[0, 1])
+
+
+def test_merge_equals_single_pass():
+    rng = np.random.default_rng(4)
+    x, y = rng.normal(size=300), rng.normal(size=300)
+    whole, left, right = [0.0] * 6, [0.0] * 6, [0.0] * 6
+    for i, (a, b) in enumerate(zip(x, y)):
+        _update(whole, a, b)
+        _update(left if i < 120 else right, a, b)
+    assert _merge(left, right) == pytest.approx(whole)
+
+
+def test_correlations_match_corrcoef():
+    entries, inputs, npv = make_entries(400)
+    stats = empty_stats()
+    for entry in entries:
+        update_stats(stats, entry)
+
+    result = correlations(stats, OUTPUT)
+    expected = pd.Series({key: np.corrcoef(values, npv)[0, 1] for key, values in inputs.items()})
+    assert result.sort_index().to_numpy() == pytest.approx(expected.sort_index().to_numpy())
+    assert sample_size(stats, OUTPUT) == 400
+
+
+def test_incremental_sync_matches_full_rebuild(tmp_path):
+    log_path = str(tmp_path / "sensitivity_log.yaml")
+    stats_path = str(tmp_path / "stats.json")
+    entries, _, _ = make_entries(60, seed=5)
+
+    for i, entry in enumerate(entries):
+        append_shared_yaml_list(log_path, entry)
+        if i % 7 == 0:
+            sync_stats(log_path, stats_path)
+    incremental = sync_stats(log_path, stats_path)
+    rebuilt = sync_stats(log_path, str(tmp_path / "rebuilt.json"))
+
+    assert incremental["entries"] == rebuilt["entries"] == 60
+    for key, s in rebuilt["total"].items():
+        assert incremental["total"][key] == pytest.approx(s)
+
+
+def test_rewritten_log_triggers_rebuild(tmp_path):
+    log_path = str(tmp_path / "sensitivity_log.yaml")
+    stats_path = str(tmp_path / "stats.json")
+    first, _, _ = make_entries(20, seed=6)
+    for entry in first:
+        append_shared_yaml_list(log_path, entry)
+    sync_stats(log_path, stats_path)
+
+    (tmp_path / "sensitivity_log.yaml").unlink()
+    second, _, _ = make_entries(5, seed=7)
+    for entry in second:
+        append_shared_yaml_list(log_path, entry)
+    assert sync_stats(log_path, stats_path)["entries"] == 5
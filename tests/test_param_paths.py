@@ -0,0 +1,68 @@
+import numpy as np
+
+from utils.param_paths import apply_series, escalate, limit_years, parameter_paths, series_from_inputs
+
+YEARS = np.arange(1, 6)
+
+
+def test_escalate_compounds_from_first_year():
+    path = escalate(100.0, 0.1, YEARS)
+    assert path.shape == (1, 5)
+    assert np.allclose(path[0], 100.0 * 1.1 ** np.arange(5))
+
+
+def test_escalate_without_growth_stays_a_column():
+    path = escalate(np.array([1.0, 2.0]), 0.0, YEARS)
+    assert path.shape == (2, 1)
+    assert np.allclose(path[:, 0], [1.0, 2.0])
+
+
+def test_escalate_per_scenario_growth():
+    path = escalate(10.0, np.array([0.0, 0.5]), YEARS)
+    assert path.shape == (2, 5)
+    assert np.allclose(path[0], 10.0)
+    assert np.allclose(path[1], 10.0 * 1.5 ** np.arange(5))
+
+
+def test_limit_years_cuts_after_subsidy_period():
+    path = limit_years(np.array([5.0, 5.0]), np.array([2, 4]), YEARS)
+    assert np.allclose(path, [[5, 5, 0, 0, 0], [5, 5, 5, 5, 0]])
+
+
+def test_limit_years_covering_lifetime_keeps_column():
+    path = limit_years(5.0, np.inf, YEARS)
+    assert path.shape == (1, 1)
+
+
+def test_apply_series_steps_and_holds():
+    path = np.full((2, 5), 1.0)
+    stepped = apply_series(path, YEARS, {4: 3.0, 2: 2.0})
+    assert np.allclose(stepped, [[1, 2, 2, 3, 3]] * 2)
+
+
+def test_apply_series_without_points_is_identity():
+    path = np.ones((1, 5))
+    assert apply_series(path, YEARS, {}) is path
+    assert apply_series(path, YEARS, None) is path
+
+
+def test_parameter_paths_series_overrides_growth():
+    params = {"sell_price": 0.4, "sell_price_growth": 0.1, "use_price": 0.5, "subsidy": 100.0,
+              "subsidy_years": 2, "om_cost": 10.0}
+    paths = parameter_paths(params, YEARS, {"sell_price": {3: 1.0}})
+    assert np.allclose(paths["sell_price"][0, :2], [0.4, 0.44])
+    assert np.allclose(paths["sell_price"][0, 2:], 1.0)
+    assert np.allclose(paths["subsidy"][0], [100, 100, 0, 0, 0])
+    assert paths["use_price"].shape == (1, 1)
+
+
+def test_series_from_inputs_skips_blank_cells():
+    inputs = {"逐年参数": [
+        {"使用年份": 3, "售电电价": 0.5, "用电电价": None},
+        {"使用年份": float("nan"), "售电电价": 9.0},
+        {"使用年份": 6, "售电电价": float("nan"), "年运维成本": 20.0},
+    ]}
+    series = series_from_inputs(inputs)
+    assert set(series) == {"sell_price", "om_cost"}
+    assert list(series["sell_price"]) == [3]
+    assert list(series["om_cost"]) == [6]
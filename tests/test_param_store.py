@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+import utils.param_store as param_store
+from utils.storage import load_file
+
+
+@pytest.fixture
+def session(monkeypatch, tmp_path):
+    """
+    开启持久化的会话，会话目录位于临时目录下
+    """
+    state = {"session_id": "0" * 32, "documents": {}}
+    monkeypatch.setattr(param_store, "PERSIST_SESSIONS", True)
+    monkeypatch.setattr(param_store, "SESSION_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(param_store, "_session_state", lambda: state)
+    return os.path.join(str(tmp_path), state["session_id"])
+
+
+def test_async_writes_persist_latest_snapshot(session):
+    for value in range(5):
+        param_store.write_document_async("farmer_cashflow.yaml", {"贷款额度（元）": value})
+    param_store.wait_for_pending_writes()
+
+    assert param_store.read_document("farmer_cashflow.yaml") == {"贷款额度（元）": 4}
+    path = os.path.join(session, param_store.storage_path("farmer_cashflow.yaml"))
+    assert load_file(path) == {"贷款额度（元）": 4}
+
+
+def test_failed_write_is_reported(session, monkeypatch, caplog):
+    def fail(path, raw):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(param_store, "atomic_write_bytes", fail)
+    param_store.write_document_async("enterprise_cashflow.yaml", {"a": 1})
+
+    with pytest.raises(OSError, match="No space left on device"):
+        param_store.wait_for_pending_writes()
+    assert "落盘失败" in caplog.text
+    # 内存中的文档不受影响，错误只报告一次
+    assert param_store.read_document("enterprise_cashflow.yaml") == {"a": 1}
+    param_store.wait_for_pending_writes()
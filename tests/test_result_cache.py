@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from utils import result_cache
+from utils.result_cache import cache_stats, cached_result, canonical_hash, clear_result_cache
+
+
+@pytest.fixture(autouse=True)
+def cache(monkeypatch):
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(result_cache, "MEMORY_BUDGET_BYTES", 3000)
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: clock["now"])
+    clear_result_cache()
+    yield clock
+    clear_result_cache()
+
+
+def _array(value):
+    # 1000 字节
+    return lambda: np.full(125, value, dtype=float)
+
+
+def test_canonical_hash_ignores_key_order_and_int_float():
+    assert canonical_hash({"a": 50, "b": [1, 2]}) == canonical_hash({"b": [1.0, 2.0], "a": 50.0})
+    assert canonical_hash({"a": 50}) != canonical_hash({"a": 51})
+
+
+def test_hits_return_copies():
+    first = cached_result("ns", {"x": 1}, _array(1.0))
+    first[:] = -1
+    again = cached_result("ns", {"x": 1.0}, _array(2.0))
+    assert np.all(again == 1.0)
+    assert cached_result("other", {"x": 1}, _array(3.0))[0] == 3.0
+    stats = cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+
+
+def test_budget_evicts_least_recently_used():
+    for i in range(3):
+        cached_result("ns", {"i": i}, _array(i))
+    cached_result("ns", {"i": 0}, _array(-1))  # 0 变为最近使用
+    cached_result("ns", {"i": 3}, _array(3))
+
+    stats = cache_stats()
+    assert stats["evictions"] == 1
+    assert stats["bytes"] <= 3000
+    assert cached_result("ns", {"i": 0}, _array(-1))[0] == 0
+    assert cached_result("ns", {"i": 1}, _array(-1))[0] == -1
+
+
+def test_oversized_results_are_not_cached():
+    big = cached_result("ns", {"big": True}, lambda: np.zeros(1000))
+    assert big.nbytes > 3000
+    assert cache_stats()["entries"] == 0
+
+
+def test_expired_entries_are_recomputed(cache):
+    cached_result("ns", {"x": 1}, _array(1.0), ttl=60)
+    cache["now"] += 59
+    assert cached_result("ns", {"x": 1}, _array(2.0), ttl=60)[0] == 1.0
+    cache["now"] += 2
+    assert cached_result("ns", {"x": 1}, _array(2.0), ttl=60)[0] == 2.0
+    stats = cache_stats()
+    assert (stats["expirations"], stats["entries"], stats["bytes"]) == (1, 1, 1000)
+
+
+def test_failed_compute_is_not_cached():
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cached_result("ns", {"x": 1}, fail)
+    assert cached_result("ns", {"x": 1}, _array(1.0))[0] == 1.0
@@ -0,0 +1,73 @@
+import copy
+import os
+
+import pytest
+import yaml
+
+from utils.scenario_store import import_log_entries, query_scenarios, record_scenario, scenario_hash
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "user_inputs.yaml")
+OUTPUTS = {"静态净现值（NPV）": 12_345.6, "静态内部收益率（IRR）": 0.081, "静态投资回收期（年）": 9.5}
+
+
+@pytest.fixture
+def inputs():
+    with open(INPUT_PATH, encoding="utf-8") as f:
+        return yaml.safe_load(f)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "history.db")
+
+
+def log_entry(inputs, timestamp="2026-01-01 12:00:00"):
+    """
+    与敏感性日志记录的条目结构一致（只含三个参数模块）
+    """
+    return {
+        "timestamp": timestamp,
+        "input_parameters": {
+            "光伏发电参数": inputs["2光伏发电参数"],
+            "项目建设参数配置": inputs["3项目建设参数配置"],
+            "经济分析方法参数配置": inputs["4经济分析方法参数配置"],
+        },
+        "output_results": OUTPUTS,
+    }
+
+
+def test_hash_ignores_descriptive_sections(inputs):
+    changed = copy.deepcopy(inputs)
+    changed["1制度配置"]["组织形式"] = "合作社"
+    assert scenario_hash(changed) == scenario_hash(inputs)
+
+    changed["4经济分析方法参数配置"]["售电电价"] = 0.5
+    assert scenario_hash(changed) != scenario_hash(inputs)
+
+    with_series = copy.deepcopy(inputs)
+    with_series["逐年参数"] = [{"使用年份": 5, "年补贴金额": 0.1}]
+    assert scenario_hash(with_series) != scenario_hash(inputs)
+
+
+def test_import_merges_with_live_record(inputs, db_path):
+    record_scenario(inputs, OUTPUTS, db_path)
+    assert import_log_entries([log_entry(inputs)], db_path) == 0
+
+    rows = query_scenarios(db_path=db_path)
+    assert len(rows) == 1
+    assert rows["评估次数"].iloc[0] == 2
+
+
+def test_import_is_idempotent_and_counts_new_scenarios(inputs, db_path):
+    other = copy.deepcopy(inputs)
+    other["2光伏发电参数"]["太阳能板面积（㎡）"] = 80.0
+    entries = [log_entry(inputs), log_entry(inputs, "2026-01-02 12:00:00"), log_entry(other)]
+
+    # 两条相同方案的日志合并为一行
+    assert import_log_entries(entries, db_path) == 2
+    assert import_log_entries(entries, db_path) == 0
+
+    rows = query_scenarios(order_by="hit_count", db_path=db_path)
+    assert rows["评估次数"].tolist() == [2, 1]
+    assert rows["首次评估时间"].iloc[0] == "2026-01-01 12:00:00"
+    assert rows["最近评估时间"].iloc[0] == "2026-01-02 12:00:00"
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+import utils.sensitivity as sensitivity
+from utils.sensitivity import saltelli_sample, sobol_analysis
+
+# Ishigami 函数（a=7, b=0.1）的解析 Sobol 指数
+A, B = 7.0, 0.1
+VARIANCE = A ** 2 / 8 + B * np.pi ** 4 / 5 + B ** 2 * np.pi ** 8 / 18 + 0.5
+V1 = 0.5 * (1 + B * np.pi ** 4 / 5) ** 2
+V2 = A ** 2 / 8
+V13 = B ** 2 * np.pi ** 8 * (1 / 18 - 1 / 50)
+EXPECTED_S1 = np.array([V1, V2, 0.0]) / VARIANCE
+EXPECTED_ST = np.array([V1 + V13, V2, V13]) / VARIANCE
+
+NAMES = ["area", "efficiency", "pr"]
+RANGES = {name: (-np.pi, np.pi) for name in NAMES}
+
+
+def ishigami(x):
+    return np.sin(x[:, 0]) + A * np.sin(x[:, 1]) ** 2 + B * x[:, 2] ** 4 * np.sin(x[:, 0])
+
+
+@pytest.fixture
+def ishigami_model(monkeypatch):
+    """
+    以 Ishigami 函数替换项目模型：npv 为函数值，irr 在部分样本上记为 NaN（模拟 IRR 不存在）
+    """
+    def evaluate_design(base_params, names, matrix, batch_size=50_000, series=None):
+        assert names == NAMES
+        values = ishigami(matrix)
+        irr = np.where(np.arange(len(matrix)) % 10 == 0, np.nan, values)
+        return {"npv": values, "irr": irr}
+
+    monkeypatch.setattr(sensitivity, "extract_project_params", lambda inputs: {})
+    monkeypatch.setattr(sensitivity, "evaluate_design", evaluate_design)
+
+
+def indices(df):
+    return df.set_index("参数").loc[[f"{sensitivity.PROJECT_FIELDS[n][0]}/{sensitivity.PROJECT_FIELDS[n][1]}"
+                                     for n in NAMES]]
+
+
+def test_saltelli_sample_is_stratified():
+    sample = saltelli_sample(RANGES, 64, seed=0)
+    for matrix in (sample["A"], sample["B"]):
+        assert matrix.shape == (64, 3)
+        strata = np.floor((matrix + np.pi) / (2 * np.pi) * 64)
+        assert np.all(np.sort(strata, axis=0) == np.arange(64)[:, None])
+
+
+@pytest.mark.parametrize("output", ["npv", "irr"])
+def test_ishigami_indices(ishigami_model, output):
+    result = sobol_analysis({}, RANGES, n_base=2 ** 14, n_bootstrap=200, seed=1)
+    df = indices(result[output])
+    assert df["一阶指数 S1"].to_numpy() == pytest.approx(EXPECTED_S1, abs=0.03)
+    assert df["总效应指数 ST"].to_numpy() == pytest.approx(EXPECTED_ST, abs=0.03)
+    assert np.all(df["S1 下限"] <= df["一阶指数 S1"]) and np.all(df["一阶指数 S1"] <= df["S1 上限"])
+    assert np.all(df["ST 下限"] <= df["总效应指数 ST"]) and np.all(df["总效应指数 ST"] <= df["ST 上限"])
+    assert result["stats"]["evaluations"] == 2 ** 14 * 5
+
+
+def test_invalid_samples_are_dropped(ishigami_model):
+    result = sobol_analysis({}, RANGES, n_base=1024, n_bootstrap=50, seed=2)
+    assert result["stats"]["npv_valid"] == 1.0
+    assert 0.0 < result["stats"]["irr_valid"] < 1.0
+    assert np.all(np.isfinite(result["irr"].drop(columns="参数").to_numpy()))
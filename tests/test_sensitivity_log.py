@@ -0,0 +1,91 @@
+from datetime import datetime
+
+import pytest
+
+from utils.online_stats import correlations, sample_size, sync_stats
+from utils.param_store import append_shared_yaml_list
+from utils.sensitivity_log import compact_log, iter_log_entries, load_summary
+
+NOW = datetime(2026, 10, 19)
+OUTPUT = "[输出]静态净现值（NPV）"
+TIMESTAMPS = [
+    "2026-03-02 10:00:00", "2026-03-15 10:00:00", "2026-04-01 10:00:00",
+    "2026-05-20 10:00:00", "2026-06-30 10:00:00", "2026-07-10 10:00:00",
+    "2026-08-01 10:00:00", "2026-09-01 10:00:00", "2026-10-01 10:00:00", "2026-10-18 10:00:00",
+]
+
+
+def entry(timestamp, area):
+    return {
+        "timestamp": timestamp,
+        "input_parameters": {"光伏发电参数": {"太阳能板面积（㎡）": float(area)}},
+        "output_results": {"静态净现值（NPV）": 300.0 * area + (area % 3) * 500.0},
+    }
+
+
+@pytest.fixture
+def paths(tmp_path):
+    log_path = str(tmp_path / "sensitivity_log.yaml")
+    for i, ts in enumerate(TIMESTAMPS):
+        append_shared_yaml_list(log_path, entry(ts, 10 + 7 * i))
+    # 旧格式与无效条目
+    append_shared_yaml_list(log_path, {"时间": "2026-10-10 10:00:00", "输入参数": {"光伏发电参数": {"太阳能板面积（㎡）": 99.0}},
+                                       "输出参数": {"静态净现值（NPV）": 1.0}})
+    append_shared_yaml_list(log_path, {"timestamp": "2026-10-11 10:00:00", "input_parameters": {}})
+    return log_path, str(tmp_path / "summary.yaml"), str(tmp_path / "stats.json")
+
+
+def test_retention_and_summary(paths):
+    log_path, summary_path, stats_path = paths
+    counts = compact_log(log_path, summary_path, retention_days=90, now=NOW, stats_path=stats_path)
+    assert counts == {"读取": 12, "保留": 5, "汇总": 6, "剔除": 1}
+
+    kept = list(iter_log_entries(log_path))
+    assert [e["timestamp"] for e in kept] == TIMESTAMPS[6:] + ["2026-10-10 10:00:00"]
+    assert all(set(e) == {"timestamp", "input_parameters", "output_results"} for e in kept)
+
+    summary = load_summary(summary_path)
+    assert {month: bucket["条数"] for month, bucket in summary.items()} == {
+        "2026-03": 2, "2026-04": 1, "2026-05": 1, "2026-06": 1, "2026-07": 1,
+    }
+    field = summary["2026-03"]["字段"]["[输入]光伏发电参数/太阳能板面积（㎡）"]
+    assert (field["min"], field["max"], field["mean"]) == (10.0, 17.0, 13.5)
+
+
+def test_compaction_is_idempotent(paths):
+    log_path, summary_path, stats_path = paths
+    compact_log(log_path, summary_path, retention_days=90, now=NOW, stats_path=stats_path)
+    with open(log_path, encoding="utf-8") as f:
+        log_text = f.read()
+    summary = load_summary(summary_path)
+
+    counts = compact_log(log_path, summary_path, retention_days=90, now=NOW, stats_path=stats_path)
+    assert counts == {"读取": 5, "保留": 5, "汇总": 0, "剔除": 0}
+    with open(log_path, encoding="utf-8") as f:
+        assert f.read() == log_text
+    assert load_summary(summary_path) == summary
+
+
+def test_compaction_keeps_full_history_statistics(paths):
+    log_path, summary_path, stats_path = paths
+    before = sync_stats(log_path, stats_path)
+    expected = correlations(before, OUTPUT)
+
+    compact_log(log_path, summary_path, retention_days=90, now=NOW, stats_path=stats_path)
+    after = sync_stats(log_path, stats_path)
+    assert sample_size(after, OUTPUT) == sample_size(before, OUTPUT) == 11
+    assert correlations(after, OUTPUT).to_dict() == pytest.approx(expected.to_dict())
+
+    # 压缩后新追加的条目照常增量同步
+    append_shared_yaml_list(log_path, entry("2026-10-19 09:00:00", 40))
+    assert sample_size(sync_stats(log_path, stats_path), OUTPUT) == 12
+
+
+def test_late_entries_before_previous_cutoff_are_summarized(paths):
+    log_path, summary_path, stats_path = paths
+    compact_log(log_path, summary_path, retention_days=90, now=NOW, stats_path=stats_path)
+    append_shared_yaml_list(log_path, entry("2026-02-01 10:00:00", 50))
+
+    counts = compact_log(log_path, summary_path, retention_days=90, now=NOW, stats_path=stats_path)
+    assert counts["汇总"] == 1
+    assert load_summary(summary_path)["2026-02"]["条数"] == 1
@@ -0,0 +1,51 @@
+import io
+
+import numpy as np
+import pytest
+
+from utils.storage import BACKENDS, dumps, export_yaml, load_file, loads, storage_path, yaml_load
+
+DOCUMENT = {
+    "初始投入计算": {"光伏组件费用": 12_000.5, "逆变器费用": 3_000, "初始投入总计": 15_000.5},
+    "现金流分析": {
+        "年度收入明细": [
+            {"使用年份": year, "售电收益（元）": 1_000.25 * year, "备注": f"第{year}年"}
+            for year in range(1, 26)
+        ],
+        "空列表": [],
+    },
+    "混合列表": [1, "a", {"嵌套": [{"x": 1}, {"x": 2.5}]}],
+    "经济性指标": {"投资回收期": None, "已回收": True},
+}
+
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+def test_round_trip(backend):
+    assert loads(dumps(DOCUMENT, backend), backend) == DOCUMENT
+
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+def test_round_trip_through_file(tmp_path, backend):
+    path = tmp_path / storage_path("user_outputs.yaml", backend)
+    path.write_bytes(dumps(DOCUMENT, backend))
+    assert load_file(str(path)) == DOCUMENT
+
+
+def test_columnar_tables_keep_column_types():
+    load = BACKENDS["columnar"]["load"]
+    data = load(io.BytesIO(dumps(DOCUMENT, "columnar")), as_records=False)
+    table = data["现金流分析"]["年度收入明细"]
+    assert table["使用年份"].dtype == np.int64
+    assert table["售电收益（元）"].dtype == np.float64
+    assert table["备注"][0] == "第1年"
+
+
+def test_unknown_suffix_is_rejected(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_text("a: 1")
+    with pytest.raises(ValueError):
+        load_file(str(path))
+
+
+def test_export_yaml_is_readable():
+    assert yaml_load(export_yaml(DOCUMENT)) == DOCUMENT
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pytest
+import yaml
+
+from utils.economics import extract_project_params
+from utils.sweep import METRICS, grid_axes, load_results, open_sweep, run_sweep
+
+INPUT_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "user_inputs.yaml")
+GRID = {"售电电价": [0.3, 0.4, 0.5], "太阳能板面积（㎡）": {"min": 50, "max": 150, "num": 5},
+        "产品使用寿命": [20, 25]}
+
+
+@pytest.fixture
+def base():
+    with open(INPUT_PATH, encoding="utf-8") as f:
+        return extract_project_params(yaml.safe_load(f))
+
+
+def test_interrupted_sweep_resumes_to_same_result(tmp_path, base):
+    axes = grid_axes(GRID)
+    full = run_sweep(str(tmp_path / "full"), base, axes, chunk_size=7, cashflows=True)
+    assert full["completed_chunks"] == 5
+
+    directory = str(tmp_path / "resumed")
+    seen = []
+    partial = run_sweep(directory, base, axes, chunk_size=7, cashflows=True, max_chunks=2,
+                        progress=lambda done, total: seen.append(done))
+    assert partial["completed_chunks"] == 2
+    assert seen == [7, 14]
+    assert len(load_results(directory)) == 14
+
+    # 只给目录即按 manifest 续跑，已完成的块不再计算
+    resumed = run_sweep(directory, progress=lambda done, total: seen.append(done))
+    assert resumed["completed_chunks"] == 5
+    assert seen == [7, 14, 21, 28, 30]
+
+    a, b = open_sweep(str(tmp_path / "full")), open_sweep(directory)
+    assert np.array_equal(a["metrics"], b["metrics"], equal_nan=True)
+    assert np.array_equal(a["cashflows"], b["cashflows"])
+
+
+def test_results_follow_grid_order(tmp_path, base):
+    directory = str(tmp_path / "sweep")
+    run_sweep(directory, base, grid_axes(GRID), chunk_size=8)
+    df = load_results(directory)
+    assert len(df) == 30
+    assert list(df.columns[-len(METRICS):]) == METRICS
+    # 最后一个参数变化最快
+    assert df["产品使用寿命"].tolist()[:4] == [20, 25, 20, 25]
+    assert df["售电电价"].iloc[0] == pytest.approx(0.3)
+    assert df["售电电价"].iloc[-1] == pytest.approx(0.5)
+    assert open_sweep(directory)["cashflows"] is None
+
+
+def test_resume_rejects_different_definition(tmp_path, base):
+    directory = str(tmp_path / "sweep")
+    run_sweep(directory, base, grid_axes(GRID), chunk_size=8, max_chunks=1)
+    with pytest.raises(ValueError):
+        run_sweep(directory, base, grid_axes({**GRID, "售电电价": [0.3, 0.6]}), chunk_size=8)
+    with pytest.raises(FileNotFoundError):
+        run_sweep(str(tmp_path / "missing"))
+
+
+def test_grid_axes_rejects_unknown_or_empty():
+    with pytest.raises(KeyError):
+        grid_axes({"不存在的参数": [1]})
+    with pytest.raises(ValueError):
+        grid_axes({"售电电价": []})
+    assert grid_axes({"折现率": [5]})["discount_rate"][0] == pytest.approx(0.05)
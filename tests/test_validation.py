@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.validation import compile_rules, invalid_rows, validate_frame
+
+SCHEMAS = {
+    "光伏发电参数": {
+        "太阳能板面积（㎡）": {"type": "number", "min": 1, "max": 1000},
+        "太阳能板转换效率（η）": {"type": "slider", "min": 0.1, "max": 0.3, "step": 0.01},
+        "发电售卖比例": {"type": "slider", "min": 100, "max": 100, "step": 5},
+        "省份": {"type": "select_from_csv"},
+    },
+    "制度配置": {"产权归属": {"type": "select", "options": ["农户", "企业"]}},
+}
+CSV_OPTIONS = {"省份": ["江苏", "浙江"]}
+
+
+@pytest.fixture
+def rules():
+    return compile_rules(SCHEMAS, CSV_OPTIONS)
+
+
+def test_clean_table_passes(rules):
+    df = pd.DataFrame({
+        "太阳能板面积（㎡）": [1, 50.5, 1000],
+        "太阳能板转换效率（η）": [0.1, 0.18, 0.3],
+        "发电售卖比例": [0, 35, 100],
+        "年辐射量": [1200.0, 1400.0, 0.0],
+        "省份": ["江苏", "浙江", "江苏"],
+        "产权归属": ["农户", "企业", "农户"],
+    })
+    errors = validate_frame(df, rules)
+    assert errors.empty
+    assert not invalid_rows(errors, len(df)).any()
+
+
+def test_error_codes(rules):
+    df = pd.DataFrame({
+        "太阳能板面积（㎡）": ["abc", 0.5, 2000, 10, np.nan],
+        "太阳能板转换效率（η）": [0.2, 0.2, 0.2, 0.155, np.inf],
+        "省份": ["江苏", "火星", "浙江", "江苏", "江苏"],
+        "产权归属": ["农户", "农户", "村集体", "农户", "农户"],
+        "未知列": [1, 2, 3, 4, 5],
+    })
+    errors = validate_frame(df, rules)
+    found = {(row, str(param), str(error)) for row, param, error in
+             errors[["行号", "参数", "错误"]].itertuples(index=False)}
+    assert found == {
+        (1, "太阳能板面积（㎡）", "不是有效数值"),
+        (2, "太阳能板面积（㎡）", "小于下限"),
+        (2, "省份", "不在可选项中"),
+        (3, "太阳能板面积（㎡）", "大于上限"),
+        (3, "产权归属", "不在可选项中"),
+        (4, "太阳能板转换效率（η）", "不符合步长"),
+        (5, "太阳能板面积（㎡）", "不是有效数值"),
+        (5, "太阳能板转换效率（η）", "不是有效数值"),
+    }
+    assert errors["行号"].is_monotonic_increasing
+    assert errors.loc[errors["行号"] == 1, "值"].iloc[0] == "abc"
+    assert str(errors.loc[errors["行号"] == 4, "约束"].iloc[0]) == "≥ 0.1，≤ 0.3，步长 0.01"
+    assert invalid_rows(errors, len(df)).tolist() == [True] * 5
+
+
+def test_numeric_option_values_match_as_strings():
+    rules = compile_rules({"m": {"户数": {"type": "select", "options": [1, 2]}}}, {})
+    errors = validate_frame(pd.DataFrame({"户数": [1, 2, 3]}), rules)
+    assert errors["行号"].tolist() == [3]
@@ -1,8 +1,12 @@
 import streamlit as st
 import os
-import yaml
 import pandas as pd
 
+from utils.irradiance import get_grid, lookup, lookup_place, place_names
+from utils.param_paths import PATH_COLUMNS, SERIES_SECTION, YEAR_COLUMN
+from utils.param_store import write_document
+from utils.storage import yaml_load
+
 PARAM_SCHEMA_DIR = "ui_modules/input_ui/input_param_modules"
 INPUT_RECORD_FILE = "user_inputs.yaml"
 IRRADIATION_CSV_PATH = "ui_modules/input_ui/input_param_modules/solar_insolation_city.csv"  # 新增
@@ -10,12 +14,68 @@ IRRADIATION_CSV_PATH = "ui_modules/input_ui/input_param_modules/solar_insolation
 # 加载 YAML
 def load_yaml(file_path):
     with open(file_path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml_load(f)
 
-# 保存输入数据
+# 保存输入数据（写入当前会话）
 def save_inputs(data):
-    with open(INPUT_RECORD_FILE, "w", encoding="utf-8") as f:
-        yaml.dump(data, f, allow_unicode=True)
+    write_document(INPUT_RECORD_FILE, data)
+
+# 高分辨率辐照数据（存在数据文件时可用）：按坐标或地名插值年辐射量
+def render_precise_irradiation():
+    if get_grid() is None:
+        return None
+    if not st.checkbox("📍 按村镇坐标 / 地名查询辐射量", key="precise_irradiation"):
+        return None
+
+    mode = st.radio("查询方式", ["坐标", "地名"], horizontal=True, key="precise_irradiation_mode")
+    if mode == "坐标":
+        lat = st.number_input("纬度", min_value=-90.0, max_value=90.0, value=32.06, format="%.4f")
+        lon = st.number_input("经度", min_value=-180.0, max_value=180.0, value=118.80, format="%.4f")
+        result = lookup(lat, lon)
+        location = {"纬度": lat, "经度": lon}
+    else:
+        names = place_names()
+        if not names:
+            st.info("当前辐照数据不含地名。")
+            return None
+        name = st.selectbox("地名", names)
+        result = lookup_place(name)
+        location = {"地名": name}
+
+    if result is None:
+        return None
+    st.caption(f"反距离加权插值，最近数据点距离 {result['最近点距离（度）']}°")
+    if result["逐月辐射量"]:
+        # 供月度现金流模式按月分摊发电量
+        location["逐月辐射量"] = result["逐月辐射量"]
+    return {"年辐射量": result["年辐射量"], **location}
+
+# 逐年参数表（可选）：阶跃变化或上传的完整序列，自表中某年起覆盖电价 / 补贴 / 运维成本的取值
+def render_parameter_series():
+    columns = [YEAR_COLUMN] + list(PATH_COLUMNS.values())
+    with st.sidebar.expander("逐年参数（可选）", expanded=False):
+        st.caption("自表中某年起取该值并保持到下一次变化，留空的单元格沿用增长率与补贴年限得到的取值。"
+                   "单位与上方参数一致，可上传含“使用年份”及任意参数列的 CSV。")
+        uploaded = st.file_uploader("上传逐年参数（CSV）", type=["csv"], key="parameter_series_upload")
+        if uploaded is not None:
+            table = pd.read_csv(uploaded).reindex(columns=columns)
+            table = table.apply(pd.to_numeric, errors="coerce")
+        else:
+            table = pd.DataFrame({column: pd.Series(dtype=float) for column in columns})
+        table = st.data_editor(table, num_rows="dynamic", hide_index=True, use_container_width=True,
+                               key=f"parameter_series_{uploaded.file_id if uploaded is not None else 'manual'}")
+
+    table = table[table[YEAR_COLUMN] >= 1]
+    records = [
+        {column: (None if pd.isna(row[column]) else
+                  int(row[column]) if column == YEAR_COLUMN else float(row[column])) for column in columns}
+        for _, row in table.sort_values(YEAR_COLUMN).iterrows()
+    ]
+    # 未填写时不写入该部分，保持输入结构（及缓存键）与未使用逐年参数时一致
+    if records:
+        st.session_state["inputs"][SERIES_SECTION] = records
+    else:
+        st.session_state["inputs"].pop(SERIES_SECTION, None)
 
 # 渲染联动省市 + 年辐射量
 def render_solar_module(module_name, schema):
@@ -40,6 +100,9 @@ def render_solar_module(module_name, schema):
     # 获取年辐射量
     matched_row = df[(df["省份"] == selected_province) & (df["城市"] == selected_city)]
     irradiation = float(matched_row["年辐射量"].values[0]) if not matched_row.empty else 0.0
+    location = render_precise_irradiation()
+    if location:
+        irradiation = location.pop("年辐射量")
     st.markdown(f"**年辐射量**: `{irradiation} kWh/m²`")
 
     # 存储联动结果
@@ -47,6 +110,7 @@ def render_solar_module(module_name, schema):
         "省份": selected_province,
         "城市": selected_city,
         "年辐射量": irradiation,  # ✅ 现在是 float 类型
+        **(location or {}),
     }
 
     # 渲染其余通用参数
@@ -131,4 +195,5 @@ def render_input_panel():
 
                 st.session_state["inputs"][module_name][key] = value
 
+    render_parameter_series()
     save_inputs(st.session_state["inputs"])
@@ -1,8 +1,7 @@
 # output_modules/project_overview.py
 
 import streamlit as st
-import yaml
-import os
+from utils.param_store import read_document
 
 MODULE_META = {
     "title": "项目基本情况",
@@ -14,16 +13,11 @@ MODULE_META = {
 USER_INPUT_PATH = "user_inputs.yaml"
 
 def load_user_inputs(path):
-    if not os.path.exists(path):
+    data = read_document(path)
+    if data is None:
         st.error(f"未找到参数文件：{path}")
         return {}
-
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
-    except Exception as e:
-        st.error(f"读取参数文件失败：{e}")
-        return {}
+    return data
 
 def render():
     st.markdown("")
@@ -39,4 +33,5 @@ def render():
     if config:
         st.table([{k: str(v) for k, v in config.items()}])  # 强制转为字符串
     else:
-        st.info("暂无制度配置信息。")
\ No newline at end of file
+        st.info("暂无制度配置信息。")
+
@@ -5,6 +5,8 @@ import importlib.util
 import os
 import glob
 
+from utils.parallel import call_render, prepare_modules
+
 # 必要元信息
 MODULE_META = {
     "category": "经济分析",
@@ -21,47 +23,64 @@ def load_submodule(file_path):
     module_name = os.path.splitext(os.path.basename(file_path))[0]
     spec = importlib.util.spec_from_file_location(module_name, file_path)
     module = importlib.util.module_from_spec(spec)
-    try:
-        spec.loader.exec_module(module)
-        return module_name, module
-    except Exception as e:
-        st.error(f"❌ 子模块 `{module_name}` 加载失败：{e}")
-        return None, None
-
-def render():
-    # st.header("")
+    spec.loader.exec_module(module)
+    return module_name, module
 
-    if not os.path.exists(SUBMODULE_FOLDER):
-        st.warning("未找到子模块文件夹 economics_submodules/")
-        return
-
-    module_files = sorted(glob.glob(os.path.join(SUBMODULE_FOLDER, "*.py")))
+def load_submodules():
+    """
+    加载并排序子模块，返回 (子模块列表, 提示信息列表)；不做页面绘制，可在计算阶段执行
+    """
     modules_to_render = []
+    messages = []
 
-    for file_path in module_files:
-        module_name, module = load_submodule(file_path)
-        if module is None:
+    for file_path in sorted(glob.glob(os.path.join(SUBMODULE_FOLDER, "*.py"))):
+        try:
+            module_name, module = load_submodule(file_path)
+        except Exception as e:
+            messages.append(("error", f"❌ 子模块 `{os.path.basename(file_path)}` 加载失败：{e}"))
             continue
 
         if not hasattr(module, "render") or not hasattr(module, "MODULE_META"):
-            st.warning(f"⚠️ 子模块 `{module_name}` 缺少 `render()` 或 `MODULE_META`，已跳过。")
+            messages.append(("warning", f"⚠️ 子模块 `{module_name}` 缺少 `render()` 或 `MODULE_META`，已跳过。"))
             continue
 
         meta = module.MODULE_META
-        order = meta.get("order", 999)
-        title = meta.get("title", module_name)
-
         modules_to_render.append({
-            "order": order,
-            "title": title,
+            "name": module_name,
+            "module": module,
+            "order": meta.get("order", 999),
+            "title": meta.get("title", module_name),
             "render_fn": module.render
         })
 
-    # 排序后渲染
-    modules_sorted = sorted(modules_to_render, key=lambda x: x["order"])
-    for mod in modules_sorted:
+    return sorted(modules_to_render, key=lambda x: x["order"]), messages
+
+def prepare():
+    """
+    计算阶段：加载子模块并并发执行各子模块的 prepare()
+    """
+    if not os.path.exists(SUBMODULE_FOLDER):
+        return None
+    modules, messages = load_submodules()
+    outcomes = prepare_modules({mod["name"]: mod["module"] for mod in modules})
+    return {"modules": modules, "messages": messages, "outcomes": outcomes}
+
+def render(prepared=None):
+    # st.header("")
+
+    if prepared is None:
+        prepared = prepare()
+    if prepared is None:
+        st.warning("未找到子模块文件夹 economics_submodules/")
+        return
+
+    for level, message in prepared["messages"]:
+        getattr(st, level)(message)
+
+    # 按顺序渲染（子模块之间通过 user_outputs 传递结果，渲染阶段保持串行）
+    for mod in prepared["modules"]:
         with st.expander(f"📌 {mod['title']}", expanded=True):
             try:
-                mod["render_fn"]()
+                call_render(mod["render_fn"], prepared["outcomes"].get(mod["name"]))
             except Exception as e:
                 st.error(f"❌ 渲染模块 `{mod['title']}` 时出错：{e}")
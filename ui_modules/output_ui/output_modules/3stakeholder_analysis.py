@@ -33,7 +33,11 @@ def render():
         st.warning("未找到子模块文件夹 `stakeholder_modules/`，请创建并添加子模块。")
         return
 
-    submodule_files = sorted(glob.glob(os.path.join(SUBMODULE_FOLDER, "*.py")))
+    # 下划线开头的文件为子模块共用的辅助代码，不作为利益相关方页面加载
+    submodule_files = sorted(
+        path for path in glob.glob(os.path.join(SUBMODULE_FOLDER, "*.py"))
+        if not os.path.basename(path).startswith("_")
+    )
     if not submodule_files:
         st.info("暂无可用的利益相关方模块。")
         return
@@ -51,9 +55,12 @@ def render():
             continue
 
         label = module.STAKEHOLDER_META.get("label", module_name)
-        options.append(label)
+        options.append((module.STAKEHOLDER_META.get("order", 999), label))
         module_map[label] = module
 
+    # 按 STAKEHOLDER_META 中的 order 排序
+    options = [label for _, label in sorted(options)]
+
     with st.container():
         # 左上角下拉选择器
         col1, col2 = st.columns([2, 6])
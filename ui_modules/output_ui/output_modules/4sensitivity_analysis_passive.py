@@ -4,6 +4,8 @@ import os
 import streamlit as st
 import importlib.util
 
+from utils.parallel import call_render, prepare_modules
+
 MODULE_META = {
     "title": "敏感性分析面板",
     "category": "经济分析",
@@ -13,11 +15,15 @@ MODULE_META = {
 CHILD_MODULE_FOLDER = "ui_modules/output_ui/output_modules/sensitivity_charts"
 
 def load_child_modules(folder_path):
+    """
+    加载图表子模块，返回 (模块列表, 加载失败提示)；不做页面绘制，可在计算阶段执行
+    """
     modules = []
+    messages = []
     if not os.path.exists(folder_path):
-        return modules
+        return modules, messages
 
-    for file in os.listdir(folder_path):
+    for file in sorted(os.listdir(folder_path)):
         if file.endswith(".py"):
             module_path = os.path.join(folder_path, file)
             module_name = os.path.splitext(file)[0]
@@ -28,19 +34,33 @@ def load_child_modules(folder_path):
                 if hasattr(mod, "render_chart"):
                     modules.append(mod)
             except Exception as e:
-                st.warning(f"❌ 子模块 `{module_name}` 加载失败：{e}")
-    return modules
+                messages.append(f"❌ 子模块 `{module_name}` 加载失败：{e}")
+    return modules, messages
+
+def prepare():
+    """
+    计算阶段：加载子模块并并发执行各子模块的 prepare()
+    """
+    modules, messages = load_child_modules(CHILD_MODULE_FOLDER)
+    outcomes = prepare_modules({mod.__name__: mod for mod in modules})
+    return {"modules": modules, "messages": messages, "outcomes": outcomes}
 
-def render():
+def render(prepared=None):
     # st.markdown("### 📊 敏感性分析图表面板")
 
-    modules = load_child_modules(CHILD_MODULE_FOLDER)
+    if prepared is None:
+        prepared = prepare()
+    for message in prepared["messages"]:
+        st.warning(message)
+
+    modules = prepared["modules"]
     if not modules:
         st.warning("⚠️ 未找到任何敏感性图表子模块，请在 `sensitivity_charts/` 文件夹中添加子模块。")
         return
 
+    # 按文件名顺序渲染（记录模块须先于图表模块追加日志）
     for mod in modules:
         try:
-            mod.render_chart()
+            call_render(mod.render_chart, prepared["outcomes"].get(mod.__name__))
         except Exception as e:
             st.error(f"模块 `{mod.__name__}` 渲染失败：{e}")
@@ -0,0 +1,137 @@
+# 文件路径：ui_modules/output_ui/output_modules/6design_optimizer.py
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from utils.charts import plotly_chart
+from utils.param_store import read_document
+from utils.optimizer import optimize_design, OBJECTIVES
+from utils.result_cache import cached_result
+from utils.loan import REPAYMENT_METHODS
+
+MODULE_META = {
+    "category": "经济分析",
+    "order": 5,
+    "title": "方案寻优（面积 / 组件档位 / 融资条件）"
+}
+
+USER_INPUT_PATH = "user_inputs.yaml"
+
+# 默认组件效率档位：转换效率 -> 组件单价（元/㎡）
+DEFAULT_TIERS = pd.DataFrame({
+    "太阳能板转换效率（η）": [0.16, 0.18, 0.21, 0.23],
+    "光伏组件价格（元/㎡）": [260.0, 300.0, 380.0, 450.0],
+})
+
+
+def load_user_inputs(path):
+    data = read_document(path)
+    if data is None:
+        st.error(f"未找到参数文件：{path}")
+        return {}
+    return data
+
+
+def render():
+    st.markdown("""
+    <div style="font-size: 14px">
+    在面积、组件效率档位、贷款额度、偿还期与还款方式组成的方案空间中批量搜索，
+    求农户净现值（NPV）或内部收益率（IRR）最大的配置，并满足初期自付金额与最低年净现金流约束。
+    </div>
+    """, unsafe_allow_html=True)
+
+    inputs = load_user_inputs(USER_INPUT_PATH)
+    if not inputs:
+        return
+
+    with st.form("design_optimizer_form"):
+        st.markdown("#### 📐 设计空间")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            area_min = st.number_input("最小面积（㎡）", min_value=1.0, max_value=500.0, value=10.0, step=5.0)
+        with col2:
+            area_max = st.number_input("最大面积（㎡）", min_value=1.0, max_value=500.0, value=200.0, step=5.0)
+        with col3:
+            area_step = st.number_input("面积步长（㎡）", min_value=1.0, max_value=100.0, value=5.0, step=1.0)
+
+        tiers = st.data_editor(DEFAULT_TIERS, num_rows="dynamic", key="optimizer_tiers",
+                               use_container_width=True)
+
+        st.markdown("#### 💳 融资空间")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            loan_max = st.number_input("最大贷款额度（元）", min_value=0.0, value=60000.0, step=1000.0)
+            loan_step = st.number_input("贷款额度步长（元）", min_value=100.0, value=2000.0, step=500.0)
+        with col2:
+            loan_years = st.slider("贷款偿还期范围（年）", min_value=1, max_value=30, value=(1, 20))
+            loan_rate = st.number_input("贷款年利率（%）", min_value=0.0, value=4.0, step=0.1) / 100.0
+        with col3:
+            methods = st.multiselect("还款方式", REPAYMENT_METHODS, default=REPAYMENT_METHODS)
+
+        st.markdown("#### 👨‍🌾 农户分成与约束")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            investment_ratio = st.slider("农户出资比例（%）", 0, 100, 100, 5) / 100.0
+            objective = st.selectbox("优化目标", list(OBJECTIVES.keys()), format_func=OBJECTIVES.get)
+        with col2:
+            income_ratio = st.slider("农户收入分成比例（%）", 0, 100, 100, 5) / 100.0
+            max_upfront = st.number_input("初期自付金额上限（元，0 表示不限）", min_value=0.0, value=0.0,
+                                          step=1000.0)
+        with col3:
+            expense_ratio = st.slider("农户支出分担比例（%）", 0, 100, 100, 5) / 100.0
+            min_yearly_net = st.number_input("最低年净现金流（元，留空不限）", value=None, step=100.0)
+
+        submitted = st.form_submit_button("🚀 开始寻优")
+
+    if submitted:
+        tier_rows = tiers.dropna()
+        if tier_rows.empty or not methods or area_max < area_min:
+            st.warning("⚠️ 请至少设置一个效率档位、一种还款方式，并保证面积范围有效。")
+            return
+
+        settings = dict(
+            areas=np.arange(area_min, area_max + 1e-9, area_step).tolist(),
+            tiers=[[float(v) for v in row] for row in tier_rows.itertuples(index=False, name=None)],
+            loan_amounts=np.arange(0.0, loan_max + 1e-9, loan_step).tolist(),
+            loan_years=np.arange(loan_years[0], loan_years[1] + 1).tolist(),
+            methods=list(methods),
+            loan_rate=loan_rate,
+            investment_ratio=investment_ratio,
+            income_ratio=income_ratio,
+            expense_ratio=expense_ratio,
+            objective=objective,
+            max_upfront=max_upfront or None,
+            min_yearly_net=min_yearly_net,
+        )
+        with st.spinner("正在批量评估候选方案..."):
+            # 相同输入与寻优设置在进程内跨会话复用结果
+            st.session_state["design_optimizer_result"] = cached_result(
+                "方案寻优", {"inputs": inputs, **settings}, lambda: optimize_design(inputs, **settings)
+            )
+            st.session_state["design_optimizer_objective"] = objective
+
+    result = st.session_state.get("design_optimizer_result")
+    if not result:
+        return
+
+    stats = result["stats"]
+    col1, col2, col3 = st.columns(3)
+    col1.metric("候选方案总数", f"{stats['候选方案总数']:,}")
+    col2.metric("实际评估数", f"{stats['实际评估数']:,}")
+    col3.metric("剪枝数", f"{stats['剪枝数']:,}")
+
+    if result["best"].empty:
+        st.warning("⚠️ 没有满足约束条件的方案，请放宽约束或扩大搜索空间。")
+        return
+
+    target = OBJECTIVES[st.session_state.get("design_optimizer_objective", "npv")]
+    st.markdown("#### 🏆 最优方案")
+    st.dataframe(result["best"], use_container_width=True)
+
+    st.markdown("#### 📈 非支配方案（自付金额 vs 目标值）")
+    fig = px.line(result["pareto"], x="初期自付金额（元）", y=target, markers=True,
+                  hover_data=["太阳能板面积（㎡）", "太阳能板转换效率（η）", "贷款额度（元）",
+                              "贷款偿还期（年）", "还款方式"])
+    plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,123 @@
+# 文件路径：ui_modules/output_ui/output_modules/7scenario_history.py
+
+import streamlit as st
+import pandas as pd
+
+from utils.param_store import file_lock, read_document
+from utils.pipeline import evaluate_scenario
+from utils.result_cache import cache_stats
+from utils.scenario_store import (
+    METRIC_COLUMNS, distinct_values, get_or_compute, import_log_entries, load_scenarios,
+    query_scenarios, scenario_hash,
+)
+from utils.sensitivity_log import iter_log_entries
+from utils.warmup import warmup_status
+
+MODULE_META = {
+    "category": "经济分析",
+    "order": 6,
+    "title": "历史方案查询与对比"
+}
+
+LOG_PATH = "sensitivity_log.yaml"
+
+
+def flatten_scenario(scenario: dict) -> dict:
+    flat = {}
+    for section, params in scenario["inputs"].items():
+        if isinstance(params, dict):
+            for k, v in params.items():
+                flat[f"[输入]{section}/{k}"] = v
+    for k, v in scenario["outputs"].items():
+        flat[f"[输出]{k}"] = v
+    return flat
+
+
+def warmup(inputs: dict):
+    """
+    启动预热：为给定输入预先计算方案指标（历史库未收录时 get_or_compute 直接命中缓存）
+    """
+    evaluate_scenario(inputs)
+
+
+def prepare():
+    """
+    计算阶段：查询 / 计算当前方案指标并读取筛选项（均为数据库 I/O）
+    """
+    prepared = {"provinces": distinct_values("province"), "cities": distinct_values("city")}
+    inputs = read_document("user_inputs.yaml")
+    if inputs:
+        try:
+            current = get_or_compute(inputs)
+            prepared["caption"] = (f"当前方案参数哈希：`{scenario_hash(inputs)[:12]}`，"
+                                   f"静态 IRR：{(current.get(METRIC_COLUMNS['static_irr']) or 0) * 100:.2f}%")
+        except KeyError as e:
+            prepared["warning"] = f"⚠️ 当前输入缺少字段：{e}"
+    return prepared
+
+
+def render(prepared=None):
+    if prepared is None:
+        prepared = prepare()
+    if "caption" in prepared:
+        st.caption(prepared["caption"])
+    if "warning" in prepared:
+        st.warning(prepared["warning"])
+
+    stats = cache_stats()
+    st.caption(f"进程级结果缓存：{stats['entries']} 条，占用 {stats['bytes'] / 2 ** 20:.1f} / "
+               f"{stats['budget_bytes'] / 2 ** 20:.0f} MB，命中率 {stats['hit_rate']:.0%}"
+               f"（命中 {stats['hits']}，未命中 {stats['misses']}，淘汰 {stats['evictions']}，"
+               f"过期 {stats['expirations']}）")
+    status = warmup_status()
+    if status["state"] == "完成":
+        st.caption(f"启动预热：已预计算 {status['configs']} 个配置，用时 {status['seconds']:.1f} 秒"
+                   + (f"，{len(status['errors'])} 项失败" if status["errors"] else ""))
+    elif status["state"] == "进行中":
+        st.caption("启动预热进行中…")
+
+    # ===== 筛选条件 =====
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        provinces = st.multiselect("省份", prepared["provinces"], key="history_provinces")
+    with col2:
+        cities = st.multiselect("城市", prepared["cities"], key="history_cities")
+    with col3:
+        min_irr = st.number_input("最低静态 IRR（%）", value=-100.0, step=1.0, key="history_min_irr")
+    with col4:
+        days = st.number_input("最近天数（0 表示不限）", min_value=0, value=0, step=1, key="history_days")
+
+    since = None
+    if days:
+        since = (pd.Timestamp.now() - pd.Timedelta(days=int(days))).strftime("%Y-%m-%d %H:%M:%S")
+
+    df = query_scenarios(
+        province=provinces or None,
+        city=cities or None,
+        min_irr=min_irr / 100 if min_irr > -100 else None,
+        since=since,
+    )
+
+    if st.button("📥 从 sensitivity_log.yaml 导入历史记录", key="history_import"):
+        with file_lock(LOG_PATH):
+            count = import_log_entries(iter_log_entries(LOG_PATH))
+        st.success(f"✅ 已导入 {count} 条历史记录")
+        st.rerun()
+
+    st.markdown(f"#### 📋 历史方案（{len(df)} 条）")
+    if df.empty:
+        st.info("暂无符合条件的历史方案。")
+        return
+    st.dataframe(df, use_container_width=True)
+
+    # ===== 方案对比 =====
+    selected = st.multiselect("选择要对比的方案（参数哈希）", df["参数哈希"].tolist(),
+                              format_func=lambda h: h[:12], max_selections=6, key="history_compare")
+    if selected:
+        scenarios = load_scenarios(selected)
+        compare = pd.DataFrame({s["参数哈希"][:12]: flatten_scenario(s) for s in scenarios})
+        # 只展示存在差异的参数，输出指标全部保留
+        differs = compare.nunique(axis=1, dropna=False) > 1
+        is_output = compare.index.str.startswith("[输出]")
+        st.markdown("#### 🔍 方案对比（仅列出有差异的输入参数）")
+        st.dataframe(compare[differs | is_output].astype(str), use_container_width=True)
@@ -0,0 +1,125 @@
+# 文件路径：ui_modules/output_ui/output_modules/8result_export.py
+
+import hashlib
+
+import streamlit as st
+import pandas as pd
+
+from utils.export import (
+    EXPORT_FORMATS, export_tables, iter_portfolio_tables, portfolio_params, session_tables,
+)
+from utils.param_loader import PROJECT_FIELDS
+from utils.param_paths import series_from_inputs
+from utils.param_store import export_session_yaml, read_document
+from utils.result_cache import canonical_hash
+from utils.validation import validate_frame
+
+MODULE_META = {
+    "category": "经济分析",
+    "order": 7,
+    "title": "结果导出（CSV / Parquet / Excel）"
+}
+
+STAKEHOLDER_DOCS = {"农户": "farmer_cashflow.yaml", "企业": "enterprise_cashflow.yaml"}
+RESULT_KEY = "export_result"
+# 页面上显示的校验错误条数
+MAX_ERROR_ROWS = 200
+
+
+def offer_download(key: str, build, fingerprint: str):
+    """
+    点击生成后把文件缓存在会话中，供下载按钮使用；
+    fingerprint 为导出内容来源（输入、结果、上传文件）的哈希，变化后缓存的文件作废、需重新生成
+    """
+    state_key = f"{RESULT_KEY}_{key}"
+    cached = st.session_state.get(state_key)
+    if cached and cached[0] != fingerprint:
+        del st.session_state[state_key]
+
+    if st.button("⚙️ 生成导出文件", key=f"{key}_build"):
+        try:
+            with st.spinner("正在分块写出..."):
+                st.session_state[state_key] = (fingerprint, build())
+        except ImportError as e:
+            st.warning(f"⚠️ {e}")
+        except (KeyError, ValueError) as e:
+            st.error(f"❌ 导出失败：{e}")
+
+    cached = st.session_state.get(state_key)
+    if cached:
+        file_name, data = cached[1]
+        st.download_button(f"📥 下载 {file_name}（{len(data) / 1024:,.0f} KB）", data=data,
+                           file_name=file_name, key=f"{key}_download")
+
+
+def render():
+    fmt = st.radio("导出格式", list(EXPORT_FORMATS.keys()), format_func=EXPORT_FORMATS.get,
+                   horizontal=True, key="export_format")
+
+    # ===== 当前方案 =====
+    st.markdown("#### 📄 当前方案")
+    inputs = read_document("user_inputs.yaml")
+    outputs = read_document("user_outputs.yaml")
+    if not outputs:
+        st.info("暂无计算结果，请先完成经济性分析。")
+    else:
+        stakeholder_docs = {label: read_document(path) for label, path in STAKEHOLDER_DOCS.items()}
+        session_hash = canonical_hash({"inputs": inputs, "outputs": outputs, "stakeholders": stakeholder_docs})
+        offer_download(f"session_{fmt}", lambda: export_tables([session_tables(outputs, stakeholder_docs)], fmt),
+                       session_hash)
+
+        # 人工可读的全部输入与计算结果，点击时才序列化（本模块在经济性分析之后渲染，结果为本次计算）
+        st.markdown("##### 🧾 输入与计算结果（YAML）")
+        offer_download("session_yaml", lambda: (
+            "solar_project_session.yaml", export_session_yaml().encode("utf-8"),
+        ), session_hash)
+
+    # ===== 批量组合 =====
+    st.markdown("#### 🗂️ 批量项目组合")
+    if not inputs:
+        return
+
+    template = pd.DataFrame([{
+        "项目编号": "P0001",
+        **{key: inputs[section][key] for section, key, _ in PROJECT_FIELDS.values()},
+    }])
+    st.markdown("上传项目参数表（CSV，每行一个项目）；未提供的参数列取当前输入值，逐年参数表对所有项目生效。")
+    st.download_button("📄 下载参数模板", template.to_csv(index=False).encode("utf-8-sig"),
+                       file_name="项目组合模板.csv", key="export_template")
+
+    uploaded = st.file_uploader("项目参数表", type=["csv"], key="export_portfolio")
+    if uploaded is None:
+        return
+
+    try:
+        df = pd.read_csv(uploaded)
+    except ValueError as e:
+        st.error(f"❌ 参数表格式错误：{e}")
+        return
+
+    # 按参数 YAML 中的范围 / 步长 / 可选项整列校验
+    errors = validate_frame(df)
+    if len(errors):
+        n_rows = errors["行号"].nunique()
+        st.error(f"❌ 参数表中有 {n_rows:,} 行不符合参数约束（共 {len(errors):,} 处），请修改后重新上传。")
+        st.dataframe(errors.head(MAX_ERROR_ROWS), use_container_width=True, hide_index=True)
+        st.download_button("📄 下载完整校验结果", errors.to_csv(index=False).encode("utf-8-sig"),
+                           file_name="参数表校验结果.csv", key="export_validation")
+        return
+
+    try:
+        params = portfolio_params(df, inputs)
+    except (ValueError, KeyError) as e:
+        st.error(f"❌ 参数表格式错误：{e}")
+        return
+
+    project_ids = df["项目编号"].astype(str).to_numpy() if "项目编号" in df.columns else None
+    shares = st.session_state.get("stakeholder_shares", {})
+    st.caption(f"共 {len(df):,} 个项目；利益相关方分成取自当前会话：{', '.join(shares) or '无'}")
+    upload_hash = hashlib.sha256(uploaded.getvalue()).hexdigest()
+    offer_download(
+        f"portfolio_{fmt}",
+        lambda: export_tables(iter_portfolio_tables(params, project_ids, shares,
+                                                    series=series_from_inputs(inputs)), fmt),
+        canonical_hash({"upload": upload_hash, "inputs": inputs, "shares": shares}),
+    )
@@ -0,0 +1,127 @@
+# 文件路径：ui_modules/output_ui/output_modules/9city_ranking.py
+
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+
+from utils.charts import cached_figure
+from utils.param_store import read_document
+from utils.pipeline import OUTPUT_FIELDS, evaluate_cities
+from utils.result_cache import cached_result
+
+MODULE_META = {
+    "category": "经济分析",
+    "order": 8,
+    "title": "全国城市排名（当前参数 × 各城市辐射量）"
+}
+
+IRRADIATION_CSV_PATH = "ui_modules/input_ui/input_param_modules/solar_insolation_city.csv"
+
+# 排名指标：输出列名 -> 是否越大越好
+RANK_METRICS = {
+    OUTPUT_FIELDS["static_npv"]: True,
+    OUTPUT_FIELDS["static_irr"]: True,
+    OUTPUT_FIELDS["dynamic_npv"]: True,
+    OUTPUT_FIELDS["payback"]: False,
+    OUTPUT_FIELDS["dynamic_payback"]: False,
+}
+
+
+def load_cities():
+    return pd.read_csv(IRRADIATION_CSV_PATH)
+
+
+def rank_cities(inputs: dict, cities: pd.DataFrame) -> pd.DataFrame:
+    # 相同参数下的全国结果在进程内跨会话复用
+    return cached_result("城市排名", {"inputs": inputs, "cities": cities.to_dict(orient="list")},
+                         lambda: evaluate_cities(inputs, cities))
+
+
+def warmup(inputs: dict):
+    """
+    启动预热：为给定输入预先计算全国城市排名（见 utils.warmup）
+    """
+    rank_cities(inputs, load_cities())
+
+
+def province_summary(result: pd.DataFrame) -> pd.DataFrame:
+    """
+    各省城市指标的平均值（省份按所选指标排序前由调用方决定）
+    """
+    return result.groupby("省份", sort=False)[["年辐射量", *RANK_METRICS]].mean()
+
+
+def build_province_heatmap(summary: pd.DataFrame) -> go.Figure:
+    """
+    省份 × 指标热力图：颜色为各指标在省份间的百分位（越好越绿），悬停显示原始值
+    """
+    scores = pd.DataFrame(index=summary.index)
+    text = pd.DataFrame(index=summary.index)
+    for column in summary.columns:
+        higher_is_better = RANK_METRICS.get(column, True)
+        scores[column] = summary[column].rank(pct=True, ascending=higher_is_better)
+        if "IRR" in column:
+            text[column] = summary[column].map(lambda v: f"{v * 100:.2f}%" if pd.notna(v) else "—")
+        else:
+            text[column] = summary[column].map(lambda v: f"{v:,.2f}" if pd.notna(v) else "—")
+
+    fig = go.Figure(go.Heatmap(
+        z=scores.to_numpy(),
+        x=list(scores.columns),
+        y=list(scores.index),
+        text=text.to_numpy(),
+        texttemplate="%{text}",
+        hovertemplate="%{y} · %{x}：%{text}<extra></extra>",
+        colorscale="RdYlGn",
+        zmin=0,
+        zmax=1,
+        colorbar=dict(title="省份间百分位"),
+    ))
+    fig.update_layout(height=max(400, 24 * len(scores) + 120), yaxis=dict(autorange="reversed"),
+                      margin=dict(l=10, r=10, t=30, b=10))
+    return fig
+
+
+def render():
+    inputs = read_document("user_inputs.yaml")
+    if not inputs:
+        st.info("请先在左侧填写并保存输入参数。")
+        return
+
+    try:
+        cities = load_cities()
+        result = rank_cities(inputs, cities)
+    except FileNotFoundError:
+        st.error(f"❌ 未找到城市辐射量数据：{IRRADIATION_CSV_PATH}")
+        return
+    except KeyError as e:
+        st.warning(f"⚠️ 当前输入缺少字段：{e}")
+        return
+
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        metric = st.selectbox("📊 排名指标", list(RANK_METRICS), key="city_rank_metric")
+    with col2:
+        provinces = st.multiselect("省份筛选", result["省份"].unique().tolist(), key="city_rank_provinces")
+
+    ranked = result if not provinces else result[result["省份"].isin(provinces)]
+    ranked = ranked.sort_values(metric, ascending=not RANK_METRICS[metric], na_position="last")
+    ranked.insert(0, "排名", range(1, len(ranked) + 1))
+
+    current_city = inputs.get("2光伏发电参数", {}).get("城市")
+    best = ranked.iloc[0]
+    st.caption(f"共 {len(ranked)} 个城市；{metric}最优：{best['省份']} · {best['城市']}"
+               + (f"；当前城市：{current_city}" if current_city else ""))
+
+    # 表格可点击列名再次排序
+    display = ranked.drop(columns=[OUTPUT_FIELDS["dynamic_irr"], OUTPUT_FIELDS["initial_investment"]])
+    irr_label = OUTPUT_FIELDS["static_irr"]
+    st.dataframe(
+        display.style.format({irr_label: lambda v: f"{v * 100:.2f}%" if pd.notna(v) else "—"}, precision=2),
+        use_container_width=True, hide_index=True,
+    )
+
+    st.markdown("#### 🗺️ 省级热力图（各省城市平均值）")
+    summary = province_summary(ranked)
+    summary = summary.sort_values(metric, ascending=not RANK_METRICS[metric])
+    st.plotly_chart(cached_figure(build_province_heatmap, summary), use_container_width=True)
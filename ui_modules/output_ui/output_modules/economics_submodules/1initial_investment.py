@@ -1,6 +1,7 @@
 import streamlit as st
-import yaml
-import os
+
+from utils.param_store import read_document, update_document
+from utils.result_cache import cached_result
 
 # 模块元信息
 MODULE_META = {
@@ -8,77 +9,109 @@ MODULE_META = {
     "title": "初始投入计算"
 }
 
-# 假设 YAML 文件位于项目根目录或已知路径中
-YAML_PATH = os.path.abspath("user_inputs.yaml")
-OUTPUT_YAML_PATH = os.path.abspath("user_outputs.yaml")
+# 会话文档名（见 utils.param_store）
+YAML_PATH = "user_inputs.yaml"
+OUTPUT_YAML_PATH = "user_outputs.yaml"
 
 
-def load_yaml_data(yaml_path):
+def save_to_output_yaml(output_data, output_path):
     try:
-        with open(yaml_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
+        update_document(output_path, output_data)
+
+        # st.info("✅ 初始投入结果已保存到 user_outputs.yaml")
     except Exception as e:
-        st.error(f"❌ 无法加载 YAML 文件：{e}")
-        return None
+        st.error(f"❌ 保存到 YAML 文件失败：{e}")
 
 
-def save_to_output_yaml(output_data, output_path):
-    try:
-        if os.path.exists(output_path):
-            with open(output_path, "r", encoding="utf-8") as f:
-                existing_data = yaml.safe_load(f) or {}
-        else:
-            existing_data = {}
+def calculate_initial_investment(data):
+    """
+    由输入参数计算初始投入各分项（纯计算，不涉及页面绘制）
+    """
+    solar_area = data["2光伏发电参数"]["太阳能板面积（㎡）"]
+    panel_price = data["3项目建设参数配置"]["光伏组件价格"]
+    inverter_price = data["3项目建设参数配置"]["逆变器总价"]
+    install_cost_per_m2 = data["3项目建设参数配置"]["安装费用"]
+    design_cost = data["3项目建设参数配置"]["方案设计成本"]
+    decision_cost = data["3项目建设参数配置"]["项目决策成本"]
+    other_initial_cost = data["3项目建设参数配置"]["其他初期费用"]
+
+    equipment_cost = panel_price * solar_area + inverter_price
+    install_cost = install_cost_per_m2 * solar_area
+    total_investment = decision_cost + design_cost + equipment_cost + install_cost + other_initial_cost
+
+    return {
+        "solar_area": solar_area,
+        "panel_price": panel_price,
+        "inverter_price": inverter_price,
+        "install_cost_per_m2": install_cost_per_m2,
+        "design_cost": design_cost,
+        "decision_cost": decision_cost,
+        "other_initial_cost": other_initial_cost,
+        "equipment_cost": equipment_cost,
+        "install_cost": install_cost,
+        "total_investment": total_investment,
+    }
 
-        # 更新数据
-        existing_data.update(output_data)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            yaml.safe_dump(existing_data, f, allow_unicode=True)
+def initial_investment(data):
+    """
+    初始投入（进程级缓存）
+    """
+    return cached_result("初始投入计算", data, lambda: calculate_initial_investment(data))
 
-        # st.info("✅ 初始投入结果已保存到 user_outputs.yaml")
-    except Exception as e:
-        st.error(f"❌ 保存到 YAML 文件失败：{e}")
 
+def warmup(inputs):
+    """
+    启动预热：为给定输入预先计算初始投入（见 utils.warmup）
+    """
+    initial_investment(inputs)
 
-def render():
-    st.subheader("💰 初始投入计算")
 
-    data = load_yaml_data(YAML_PATH)
+def prepare():
+    """
+    计算阶段：读取输入并完成计算，出错时返回 {"error": 提示信息}
+    """
+    data = read_document(YAML_PATH)
     if not data:
-        return
-
+        return {"error": f"❌ 无法加载 YAML 文件：{YAML_PATH}"}
     try:
-        # 读取参数
-        solar_area = data["2光伏发电参数"]["太阳能板面积（㎡）"]
-        panel_price = data["3项目建设参数配置"]["光伏组件价格"]
-        inverter_price = data["3项目建设参数配置"]["逆变器总价"]
-        install_cost_per_m2 = data["3项目建设参数配置"]["安装费用"]
-        design_cost = data["3项目建设参数配置"]["方案设计成本"]
-        decision_cost = data["3项目建设参数配置"]["项目决策成本"]
-        other_initial_cost = data["3项目建设参数配置"]["其他初期费用"]
-
-        # 计算
-        equipment_cost = panel_price * solar_area + inverter_price
-        install_cost = install_cost_per_m2 * solar_area
-        total_investment = decision_cost + design_cost + equipment_cost + install_cost + other_initial_cost
-
-        # 显示计算过程（使用非折叠显示，避免嵌套错误）
-        st.markdown("#### 📋 详细计算过程")
-        st.write(f"🔹 光伏组件价格 × 面积：{panel_price} × {solar_area} = {panel_price * solar_area:.2f} 元")
-        st.write(f"🔹 逆变器总价：{inverter_price} 元")
-        st.write(f"🔹 安装费用 × 面积：{install_cost_per_m2} × {solar_area} = {install_cost:.2f} 元")
-        st.write(f"🔹 项目决策成本：{decision_cost} 元")
-        st.write(f"🔹 方案设计成本：{design_cost} 元")
-        st.write(f"🔹 其他初期费用：{other_initial_cost} 元")
-
-        # 总结果
-        st.success(f"💡 **初始投入总计：{total_investment:,.2f} 元**")
-
+        return initial_investment(data)
     except KeyError as e:
-        st.error(f"❌ YAML 数据中缺失字段：{e}")
+        return {"error": f"❌ YAML 数据中缺失字段：{e}"}
     except Exception as e:
-        st.error(f"❌ 计算过程中出错：{e}")
+        return {"error": f"❌ 计算过程中出错：{e}"}
+
+
+def render(prepared=None):
+    st.subheader("💰 初始投入计算")
+
+    result = prepared if prepared is not None else prepare()
+    if "error" in result:
+        st.error(result["error"])
+        return
+
+    solar_area = result["solar_area"]
+    panel_price = result["panel_price"]
+    inverter_price = result["inverter_price"]
+    install_cost_per_m2 = result["install_cost_per_m2"]
+    design_cost = result["design_cost"]
+    decision_cost = result["decision_cost"]
+    other_initial_cost = result["other_initial_cost"]
+    equipment_cost = result["equipment_cost"]
+    install_cost = result["install_cost"]
+    total_investment = result["total_investment"]
+
+    # 显示计算过程（使用非折叠显示，避免嵌套错误）
+    st.markdown("#### 📋 详细计算过程")
+    st.write(f"🔹 光伏组件价格 × 面积：{panel_price} × {solar_area} = {panel_price * solar_area:.2f} 元")
+    st.write(f"🔹 逆变器总价：{inverter_price} 元")
+    st.write(f"🔹 安装费用 × 面积：{install_cost_per_m2} × {solar_area} = {install_cost:.2f} 元")
+    st.write(f"🔹 项目决策成本：{decision_cost} 元")
+    st.write(f"🔹 方案设计成本：{design_cost} 元")
+    st.write(f"🔹 其他初期费用：{other_initial_cost} 元")
+
+    # 总结果
+    st.success(f"💡 **初始投入总计：{total_investment:,.2f} 元**")
 
     # 构造保存数据结构
     output_data = {
@@ -96,5 +129,3 @@ def render():
 
     # 保存结果
     save_to_output_yaml(output_data, OUTPUT_YAML_PATH)
-
-
@@ -1,81 +1,105 @@
 import streamlit as st
-import yaml
-import os
+import numpy as np
 import pandas as pd
 
+from utils.param_loader import ProjectParams
+from utils.param_paths import parameter_paths, series_from_inputs
+from utils.param_store import read_document, update_document
+from utils.result_cache import cached_result
+
 # 模块元信息
 MODULE_META = {
     "order": 2,
     "title": "每年现金流计算"
 }
 
-YAML_PATH = os.path.abspath("user_inputs.yaml")
-OUTPUT_YAML_PATH = os.path.abspath("user_outputs.yaml")
+# 会话文档名（见 utils.param_store）
+YAML_PATH = "user_inputs.yaml"
+OUTPUT_YAML_PATH = "user_outputs.yaml"
 
 
 def load_output_data():
-    try:
-        with open(OUTPUT_YAML_PATH, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
-    except Exception as e:
-        st.error(f"❌ 无法读取 user_outputs.yaml：{e}")
+    data = read_document(OUTPUT_YAML_PATH)
+    if data is None:
+        st.error("❌ 无法读取 user_outputs.yaml")
         return {}
-
-
-def load_yaml_data(yaml_path):
-    try:
-        with open(yaml_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
-    except Exception as e:
-        st.error(f"❌ 无法加载 YAML 文件：{e}")
-        return None
-
-
-def calculate_annual_cash_flows(data):
+    return data
+
+
+def yearly_values(params: ProjectParams, series: dict = None) -> dict:
+    """
+    电价、补贴与运维成本的逐年取值：{内部字段名: 长度为寿命年数的数组}，第 t 年取下标 t-1
+    """
+    years = np.arange(1, int(params.lifetime) + 1)
+    paths = parameter_paths(params.as_dict(), years, series)
+    return {name: np.broadcast_to(path, (1, len(years)))[0] for name, path in paths.items()}
+
+
+def calculate_annual_cash_flows(params: ProjectParams, series: dict = None):
+    """
+    每年发电量与现金收入（纯计算，参数已换算为计算口径；series 为逐年参数表）
+    """
+    result = []
+    values = yearly_values(params, series)
+
+    for year in range(1, int(params.lifetime) + 1):
+        decay_factor = (1 - params.decay) ** year
+        annual_generation = params.radiation * params.area * params.efficiency * params.pr * decay_factor
+
+        # 收益计算（当年电价与补贴）
+        sell_price = values["sell_price"][year - 1]
+        use_price = values["use_price"][year - 1]
+        subsidy = values["subsidy"][year - 1]
+        sell_income = annual_generation * params.sell_ratio * (sell_price + subsidy)
+        self_use_income = annual_generation * (1 - params.sell_ratio) * (use_price - sell_price)
+        total_income = sell_income + self_use_income
+
+        result.append({
+            "使用年份": year,
+            "年发电量（kWh）": round(annual_generation, 2),
+            "售电收益（元）": round(sell_income, 2),
+            "自用收益（元）": round(self_use_income, 2),
+            "总收入（元）": round(total_income, 2)
+        })
+
+    return pd.DataFrame(result)
+
+
+def annual_income(data):
+    """
+    年度收入（进程级缓存），返回 (参数对象, 收入表)
+    """
+    params = ProjectParams.from_inputs(data)
+    series = series_from_inputs(data)
+    # 缓存键只含计算相关字段（及逐年参数表），与其他输入（如城市名称）无关
+    key = {**params.as_dict(), "series": series} if series else params.as_dict()
+    return params, cached_result("年度收入", key, lambda: calculate_annual_cash_flows(params, series))
+
+
+def warmup(inputs):
+    """
+    启动预热：为给定输入预先计算年度收入（见 utils.warmup）
+    """
+    annual_income(inputs)
+
+
+def prepare():
+    """
+    计算阶段：读取输入并计算年度收入（支出依赖“初始投入计算”写入的结果，在渲染阶段计算）
+    """
+    data = read_document(YAML_PATH)
+    if not data:
+        return {"error": f"❌ 无法加载 YAML 文件：{YAML_PATH}"}
     try:
-        # 基本参数
-        lifetime = data["4经济分析方法参数配置"]["产品使用寿命"]
-        radiation = data["2光伏发电参数"]["年辐射量"]
-        area = data["2光伏发电参数"]["太阳能板面积（㎡）"]
-        efficiency = data["2光伏发电参数"]["太阳能板转换效率（η）"]
-        pr = data["2光伏发电参数"]["系统效率因子（PR）"]
-        decay = data["2光伏发电参数"]["光伏发电衰减率（%/年）"]
-
-        sell_ratio = data["4经济分析方法参数配置"]["发电售卖比例"] / 100
-        subsidy = data["4经济分析方法参数配置"]["年补贴金额"]
-        sell_price = data["4经济分析方法参数配置"]["售电电价"]
-        use_price = data["4经济分析方法参数配置"]["用电电价"]
-
-        result = []
-
-        for year in range(1, lifetime + 1):
-            decay_factor = (1 - decay) ** year
-            annual_generation = radiation * area * efficiency * pr * decay_factor
-
-            # 收益计算
-            sell_income = annual_generation * sell_ratio * (sell_price + subsidy)
-            self_use_income = annual_generation * (1 - sell_ratio) * (use_price - sell_price)
-            total_income = sell_income + self_use_income
-
-            result.append({
-                "使用年份": year,
-                "年发电量（kWh）": round(annual_generation, 2),
-                "售电收益（元）": round(sell_income, 2),
-                "自用收益（元）": round(self_use_income, 2),
-                "总收入（元）": round(total_income, 2)
-            })
-
-        return pd.DataFrame(result)
-
+        params, income = annual_income(data)
+        return {"params": params, "income": income, "series": series_from_inputs(data)}
     except KeyError as e:
-        st.error(f"❌ YAML 数据中缺失字段：{e}")
-        return None
+        return {"error": f"❌ YAML 数据中缺失字段：{e}"}
     except Exception as e:
-        st.error(f"❌ 计算过程中出错：{e}")
-        return None
+        return {"error": f"❌ 计算过程中出错：{e}"}
 
 
-def calculate_annual_expenses(data, income_df):
+def calculate_annual_expenses(params: ProjectParams, income_df, series: dict = None):
     try:
         # 强制从 user_outputs.yaml 读取初始投入总计
         output_data = load_output_data()
@@ -85,20 +109,16 @@ def calculate_annual_expenses(data, income_df):
             st.error("❌ 无法获取初始投入数据，请先运行“初始投入计算”模块。")
             return None
 
-        area = data["2光伏发电参数"]["太阳能板面积（㎡）"]
-        om_cost_per_m2 = data["4经济分析方法参数配置"]["年运维成本"]
-        tax_rate = data["4经济分析方法参数配置"]["综合税率"] / 100
-        depreciation_rate = data["4经济分析方法参数配置"]["年折旧率"] / 100
-
         expense_result = []
+        om_costs = yearly_values(params, series)["om_cost"]
 
         for _, row in income_df.iterrows():
             year = row["使用年份"]
             income = row["总收入（元）"]
 
-            om_cost = om_cost_per_m2 * area
-            tax_cost = income * tax_rate
-            depreciation = depreciation_rate * initial_investment
+            om_cost = om_costs[int(year) - 1] * params.area
+            tax_cost = income * params.tax_rate
+            depreciation = params.depreciation_rate * initial_investment
 
             total_expense = om_cost + tax_cost + depreciation
 
@@ -123,22 +143,13 @@ def append_cashflow_to_output(income_df, expense_df):
         income_records = income_df.to_dict(orient="records")
         expense_records = expense_df.to_dict(orient="records")
 
-        # 加载原有内容
-        if os.path.exists(OUTPUT_YAML_PATH):
-            with open(OUTPUT_YAML_PATH, "r", encoding="utf-8") as f:
-                existing_data = yaml.safe_load(f) or {}
-        else:
-            existing_data = {}
-
         # 写入/更新字段
-        existing_data["现金流分析"] = {
-            "年度收入明细": income_records,
-            "年度支出明细": expense_records
-        }
-
-        # 写回文件
-        with open(OUTPUT_YAML_PATH, "w", encoding="utf-8") as f:
-            yaml.dump(existing_data, f, allow_unicode=True)
+        update_document(OUTPUT_YAML_PATH, {
+            "现金流分析": {
+                "年度收入明细": income_records,
+                "年度支出明细": expense_records
+            }
+        })
 
         # st.success("✅ 年度收入和支出数据已保存到 user_outputs.yaml")
 
@@ -146,7 +157,7 @@ def append_cashflow_to_output(income_df, expense_df):
         st.error(f"❌ 保存到 YAML 文件出错：{e}")
 
 
-def render():
+def render(prepared=None):
     st.subheader("📆 每年现金收入计算")
 
     # 显示计算说明
@@ -159,19 +170,20 @@ def render():
 
     <b>2. 现金收入计算：</b>  
     发电收益 = (年发电量 × 售电比例) × (上网电价 + 补贴)  
-    &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;+ (年发电量 × 自用比例) × (用电电价 − 上网电价)
+    &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;+ (年发电量 × 自用比例) × (用电电价 − 上网电价)  
+
+    <b>3. 逐年取值：</b>  
+    电价与运维成本按各自的年增长率逐年变化，补贴只在补贴年限内发放；侧栏“逐年参数”表中的取值自该年起覆盖上述路径
 
     <hr style="margin-top:10px; margin-bottom:10px">
     </div>
     """, unsafe_allow_html=True)
 
-    data = load_yaml_data(YAML_PATH)
-    if not data:
-        return
-
-    df = calculate_annual_cash_flows(data)
-    if df is None:
+    result = prepared if prepared is not None else prepare()
+    if "error" in result:
+        st.error(result["error"])
         return
+    params, df, series = result["params"], result["income"], result.get("series")
 
     # 显示表格
     st.markdown("#### 📋 每年发电量与现金收入")
@@ -191,7 +203,7 @@ def render():
     </div>
     """, unsafe_allow_html=True)
 
-    expense_df = calculate_annual_expenses(data, df)
+    expense_df = calculate_annual_expenses(params, df, series)
     if expense_df is not None:
         st.dataframe(expense_df, use_container_width=True)
 
@@ -1,11 +1,17 @@
 import streamlit as st
-import yaml
-import os
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 import numpy_financial as npf
+import copy
+
+from utils.charts import cached_figure
+from utils.metrics import batch_payback
+from utils.param_loader import ProjectParams
+from utils.param_paths import PATH_COLUMNS, SERIES_SECTION
+from utils.param_store import read_document, write_document
+from utils.pipeline import evaluate_variants
 
 
 MODULE_META = {
@@ -13,15 +19,20 @@ MODULE_META = {
     "title": "净现金流分析"
 }
 
-OUTPUT_YAML_PATH = os.path.abspath("user_outputs.yaml")
+# 会话文档名（见 utils.param_store）
+OUTPUT_YAML_PATH = "user_outputs.yaml"
+INPUT_YAML_PATH = "user_inputs.yaml"
+IRRADIATION_CSV_PATH = "ui_modules/input_ui/input_param_modules/solar_insolation_city.csv"
+
+# 方案对比：最多同时固定的方案数
+MAX_VARIANTS = 6
+VARIANTS_KEY = "pinned_variants"
 
 def load_output_data():
-    try:
-        with open(OUTPUT_YAML_PATH, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f)
-    except Exception as e:
-        st.error(f"❌ 读取输出文件出错：{e}")
-        return None
+    data = read_document(OUTPUT_YAML_PATH)
+    if data is None:
+        st.error("❌ 读取输出文件出错：未找到 user_outputs.yaml")
+    return data
 
 def calculate_net_cashflow(income_list, expense_list, initial_investment):
     try:
@@ -55,14 +66,12 @@ def calculate_net_cashflow(income_list, expense_list, initial_investment):
 
 def append_cashflow_to_yaml(cashflow_df):
     try:
-        with open(OUTPUT_YAML_PATH, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+        data = read_document(OUTPUT_YAML_PATH, {})
 
         data.setdefault("现金流分析", {})
         data["现金流分析"]["年度净现金流明细"] = cashflow_df.to_dict(orient="records")
 
-        with open(OUTPUT_YAML_PATH, "w", encoding="utf-8") as f:
-            yaml.dump(data, f, allow_unicode=True)
+        write_document(OUTPUT_YAML_PATH, data)
 
         # st.success("✅ 现金流结果已保存到 user_outputs.yaml")
     except Exception as e:
@@ -71,8 +80,7 @@ def append_cashflow_to_yaml(cashflow_df):
 
 def append_dynamic_cashflow_to_yaml(cashflow_df):
     try:
-        with open(OUTPUT_YAML_PATH, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+        data = read_document(OUTPUT_YAML_PATH, {})
 
         data.setdefault("现金流分析", {})
         data["现金流分析"]["动态净现金流明细"] = cashflow_df[[
@@ -82,12 +90,31 @@ def append_dynamic_cashflow_to_yaml(cashflow_df):
             "累计现值现金流（元）"
         ]].to_dict(orient="records")
 
-        with open(OUTPUT_YAML_PATH, "w", encoding="utf-8") as f:
-            yaml.dump(data, f, allow_unicode=True)
+        write_document(OUTPUT_YAML_PATH, data)
     except Exception as e:
         st.error(f"❌ 保存动态现金流数据失败：{e}")
 
 
+def save_payback_to_yaml(payback_year, dyn_payback):
+    try:
+        data = read_document(OUTPUT_YAML_PATH, {})
+        data.setdefault("现金流分析", {})
+        data["现金流分析"]["投资回收期"] = {
+            "静态投资回收期（年）": float(payback_year) if payback_year else None,
+            "动态投资回收期（年）": float(dyn_payback) if dyn_payback else None,
+        }
+        write_document(OUTPUT_YAML_PATH, data)
+    except Exception as e:
+        st.error(f"❌ 保存投资回收期失败：{e}")
+
+
+def format_payback(value):
+    """
+    回收期保留两位小数，未回收时为 None
+    """
+    return None if np.isnan(value) else round(float(value), 2)
+
+
 def calculate_cumulative_cashflow(cashflow_df):
     try:
         cashflow_df["累计现金流（元）"] = cashflow_df["当年净现金流（元）"].cumsum()
@@ -112,8 +139,7 @@ def calculate_dynamic_cashflow(cashflow_df, discount_rate, inflation_rate):
 
 def calculate_and_save_npv_irr_from_yaml(discount_rate):
     try:
-        with open(OUTPUT_YAML_PATH, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+        data = read_document(OUTPUT_YAML_PATH, {})
 
         # 获取静态现金流：使用“年度净现金流明细”中的“当年净现金流（元）”
         static_cashflow = [
@@ -142,8 +168,7 @@ def calculate_and_save_npv_irr_from_yaml(discount_rate):
             "动态内部收益率（IRR）": float(round(dynamic_irr, 6)),  # 此处仍基于静态 IRR
         }
 
-        with open(OUTPUT_YAML_PATH, "w", encoding="utf-8") as f:
-            yaml.dump(data, f, allow_unicode=True)
+        write_document(OUTPUT_YAML_PATH, data)
 
         return static_npv, static_irr, dynamic_npv, dynamic_irr
 
@@ -152,6 +177,160 @@ def calculate_and_save_npv_irr_from_yaml(discount_rate):
         return None, None, None, None
 
 
+def build_payback_figure(df, y_column, payback, payback_label, title=None, hline_position=None):
+    """
+    累计现金流趋势图，回收期处标注竖线（按数据哈希缓存）
+    """
+    fig = px.line(df, x="使用年份", y=y_column, markers=True, title=title)
+    hline = dict(y=0, line_dash="dash", line_color="gray", annotation_text="盈亏平衡")
+    if hline_position:
+        hline["annotation_position"] = hline_position
+    fig.add_hline(**hline)
+    if payback:
+        fig.add_vline(
+            x=payback,
+            line_dash="dot",
+            line_color="red",
+            annotation_text=f"{payback_label} ≈ 第 {payback} 年",
+            annotation_position="top left"
+        )
+    return fig
+
+
+def build_variant_bar_figure(df_all):
+    return px.bar(df_all, x="使用年份", y="当年净现金流（元）", color="方案", barmode="group",
+                  title="年度净现金流对比")
+
+
+def build_variant_line_figure(df_all, column, paybacks, title):
+    """
+    多方案累计曲线叠加，paybacks 为 {方案名: 回收期}
+    """
+    fig = px.line(df_all, x="使用年份", y=column, color="方案", markers=True, title=title)
+    fig.add_hline(y=0, line_dash="dash", line_color="gray")
+    colors = {trace.name: trace.line.color for trace in fig.data}
+    for name, payback in paybacks.items():
+        if payback is not None:
+            fig.add_vline(x=payback, line_dash="dot", line_color=colors.get(name))
+    return fig
+
+
+def build_variant(base_inputs, city_row=None, subsidy_delta=0.0, area_scale=1.0):
+    """
+    在当前输入基础上生成一个对比方案：可替换城市（及年辐射量）、调整年补贴与板面积。
+    方案为当前输入（含逐年参数表）的快照，之后修改输入不影响已固定的方案
+    """
+    variant = copy.deepcopy(base_inputs)
+    solar = variant["2光伏发电参数"]
+    if city_row is not None:
+        solar["省份"], solar["城市"] = city_row["省份"], city_row["城市"]
+        solar["年辐射量"] = float(city_row["年辐射量"])
+    solar["太阳能板面积（㎡）"] = float(solar["太阳能板面积（㎡）"]) * area_scale
+    variant["4经济分析方法参数配置"]["年补贴金额"] = float(variant["4经济分析方法参数配置"]["年补贴金额"]) + subsidy_delta
+    # 逐年参数表中填写的补贴会覆盖标量补贴，增减量同样作用于表中各年，方案的补贴调整不被抵消
+    subsidy_column = PATH_COLUMNS["subsidy"]
+    for row in variant.get(SERIES_SECTION) or []:
+        value = row.get(subsidy_column)
+        if value is not None and value == value:
+            row[subsidy_column] = float(value) + subsidy_delta
+    return variant
+
+
+def variant_frames(result):
+    """
+    将批量指标展开为长表（方案 × 年份），用于叠加绘图
+    """
+    metrics = result["metrics"]
+    project = metrics["project"]
+    net = project["net"]
+    present = net * ((1 + metrics["real_rate"][:, None]) ** -np.arange(net.shape[1])[None, :])
+    frames = []
+    for i, name in enumerate(result["names"]):
+        mask = project["mask"][i]
+        frames.append(pd.DataFrame({
+            "方案": name,
+            "使用年份": project["years"][mask],
+            "当年净现金流（元）": net[i, mask],
+            "累计现金流（元）": np.cumsum(net[i, mask]),
+            "累计现值现金流（元）": np.cumsum(present[i, mask]),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def render_variant_comparison(input_data):
+    pinned = st.session_state.setdefault(VARIANTS_KEY, {})
+
+    st.markdown("#### 📌 多方案对比")
+    with st.expander("固定 / 添加对比方案", expanded=not pinned):
+        df_city = pd.read_csv(IRRADIATION_CSV_PATH)
+        city_options = ["（保持当前城市）"] + [f"{r.省份}/{r.城市}" for r in df_city.itertuples()]
+        with st.form("variant_form"):
+            name = st.text_input("方案名称", value=f"方案{len(pinned) + 1}")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                city = st.selectbox("城市", city_options)
+            with col2:
+                subsidy_delta = st.number_input("年补贴金额增减（元/kWh）", value=0.0, step=0.01, format="%.3f")
+            with col3:
+                area_scale = st.number_input("太阳能板面积倍数", min_value=0.1, value=1.0, step=0.1)
+            submitted = st.form_submit_button("📌 固定该方案")
+
+        if submitted:
+            if not name or name == "当前方案":
+                st.warning("⚠️ 请填写方案名称（不能与“当前方案”重名）。")
+            elif len(pinned) >= MAX_VARIANTS and name not in pinned:
+                st.warning(f"⚠️ 最多固定 {MAX_VARIANTS} 个方案，请先移除部分方案。")
+            else:
+                city_row = None
+                if city != city_options[0]:
+                    city_row = df_city.iloc[city_options.index(city) - 1]
+                pinned[name] = build_variant(input_data, city_row, subsidy_delta, area_scale)
+
+        if pinned:
+            removed = st.multiselect("移除方案", list(pinned.keys()), key="variant_remove")
+            if st.button("🗑️ 移除所选方案", key="variant_remove_btn") and removed:
+                for n in removed:
+                    pinned.pop(n, None)
+                st.rerun()
+
+    if not pinned:
+        st.info("固定至少一个方案后，将与当前方案叠加对比。")
+        return
+
+    try:
+        result = evaluate_variants({"当前方案": input_data, **pinned})
+    except (KeyError, ValueError) as e:
+        st.error(f"❌ 方案对比计算失败：{e}")
+        return
+
+    metrics = result["metrics"]
+    df_all = variant_frames(result)
+
+    st.plotly_chart(cached_figure(build_variant_bar_figure, df_all), use_container_width=True)
+
+    for column, payback_key, title in [
+        ("累计现金流（元）", "payback", "累计现金流对比（虚线为投资回收期）"),
+        ("累计现值现金流（元）", "dynamic_payback", "累计现值现金流对比（虚线为动态回收期）"),
+    ]:
+        paybacks = {
+            name: None if np.isnan(metrics[payback_key][i]) else float(metrics[payback_key][i])
+            for i, name in enumerate(result["names"])
+        }
+        fig = cached_figure(build_variant_line_figure, df_all, column, paybacks, title)
+        st.plotly_chart(fig, use_container_width=True)
+
+    summary = pd.DataFrame({
+        "方案": result["names"],
+        "初始投入（元）": metrics["initial_investment"],
+        "静态净现值（NPV）": metrics["static_npv"],
+        "动态净现值（NPV）": metrics["dynamic_npv"],
+        "内部收益率（IRR）": metrics["static_irr"] * 100,
+        "静态投资回收期（年）": metrics["payback"],
+        "动态投资回收期（年）": metrics["dynamic_payback"],
+        "投资回报率（%）": metrics["roi"] * 100,
+        "平准化度电成本（元/kWh）": metrics["lcoe"],
+    }).set_index("方案")
+    st.dataframe(summary.style.format("{:,.2f}", na_rep="未回收"), use_container_width=True)
 
 
 def render():
@@ -192,46 +371,27 @@ def render():
             # ==== 替换累计现金流图显示 ====
             st.markdown("#### 📈 累计现金流趋势图（含盈亏平衡点）")
 
-            fig = px.line(cashflow_df, x="使用年份", y="累计现金流（元）", markers=True)
-            fig.add_hline(y=0, line_dash="dash", line_color="gray", annotation_text="盈亏平衡",
-                          annotation_position="bottom right")
-
             # ===== 线性插值法求投资回收期 =====
-            payback_year = None
-            years = cashflow_df["使用年份"]
-            cumulative = cashflow_df["累计现金流（元）"]
-
-            for i in range(1, len(cumulative)):
-                if cumulative[i - 1] < 0 and cumulative[i] >= 0:
-                    x1, y1 = years[i - 1], cumulative[i - 1]
-                    x2, y2 = years[i], cumulative[i]
-                    payback_year = round(x1 + (-y1) * (x2 - x1) / (y2 - y1), 2)
-                    break
+            years = cashflow_df["使用年份"].to_numpy()
+            payback_year = format_payback(batch_payback(cashflow_df["当年净现金流（元）"].to_numpy(), years)[0])
 
+            fig = cached_figure(build_payback_figure, cashflow_df[["使用年份", "累计现金流（元）"]],
+                                "累计现金流（元）", payback_year, "投资回收期", hline_position="bottom right")
+            st.plotly_chart(fig, use_container_width=True)
             if payback_year:
-                fig.add_vline(
-                    x=payback_year,
-                    line_dash="dot",
-                    line_color="red",
-                    annotation_text=f"投资回收期 ≈ 第 {payback_year} 年",
-                    annotation_position="top left"
-                )
-                st.plotly_chart(fig, use_container_width=True)
                 st.markdown(f"📌 **预计投资回收期：第 {payback_year} 年**")
             else:
-                st.plotly_chart(fig, use_container_width=True)
                 st.markdown("📌 **未达到投资回收期（累计现金流未转正）**")
 
             # === 动态现金流分析 ===
             st.markdown("#### 🧮 动态现金流（现值现金流）分析")
 
             # 从 user_inputs.yaml 中读取折现率和通货膨胀率
-            input_path = os.path.abspath("user_inputs.yaml")
             try:
-                with open(input_path, "r", encoding="utf-8") as f:
-                    input_data = yaml.safe_load(f)
-                discount_rate = input_data["4经济分析方法参数配置"]["折现率"] / 100
-                inflation_rate = input_data["4经济分析方法参数配置"]["通货膨胀率"] / 100
+                input_data = read_document(INPUT_YAML_PATH)
+                params = ProjectParams.from_inputs(input_data)
+                discount_rate = params.discount_rate
+                inflation_rate = params.inflation_rate
             except Exception as e:
                 st.error(f"❌ 无法读取 user_inputs.yaml 中的经济参数：{e}")
                 return
@@ -258,39 +418,20 @@ def render():
 
             # 显示动态现金流图
             st.markdown("#### 📉 动态现金流图（考虑折现与通胀）")
-            fig_dynamic = px.line(
-                cashflow_df,
-                x="使用年份",
-                y="累计现值现金流（元）",
-                markers=True,
-                title="累计现值现金流趋势"
-            )
-            fig_dynamic.add_hline(y=0, line_dash="dash", line_color="gray", annotation_text="盈亏平衡")
 
             # 线性插值求动态投资回收期
-            dyn_cum = cashflow_df["累计现值现金流（元）"]
-            dyn_payback = None
-            for i in range(1, len(dyn_cum)):
-                if dyn_cum[i - 1] < 0 and dyn_cum[i] >= 0:
-                    x1, y1 = years[i - 1], dyn_cum[i - 1]
-                    x2, y2 = years[i], dyn_cum[i]
-                    dyn_payback = round(x1 + (-y1) * (x2 - x1) / (y2 - y1), 2)
-                    break
+            dyn_payback = format_payback(batch_payback(cashflow_df["现值现金流（元）"].to_numpy(), years)[0])
 
+            fig_dynamic = cached_figure(build_payback_figure, cashflow_df[["使用年份", "累计现值现金流（元）"]],
+                                        "累计现值现金流（元）", dyn_payback, "动态回收期", title="累计现值现金流趋势")
+            st.plotly_chart(fig_dynamic, use_container_width=True)
             if dyn_payback:
-                fig_dynamic.add_vline(
-                    x=dyn_payback,
-                    line_dash="dot",
-                    line_color="red",
-                    annotation_text=f"动态回收期 ≈ 第 {dyn_payback} 年",
-                    annotation_position="top left"
-                )
-                st.plotly_chart(fig_dynamic, use_container_width=True)
                 st.markdown(f"📌 **预计动态投资回收期：第 {dyn_payback} 年**")
             else:
-                st.plotly_chart(fig_dynamic, use_container_width=True)
                 st.markdown("📌 **未达到动态投资回收期（现值现金流未转正）**")
 
+            save_payback_to_yaml(payback_year, dyn_payback)
+
             # === NPV / IRR 最终分析输出 ===
             st.markdown("#### 📐 净现值（NPV）与内部收益率（IRR）")
 
@@ -349,6 +490,8 @@ def render():
                 </table>
                 """, unsafe_allow_html=True)
 
+            render_variant_comparison(input_data)
+
 
     except KeyError as e:
         st.error(f"❌ 缺失字段：{e}")
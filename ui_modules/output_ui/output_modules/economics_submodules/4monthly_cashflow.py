@@ -0,0 +1,153 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from utils.charts import cached_figure
+from utils.economics import extract_project_params
+from utils.param_paths import series_from_inputs
+from utils.loan import REPAYMENT_METHODS
+from utils.monthly import MONTHS, evaluate_monthly, monthly_shares, to_annual
+from utils.param_store import read_document, update_document
+
+# 模块元信息
+MODULE_META = {
+    "order": 4,
+    "title": "逐月现金流（月度模式）"
+}
+
+# 会话文档名（见 utils.param_store）
+YAML_PATH = "user_inputs.yaml"
+OUTPUT_YAML_PATH = "user_outputs.yaml"
+
+
+def format_period(years):
+    """
+    以“X 年 Y 个月”显示回收期（不足一个月按一个月计）
+    """
+    if years is None or np.isnan(years):
+        return "未回收"
+    months = int(np.ceil(years * MONTHS - 1e-9))
+    return f"{months // MONTHS} 年 {months % MONTHS} 个月"
+
+
+def build_monthly_figure(df: pd.DataFrame) -> go.Figure:
+    fig = go.Figure()
+    for column in ["累计现金流（元）", "累计现值现金流（元）", "融资后累计现金流（元）"]:
+        if column in df.columns:
+            fig.add_trace(go.Scatter(x=df["时间（年）"], y=df[column], mode="lines", name=column))
+    fig.add_hline(y=0, line_dash="dash", line_color="gray")
+    fig.update_layout(xaxis_title="时间（年）", yaxis_title="金额（元）", height=450,
+                      legend=dict(orientation="h", y=-0.2))
+    return fig
+
+
+def monthly_table(result: dict) -> pd.DataFrame:
+    mask = result["mask"][0]
+    months = result["months"][mask]
+    df = pd.DataFrame({
+        "使用年份": (months - 1) // MONTHS + 1,
+        "月份": (months - 1) % MONTHS + 1,
+        "时间（年）": months / MONTHS,
+        "发电量（kWh）": result["generation"][0, mask],
+        "收入（元）": result["income"][0, mask],
+        "支出（元）": result["expense"][0, mask],
+        "当月净现金流（元）": result["net"][0, mask],
+        "现值现金流（元）": result["present"][0, mask],
+    })
+    df["累计现金流（元）"] = df["当月净现金流（元）"].cumsum()
+    df["累计现值现金流（元）"] = df["现值现金流（元）"].cumsum()
+    if "financed_net" in result:
+        financed = result["financed_net"][0]
+        df["贷款月供（元）"] = result["loan_payment"][0, :len(df)]
+        df["融资后累计现金流（元）"] = np.cumsum(financed)[:len(df)]
+    return df
+
+
+def annual_table(result: dict) -> pd.DataFrame:
+    """
+    月度结果按年汇总（与“每年现金流计算”“净现金流分析”中的年度表口径一致）
+    """
+    mask = result["project"]["mask"][0]
+    return pd.DataFrame({
+        "使用年份": result["project"]["years"][mask],
+        "年发电量（kWh）": to_annual(result["generation"])[0, mask],
+        "总收入（元）": to_annual(result["income"])[0, mask],
+        "总支出（元）": to_annual(result["expense"])[0, mask],
+        "当年净现金流（元）": to_annual(result["net"])[0, mask],
+    }).round(2)
+
+
+def render():
+    st.subheader("📅 逐月现金流（月度模式）")
+
+    if not st.toggle("启用月度模式（按月分摊发电收益、按月还款与折现，回收期精确到月）", key="monthly_mode"):
+        return
+
+    data = read_document(YAML_PATH)
+    if not data:
+        st.error(f"❌ 无法加载 YAML 文件：{YAML_PATH}")
+        return
+
+    shares = monthly_shares(data)
+    source = "逐月辐射量" if "逐月辐射量" in data.get("2光伏发电参数", {}) else "各月天数"
+    st.caption(f"各月发电占比按{source}分摊：" + "、".join(f"{m + 1}月 {s:.1%}" for m, s in enumerate(shares)))
+
+    with st.expander("🏦 贷款（按月计息、按月还款，可选）"):
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            loan_amount = st.number_input("贷款额度（元）", min_value=0.0, value=0.0, step=1000.0,
+                                          key="monthly_loan_amount")
+        with col2:
+            loan_rate = st.number_input("年利率（%）", min_value=0.0, max_value=30.0, value=4.0, step=0.1,
+                                        key="monthly_loan_rate") / 100
+        with col3:
+            loan_years = st.number_input("贷款年限", min_value=1, max_value=30, value=10, step=1,
+                                         key="monthly_loan_years")
+        with col4:
+            loan_method = st.selectbox("还款方式", REPAYMENT_METHODS, key="monthly_loan_method")
+    loan = None
+    if loan_amount > 0:
+        loan = {"amount": loan_amount, "annual_rate": loan_rate, "years": loan_years, "method": loan_method}
+
+    try:
+        result = evaluate_monthly(extract_project_params(data), shares, loan, series_from_inputs(data))
+    except KeyError as e:
+        st.error(f"❌ YAML 数据中缺失字段：{e}")
+        return
+
+    static_npv = float(result["static_npv"][0])
+    dynamic_npv = float(result["dynamic_npv"][0])
+    irr = float(result["irr"][0])
+    payback = float(result["payback"][0])
+    dynamic_payback = float(result["dynamic_payback"][0])
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("静态净现值（按月折现）", f"{static_npv:,.2f} 元")
+    col2.metric("动态净现值（按月折现）", f"{dynamic_npv:,.2f} 元")
+    col3.metric("内部收益率（年化）", f"{irr * 100:.2f}%" if not np.isnan(irr) else "不存在")
+    col4.metric("静态 / 动态回收期", f"{format_period(payback)} / {format_period(dynamic_payback)}")
+    if loan is not None:
+        st.caption(f"融资后回收期：{format_period(float(result['financed_payback'][0]))}，"
+                   f"首月月供 {result['loan_payment'][0, 0]:,.2f} 元")
+
+    df = monthly_table(result)
+    st.markdown("#### 📈 逐月累计现金流")
+    chart_columns = [c for c in df.columns if c.startswith("融资后") or c.startswith("累计") or c == "时间（年）"]
+    st.plotly_chart(cached_figure(build_monthly_figure, df[chart_columns]), use_container_width=True)
+
+    st.markdown("#### 📋 按年汇总")
+    st.dataframe(annual_table(result), use_container_width=True, hide_index=True)
+
+    with st.expander(f"📄 逐月明细（{len(df)} 个月）"):
+        st.dataframe(df.round(2), use_container_width=True, hide_index=True)
+
+    update_document(OUTPUT_YAML_PATH, {
+        "月度现金流分析": {
+            "静态净现值（NPV）": round(static_npv, 2),
+            "动态净现值（NPV）": round(dynamic_npv, 2),
+            "内部收益率（IRR，年化）": None if np.isnan(irr) else round(irr, 6),
+            "静态投资回收期（年）": None if np.isnan(payback) else round(payback, 4),
+            "动态投资回收期（年）": None if np.isnan(dynamic_payback) else round(dynamic_payback, 4),
+        }
+    })
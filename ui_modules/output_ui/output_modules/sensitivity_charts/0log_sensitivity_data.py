@@ -1,28 +1,27 @@
 import streamlit as st
-import yaml
-import os
 from datetime import datetime
 
+from utils.online_stats import sync_stats
+from utils.param_store import append_shared_yaml_list, read_document
+from utils.scenario_store import record_scenario
+
+# 输入 / 输出为当前会话文档，日志为跨会话共享文件
 INPUT_PATH = "user_inputs.yaml"
 OUTPUT_PATH = "user_outputs.yaml"
 LOG_PATH = "sensitivity_log.yaml"
 
 def read_yaml_file(path):
-    if not os.path.exists(path):
+    data = read_document(path)
+    if data is None:
         st.error(f"找不到文件：{path}")
         return {}
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+    return data
 
 def append_to_log(log_path, new_entry):
-    if os.path.exists(log_path):
-        with open(log_path, "r", encoding="utf-8") as f:
-            log_data = yaml.safe_load(f) or []
-    else:
-        log_data = []
-    log_data.append(new_entry)
-    with open(log_path, "w", encoding="utf-8") as f:
-        yaml.dump(log_data, f, allow_unicode=True)
+    # 加锁追加，多个会话同时记录不会互相覆盖
+    append_shared_yaml_list(log_path, new_entry)
+    # 同步增量统计量（只解析新追加的条目）
+    sync_stats(log_path)
 
 def extract_relevant_data(inputs, outputs):
     return {
@@ -35,6 +34,15 @@ def extract_relevant_data(inputs, outputs):
         "output_results": outputs.get("现金流分析", {}).get("净现值与内部收益率", {})
     }
 
+def extract_scenario_outputs(outputs):
+    cashflow = outputs.get("现金流分析", {})
+    result = dict(cashflow.get("净现值与内部收益率", {}))
+    if not result:
+        return {}
+    result.update(cashflow.get("投资回收期", {}))
+    result["初始投入总计"] = outputs.get("初始投入计算", {}).get("初始投入总计")
+    return result
+
 def render_chart():
     # st.markdown("#### 📌 敏感性分析日志记录")
     # st.info("每次加载此模块时，将自动记录指定输入与输出参数到 `sensitivity_log.yaml` 文件中。")
@@ -44,6 +52,11 @@ def render_chart():
 
     new_log_entry = extract_relevant_data(inputs, outputs)
     append_to_log(LOG_PATH, new_log_entry)
+
+    # 同时写入方案历史库（按参数哈希去重，可按省份 / 城市 / 指标检索）；每次评估只在此处记录一次
+    scenario_outputs = extract_scenario_outputs(outputs)
+    if inputs and scenario_outputs:
+        record_scenario(inputs, scenario_outputs)
     #
     # st.success("✅ 参数日志已追加")
     # with st.expander("📄 本次记录内容"):
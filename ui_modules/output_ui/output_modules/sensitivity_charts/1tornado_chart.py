@@ -1,61 +1,74 @@
 import streamlit as st
-import yaml
 import os
 import pandas as pd
-import numpy as np
 import plotly.express as px
 
+from utils.charts import cached_figure
+from utils.online_stats import DECAY_HALF_LIVES, available_outputs, correlations, sample_size, sync_stats
+from utils.sensitivity_log import DEFAULT_RETENTION_DAYS, compact_log, load_summary
+
 LOG_PATH = "sensitivity_log.yaml"
 
-def load_sensitivity_log():
+def build_tornado_figure(df_corr, selected_output):
+    fig = px.bar(
+        df_corr,
+        x="相关系数",
+        y="参数",
+        orientation="h",
+        color="影响方向",
+        color_discrete_map={"正向": "#4CAF50", "负向": "#F44336"},
+        title=f"{selected_output} 的敏感性分析",
+        height=40 + 30 * len(df_corr)
+    )
+    fig.update_layout(yaxis=dict(tickfont=dict(size=11)), xaxis_title="Pearson 相关系数")
+    return fig
+
+def prepare():
+    """
+    计算阶段：提前把统计量同步到日志的最新状态（首次运行或其他会话追加较多时耗时较长），
+    渲染阶段只需再解析本次运行追加的一条
+    """
+    if os.path.exists(LOG_PATH):
+        sync_stats(LOG_PATH)
+
+def render_chart(prepared=None):
+    st.markdown("### 🌪️ 敏感性分析 Tornado 图表")
+
     if not os.path.exists(LOG_PATH):
         st.warning("⚠️ 未找到 `sensitivity_log.yaml`，请先运行记录模块。")
-        return []
-    with open(LOG_PATH, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or []
-
-def flatten_log_entry(entry):
-    flat = {}
-    inputs = entry.get("input_parameters", {})
-    for section, params in inputs.items():
-        for k, v in params.items():
-            flat[f"[输入]{section}/{k}"] = v
-
-    outputs = entry.get("output_results", {})
-    for k, v in outputs.items():
-        flat[f"[输出]{k}"] = v
-
-    return flat
-
-def normalize_and_filter(df):
-    numeric_df = df.select_dtypes(include=[np.number])
-    norm_df = (numeric_df - numeric_df.min()) / (numeric_df.max() - numeric_df.min() + 1e-8)
-    return norm_df, numeric_df.columns.tolist()
-
-def render_chart():
-    st.markdown("### 🌪️ 敏感性分析 Tornado 图表")
+        return
 
-    logs = load_sensitivity_log()
-    if len(logs) < 5:
+    # 增量统计量：只解析新追加的日志，相关系数无需重新扫描全部历史
+    stats = sync_stats(LOG_PATH)
+    if stats["entries"] < 5:
         st.info("📉 日志数据不足，至少需要 5 条记录才能分析。")
         return
 
-    df_all = pd.DataFrame([flatten_log_entry(entry) for entry in logs])
-
-    input_cols = [col for col in df_all.columns if col.startswith("[输入]")]
-    output_cols = [col for col in df_all.columns if col.startswith("[输出]")]
-
-    norm_df, numeric_cols = normalize_and_filter(df_all[input_cols + output_cols])
-    input_numeric = [col for col in input_cols if col in numeric_cols]
-    output_numeric = [col for col in output_cols if col in numeric_cols]
-
-    if not input_numeric or not output_numeric:
+    output_numeric = available_outputs(stats)
+    if not output_numeric:
         st.error("❌ 无法找到足够的数值型输入/输出字段，请检查日志。")
         return
 
     selected_output = st.selectbox("🎯 选择输出指标进行敏感性分析", output_numeric)
 
-    corr_series = norm_df[input_numeric].corrwith(norm_df[selected_output]).sort_values(key=abs, ascending=False)
+    modes = ["全部历史", "最近 N 天"] + [f"指数衰减（半衰期 {h} 条）" for h in DECAY_HALF_LIVES]
+    col1, col2 = st.columns(2)
+    with col1:
+        mode = st.radio("统计范围", modes, horizontal=True, key="tornado_mode")
+    days, half_life = None, None
+    if mode == modes[1]:
+        with col2:
+            days = st.number_input("天数", min_value=1, value=30, step=1, key="tornado_days")
+    elif mode != modes[0]:
+        half_life = DECAY_HALF_LIVES[modes.index(mode) - 2]
+
+    corr_series = correlations(stats, selected_output, days=days, half_life=half_life)
+    if corr_series.empty:
+        st.info("📉 所选范围内没有日志记录。")
+        return
+    corr_series = corr_series.sort_values(key=abs, ascending=False)
+    st.caption(f"有效样本（权重）：{sample_size(stats, selected_output, days, half_life):,.1f}")
+
     df_corr = corr_series.reset_index()
     df_corr.columns = ["参数", "相关系数"]
     df_corr["影响方向"] = df_corr["相关系数"].apply(lambda x: "正向" if x > 0 else "负向")
@@ -64,17 +77,7 @@ def render_chart():
 
     # 显示图表
     st.subheader("📊 Tornado 图")
-    fig = px.bar(
-        df_corr,
-        x="相关系数",
-        y="参数",
-        orientation="h",
-        color="影响方向",
-        color_discrete_map={"正向": "#4CAF50", "负向": "#F44336"},
-        title=f"{selected_output} 的敏感性分析",
-        height=40 + 30 * len(df_corr)
-    )
-    fig.update_layout(yaxis=dict(tickfont=dict(size=11)), xaxis_title="归一化后 Pearson 相关系数")
+    fig = cached_figure(build_tornado_figure, df_corr, selected_output)
     st.plotly_chart(fig, use_container_width=True)
 
     st.markdown("---")
@@ -83,4 +86,20 @@ def render_chart():
     st.subheader("📋 敏感性分析数据表")
     st.dataframe(df_corr.set_index("参数"), use_container_width=True)
 
-    st.markdown("---")
\ No newline at end of file
+    st.markdown("---")
+
+    # 日志维护：统一格式、剔除无效条目，保留期之外的记录并入月度汇总
+    with st.expander("🧹 日志维护"):
+        retention_days = st.number_input("明细保留天数", min_value=1, value=DEFAULT_RETENTION_DAYS, step=30,
+                                         key="log_retention_days")
+        if st.button("🧹 压缩日志", key="log_compact"):
+            counts = compact_log(LOG_PATH, retention_days=int(retention_days))
+            st.success("✅ 日志已压缩：" + "，".join(f"{k} {v} 条" for k, v in counts.items()))
+
+        summary = load_summary()
+        if summary:
+            st.markdown("**月度汇总**")
+            st.dataframe(pd.DataFrame([
+                {"月份": month, "条数": bucket["条数"], "起始时间": bucket["起始时间"], "结束时间": bucket["结束时间"]}
+                for month, bucket in sorted(summary.items())
+            ]).set_index("月份"), use_container_width=True)
@@ -0,0 +1,89 @@
+import streamlit as st
+import plotly.graph_objects as go
+
+from utils.param_loader import PROJECT_FIELDS
+from utils.param_store import read_document
+from utils.result_cache import cached_result
+from utils.sensitivity import SOBOL_OUTPUTS, load_schema_ranges, sobol_analysis
+
+RESULT_KEY = "sobol_result"
+
+
+def render_chart():
+    st.markdown("### 🎲 Sobol 全局敏感性分析")
+    st.markdown("""
+    <div style="font-size: 14px">
+    在输入参数的取值范围内按 Saltelli 方案抽样，批量计算 NPV / IRR：<br>
+    <b>一阶指数 S1</b>：该参数单独造成的输出方差占比；<b>总效应指数 ST</b>：含与其他参数交互作用在内的方差占比。<br>
+    ST 明显大于 S1 说明该参数存在较强的交互或非线性效应。误差线为 bootstrap 置信区间。
+    </div>
+    """, unsafe_allow_html=True)
+
+    inputs = read_document("user_inputs.yaml")
+    if not inputs:
+        st.info("请先在左侧填写并保存输入参数。")
+        return
+
+    ranges = load_schema_ranges()
+    labels = {name: PROJECT_FIELDS[name][1] for name in ranges}
+
+    with st.form("sobol_form"):
+        selected = st.multiselect("参与分析的参数", list(ranges.keys()), default=list(ranges.keys()),
+                                  format_func=labels.get)
+        col1, col2 = st.columns(2)
+        with col1:
+            n_base = st.select_slider("基础样本数 N", options=[1024, 2048, 4096, 8192, 16384, 32768, 50000],
+                                      value=4096)
+        with col2:
+            n_bootstrap = st.select_slider("bootstrap 次数", options=[50, 100, 200, 500], value=100)
+        st.caption(f"模型计算次数 = N × (参数个数 + 2) ≈ {n_base * (len(selected) + 2):,}")
+        submitted = st.form_submit_button("🎲 运行 Sobol 分析")
+
+    if submitted:
+        if not selected:
+            st.warning("⚠️ 请至少选择一个参数。")
+            return
+        with st.spinner("正在批量计算..."):
+            try:
+                selected_ranges = {name: ranges[name] for name in selected}
+                # 相同输入与抽样设置在进程内跨会话复用结果
+                st.session_state[RESULT_KEY] = cached_result(
+                    "Sobol", {"inputs": inputs, "ranges": selected_ranges, "n_base": n_base,
+                              "n_bootstrap": n_bootstrap},
+                    lambda: sobol_analysis(inputs, selected_ranges, n_base=n_base, n_bootstrap=n_bootstrap),
+                )
+            except KeyError as e:
+                st.error(f"❌ 输入参数缺少字段：{e}")
+                return
+
+    result = st.session_state.get(RESULT_KEY)
+    if not result:
+        return
+
+    stats = result["stats"]
+    output_key = st.selectbox("🎯 输出指标", list(SOBOL_OUTPUTS.keys()), format_func=SOBOL_OUTPUTS.get,
+                              key="sobol_output")
+    df = result[output_key]
+    st.caption(f"共计算 {stats['evaluations']:,} 次；有效样本比例 {stats[f'{output_key}_valid'] * 100:.1f}%"
+               "（IRR 不存在的样本已剔除）")
+    if df.empty:
+        st.warning("⚠️ 有效样本不足，无法计算该指标的 Sobol 指数。")
+        return
+
+    fig = go.Figure()
+    for column, low, high, name in [
+        ("一阶指数 S1", "S1 下限", "S1 上限", "一阶指数 S1"),
+        ("总效应指数 ST", "ST 下限", "ST 上限", "总效应指数 ST"),
+    ]:
+        fig.add_trace(go.Bar(
+            y=df["参数"], x=df[column], name=name, orientation="h",
+            error_x=dict(type="data", symmetric=False,
+                         array=df[high] - df[column], arrayminus=df[column] - df[low]),
+        ))
+    fig.update_layout(barmode="group", height=80 + 40 * len(df), yaxis=dict(autorange="reversed"),
+                      title=f"{SOBOL_OUTPUTS[output_key]} 的 Sobol 指数", xaxis_title="指数")
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.dataframe(df.set_index("参数").round(4), use_container_width=True)
+
+    st.markdown("---")
@@ -0,0 +1,334 @@
+# _stakeholder_page.py
+# 农户 / 企业 页面共用的现金流计算与渲染（下划线开头，不作为利益相关方子模块加载）
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from utils.allocation import allocate, build_item_matrix, build_share_matrix, default_share, stakeholder_table
+from utils.charts import cached_figure
+from utils.loan import COMPOUNDING_PERIODS, amortize, annual_schedule
+from utils.metrics import cashflow_metrics
+from utils.param_store import read_document, write_document_async
+
+
+def stakeholder_investment(initial_investment_data: dict, ratio_map: dict) -> float:
+    """
+    根据每项费用的出资比例计算一方总出资。
+    """
+    total = 0.0
+    for item, cost in initial_investment_data.items():
+        if isinstance(cost, (int, float)) and item in ratio_map:
+            ratio = max(0.0, min(1.0, ratio_map[item]))
+            total += cost * ratio
+    return total
+
+
+def loan_details(loan_amount: float, annual_rate: float, years: int, method: str, **kwargs) -> list:
+    """
+    返回每年还款明细：还款金额、其中利息、其中本金与年末剩余本金（利息可单独用于税费计算）
+    """
+    if years <= 0:
+        return []
+    schedule = annual_schedule(amortize(loan_amount, annual_rate, years, method, **kwargs))
+    return [
+        {
+            "使用年份": year,
+            "贷款偿还金额（元）": round(float(payment), 2),
+            "其中利息（元）": round(float(interest), 2),
+            "其中本金（元）": round(float(principal), 2),
+            "剩余本金（元）": round(float(balance), 2),
+        }
+        for year, (payment, interest, principal, balance) in enumerate(zip(
+            schedule["payment"][0], schedule["interest"][0],
+            schedule["principal"][0], schedule["balance"][0]), start=1)
+    ]
+
+
+def roof_rent(unit_price: float, area: float, years: int) -> dict:
+    """
+    计算屋顶租金：返回每年租金金额和总租金
+    """
+    annual_rent = unit_price * area
+    rent_schedule = [annual_rent] * years
+    return {
+        "annual_rent": annual_rent,
+        "rent_schedule": rent_schedule,
+        "total_rent": sum(rent_schedule)
+    }
+
+
+def stakeholder_cashflow_frame(data: dict, stakeholder: str, rent_sign: float) -> pd.DataFrame:
+    """
+    由现金流文档组织一方的全生命周期年度现金流（第 0 年为出资与贷款到账）。
+    rent_sign：屋顶租金对该方净现金流的方向，收取租金（农户）为 1，支付租金（企业）为 -1。
+    """
+    initial_invest = data.get(f"{stakeholder}总初期出资金额", 0.0)
+    loan_amount = data.get("贷款额度（元）", 0.0)
+
+    cashflow = {item["使用年份"]: item for item in data.get("年度现金流", [])}
+    rent = {item["使用年份"]: item["屋顶租金（元）"] for item in data.get("屋顶租金明细", [])}
+    loan = {item["使用年份"]: item["贷款偿还金额（元）"] for item in data.get("贷款偿还明细", [])}
+
+    records = []
+    for year in sorted(set([0] + list(cashflow.keys()) + list(rent.keys()) + list(loan.keys()))):
+        if year == 0:
+            income, expense, rent_cost, loan_cost = loan_amount, initial_invest, 0.0, 0.0
+        else:
+            income = cashflow.get(year, {}).get(f"{stakeholder}总收入（元）", 0.0)
+            expense = cashflow.get(year, {}).get(f"{stakeholder}总支出（元）", 0.0)
+            rent_cost = rent.get(year, 0.0)
+            loan_cost = loan.get(year, 0.0)
+
+        records.append({
+            "使用年份": year,
+            f"{stakeholder}总收入": income,
+            f"{stakeholder}总支出": expense,
+            "屋顶租金": rent_cost,
+            "贷款偿还": loan_cost,
+            "净现金流": income - expense + rent_sign * rent_cost - loan_cost
+        })
+
+    df = pd.DataFrame(records)
+    df["累计净现金流"] = df["净现金流"].cumsum()
+    return df
+
+
+def build_cashflow_figure(df: pd.DataFrame, stakeholder: str) -> go.Figure:
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=df["使用年份"], y=df["净现金流"], name="净现金流"))
+    fig.add_trace(go.Scatter(x=df["使用年份"], y=df["累计净现金流"], mode='lines+markers', name="累计现金流"))
+    fig.update_layout(
+        title=f"📊 {stakeholder}项目生命周期现金流图",
+        xaxis_title="使用年份",
+        yaxis_title="金额（元）",
+        barmode='group',
+        height=500
+    )
+    return fig
+
+
+def render_cashflow_summary(data: dict, stakeholder: str, rent_sign: float) -> pd.DataFrame:
+    """
+    绘制全生命周期现金流图并展示经济性指标，指标写回内存中的现金流文档
+    """
+    df = stakeholder_cashflow_frame(data, stakeholder, rent_sign)
+
+    # 计算经济性指标（插值回收期、盈亏平衡年、总净收益）
+    metrics = cashflow_metrics(df["净现金流"].to_numpy(), df["使用年份"].to_numpy())
+    interpolated_year = None if np.isnan(metrics["payback"][0]) else float(metrics["payback"][0])
+    recovery_year = None if np.isnan(metrics["breakeven"][0]) else int(metrics["breakeven"][0])
+    total_profit = float(metrics["total_profit"][0])
+
+    # 可视化图表（按数据哈希缓存）
+    fig = cached_figure(build_cashflow_figure, df[["使用年份", "净现金流", "累计净现金流"]], stakeholder=stakeholder)
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("### 📌 项目关键经济性指标")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("📈 投资回收期", f"{interpolated_year:.2f} 年" if interpolated_year else "未回收")
+    with col2:
+        st.metric("✅ 盈亏平衡年", f"{recovery_year} 年" if recovery_year else "未达成")
+    with col3:
+        st.metric("💰 总净收益", f"{total_profit:,.2f} 元")
+
+    data["经济性指标"] = {
+        "累计盈亏平衡年": int(recovery_year) if recovery_year is not None else None,
+        "投资回收期": round(float(interpolated_year), 2) if interpolated_year is not None else None,
+        "总净收益": round(float(total_profit), 2),
+    }
+    return df
+
+
+def _ratio_slider(label: str, key: str, default: float) -> float:
+    return st.slider(label, min_value=0, max_value=100, value=int(round(default * 100)), step=5, key=key) / 100.0
+
+
+def render_stakeholder_page(stakeholder: str, cashflow_path: str, rent_sign: float):
+    """
+    农户 / 企业 页面：出资与收支分成比例、屋顶租金、贷款与全生命周期现金流。
+    各部分结果在内存中汇总到现金流文档，本次渲染只保存一次（后台落盘）
+    """
+    cashflow_doc = {}
+    try:
+        _render_stakeholder_sections(stakeholder, rent_sign, cashflow_doc)
+    finally:
+        if cashflow_doc:
+            write_document_async(cashflow_path, cashflow_doc)
+
+
+def _render_stakeholder_sections(stakeholder: str, rent_sign: float, cashflow_doc: dict):
+    st.markdown("---")
+    data = read_document("user_outputs.yaml")
+    if data is None:
+        st.error("❌ 未找到文件：user_outputs.yaml")
+        data = {}
+    initial_investment_data = data.get("初始投入计算", {})
+
+    if not initial_investment_data:
+        st.warning("⚠️ 未找到初始投入相关数据，请检查 user_outputs.yaml。")
+        return
+
+    # ======== 初期出资比例 ========
+    st.markdown(f"### ✅ {stakeholder}各项初始投资出资比例设置")
+
+    # 排除不需要设置比例的汇总字段
+    excluded_items = {"初始投入总计", "设备费合计"}
+    items = [
+        (item, cost) for item, cost in initial_investment_data.items()
+        if isinstance(cost, (int, float)) and item not in excluded_items
+    ]
+
+    ratio_map = {}
+    with st.container():
+        for i in range(0, len(items), 2):
+            cols = st.columns(2)
+            for j in range(2):
+                if i + j < len(items):
+                    item, cost = items[i + j]
+                    with cols[j]:
+                        st.markdown(f"**{item}**")
+                        st.markdown(f"{cost:,.2f} 元")
+                        ratio_map[item] = _ratio_slider(f"{stakeholder}出资比例",
+                                                        f"{stakeholder}_{item}_ratio_slider", 1.0)
+
+    investment_amount = stakeholder_investment(initial_investment_data, ratio_map)
+    st.success(f"💰 {stakeholder}总初期出资金额为：**{investment_amount:,.2f} 元**")
+    cashflow_doc[f"{stakeholder}总初期出资金额"] = float(round(investment_amount, 2))
+
+    # ======== 收入 / 支出分成比例与年度分成明细 ========
+    st.markdown("---")
+    cashflow_section = data.get("现金流分析", {})
+    income_details = cashflow_section.get("年度收入明细", [])
+    expense_details = cashflow_section.get("年度支出明细", [])
+
+    if not income_details or not expense_details:
+        st.warning("⚠️ 未找到收入或支出明细数据，请检查 user_outputs.yaml。")
+        return
+
+    st.markdown(f"### 📈 项目运行期产生的{stakeholder}收益分成和支出分担比例设置")
+
+    income_keys = [k for k in income_details[0].keys()
+                   if k not in ("使用年份", "总收入（元）") and "（元）" in k]
+    expense_keys = [k for k in expense_details[0].keys()
+                    if k not in ("使用年份", "总支出（元）")]
+
+    # 默认比例与其他方已设置的比例互补，三方对比首次打开即守恒
+    shares = st.session_state.setdefault("stakeholder_shares", {})
+    income_ratio_map, expense_ratio_map = {}, {}
+    with st.expander(f"🔧 设置{stakeholder}收入分成比例"):
+        for key in income_keys:
+            income_ratio_map[key] = _ratio_slider(f"{stakeholder}参与收入比例 - {key}",
+                                                  f"{stakeholder}_income_ratio_{key}",
+                                                  default_share(stakeholder, key, shares))
+    with st.expander(f"🔧 设置{stakeholder}支出分担比例"):
+        for key in expense_keys:
+            expense_ratio_map[key] = _ratio_slider(f"{stakeholder}分担支出比例 - {key}",
+                                                   f"{stakeholder}_expense_ratio_{key}",
+                                                   default_share(stakeholder, key, shares))
+
+    # 记录本方分成比例，供“三方对比”使用
+    shares[stakeholder] = {**income_ratio_map, **expense_ratio_map}
+
+    # 未分给本方的部分计入村集体，一次矩阵乘法完成分配
+    item_matrix = build_item_matrix(income_details, expense_details)
+    allocation = allocate(item_matrix, build_share_matrix(item_matrix["items"], {stakeholder: shares[stakeholder]}))
+    table = stakeholder_table(item_matrix, allocation, stakeholder)
+
+    st.markdown(f"### 📋 项目运行期产生的{stakeholder}收益分成和支出分担")
+    st.dataframe(table, use_container_width=True)
+
+    cashflow_doc["年度现金流"] = [
+        {
+            "使用年份": row.get("使用年份"),
+            f"{stakeholder}总收入（元）": round(row.get(f"{stakeholder}总收入（元）"), 2),
+            f"{stakeholder}总支出（元）": round(row.get(f"{stakeholder}总支出（元）"), 2),
+        }
+        for row in table
+    ]
+
+    # ======== 屋顶租金 ========
+    st.markdown("---")
+    st.markdown("### 🏠 屋顶租金计算")
+
+    with st.container():
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            unit_price = st.number_input("屋顶租金单价（元/㎡·年）", min_value=0.0, value=10.0, step=1.0)
+        with col2:
+            area = st.number_input("屋顶租赁面积（㎡）", min_value=0.0, value=50.0, step=10.0)
+        with col3:
+            years = st.number_input("租赁年限", min_value=1, max_value=50, value=20, step=1)
+
+    rent_result = roof_rent(unit_price, area, years)
+
+    st.markdown(f"📅 每年租金：**{rent_result['annual_rent']:,.2f} 元**")
+    st.markdown(f"💰 总租金（{years} 年）：**{rent_result['total_rent']:,.2f} 元**")
+
+    with st.expander("📋 展开查看每年租金明细"):
+        for i, rent in enumerate(rent_result["rent_schedule"], start=1):
+            st.write(f"第 {i} 年：{rent:,.2f} 元")
+
+    cashflow_doc["屋顶租金明细"] = [
+        {"使用年份": year, "屋顶租金（元）": round(rent, 2)}
+        for year, rent in enumerate(rent_result["rent_schedule"], start=1)
+    ]
+
+    # ======== 贷款偿还 ========
+    st.markdown("---")
+    st.markdown(f"### 💳 {stakeholder}贷款参数设置")
+
+    with st.container():
+        col1, col2 = st.columns(2)
+        with col1:
+            loan_amount = st.number_input("贷款额度（元）", min_value=0.0, value=0.0, step=1000.0)
+            loan_rate = st.number_input("贷款年利率（%）", min_value=0.0, value=4.0, step=0.1) / 100.0
+        with col2:
+            loan_years = st.number_input("贷款偿还期（年）", min_value=1, max_value=30, value=10, step=1)
+            repayment_method = st.selectbox("还款方式", ["等额本息", "等额本金"])
+
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            compounding = st.selectbox("计息方式", list(COMPOUNDING_PERIODS.keys()))
+        with col2:
+            grace_years = st.number_input("宽限期（年，只付息）", min_value=0, max_value=int(loan_years) - 1,
+                                          value=0, step=1)
+        with col3:
+            prepay_year = st.number_input("提前还款年份（0 表示不提前）", min_value=0, max_value=int(loan_years),
+                                          value=0, step=1)
+        with col4:
+            prepay_amount = st.number_input("提前还款金额（元）", min_value=0.0, value=0.0, step=1000.0)
+
+    repayment_records = loan_details(
+        loan_amount, loan_rate, loan_years, repayment_method,
+        compounding=compounding,
+        grace_years=grace_years,
+        prepay_year=prepay_year,
+        prepay_amount=prepay_amount,
+    )
+
+    if loan_amount > 0:
+        total_repayment = sum(r["贷款偿还金额（元）"] for r in repayment_records)
+        total_interest = sum(r["其中利息（元）"] for r in repayment_records)
+
+        with st.expander("📆 每年贷款偿还明细（点击展开）", expanded=False):
+            st.dataframe(repayment_records, use_container_width=True)
+
+        st.info(f"📌 共计还款金额：**{total_repayment:,.2f} 元**，其中利息：**{total_interest:,.2f} 元**")
+
+    cashflow_doc.update({
+        "贷款额度（元）": round(loan_amount, 2),
+        "贷款偿还明细": repayment_records
+    })
+
+    # ======== 全生命周期现金流 ========
+    st.markdown("---")
+    st.markdown(f"### 📊 {stakeholder}全生命周期现金流分析")
+
+    df = render_cashflow_summary(cashflow_doc, stakeholder, rent_sign)
+
+    with st.expander("📋 展开查看年度现金流明细表"):
+        st.dataframe(df, use_container_width=True)
+
+    st.markdown("---")
@@ -0,0 +1,83 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from utils.param_store import read_document
+from utils.allocation import STAKEHOLDERS, allocate, build_item_matrix, build_share_matrix, resolve_shares
+
+STAKEHOLDER_META = {
+    "label": "三方对比",
+    "order": 9
+}
+
+
+def load_yaml_data(file_path: str) -> dict:
+    data = read_document(file_path)
+    if data is None:
+        st.error(f"❌ 未找到文件：{file_path}")
+        return {}
+    return data
+
+
+def render():
+    st.markdown("---")
+    st.markdown("### ⚖️ 农户 / 企业 / 村集体 三方收益对比")
+    st.caption("农户与企业的分成比例取自各自页面的最近一次设置，未分配的部分计入村集体；"
+               "尚未设置的一方按页面默认值计算（农户 100%，企业取农户的余额）。")
+
+    data = load_yaml_data("user_outputs.yaml")
+    cashflow_section = data.get("现金流分析", {})
+    income_details = cashflow_section.get("年度收入明细", [])
+    expense_details = cashflow_section.get("年度支出明细", [])
+
+    if not income_details or not expense_details:
+        st.warning("⚠️ 未找到收入或支出明细数据，请检查 user_outputs.yaml。")
+        return
+
+    shares = st.session_state.get("stakeholder_shares", {})
+    missing = [name for name in ("农户", "企业") if name not in shares]
+    if missing:
+        st.info(f"ℹ️ 尚未设置 {'、'.join(missing)} 的分成比例，按页面默认值计算。")
+
+    item_matrix = build_item_matrix(income_details, expense_details)
+    shares = resolve_shares(item_matrix["items"], shares)
+    share_matrix = build_share_matrix(item_matrix["items"], shares)
+    allocation = allocate(item_matrix, share_matrix, check=False)
+
+    # ===== 守恒校验 =====
+    error = allocation["conservation_error"]
+    if np.any(np.abs(error) > 1e-6):
+        st.error("❌ 以下分项的三方比例之和不等于 100%，项目总额未守恒（农户与企业的比例之和超过 100%）：")
+        st.dataframe(pd.DataFrame({
+            "分项": item_matrix["items"],
+            "比例之和（%）": (error + 1) * 100,
+        })[np.abs(error) > 1e-6], use_container_width=True)
+    else:
+        st.success("✅ 各分项三方比例之和均为 100%，分配结果与项目总额守恒。")
+
+    # ===== 分成比例与汇总 =====
+    with st.expander("📋 各分项三方分成比例（%）"):
+        st.dataframe(pd.DataFrame(share_matrix * 100, index=item_matrix["items"], columns=STAKEHOLDERS),
+                     use_container_width=True)
+
+    summary = pd.DataFrame({
+        "累计收入（元）": allocation["income"].sum(axis=0),
+        "累计支出（元）": allocation["expense"].sum(axis=0),
+        "累计净现金流（元）": allocation["net"].sum(axis=0),
+    }, index=STAKEHOLDERS)
+    st.markdown("#### 💰 运行期累计收益对比")
+    st.dataframe(summary.round(2), use_container_width=True)
+
+    # ===== 年度净现金流对比图 =====
+    fig = go.Figure()
+    for col, name in enumerate(STAKEHOLDERS):
+        fig.add_trace(go.Bar(x=allocation["years"], y=allocation["net"][:, col], name=name))
+    fig.update_layout(
+        title="📊 三方年度净现金流（运行期分成）",
+        xaxis_title="使用年份",
+        yaxis_title="金额（元）",
+        barmode="group",
+        height=450
+    )
+    st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,170 @@
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+
+from utils.charts import plotly_chart
+from utils.loan import REPAYMENT_METHODS
+from utils.negotiation import METRICS, PARTIES, feasible_mask, negotiation_frontier, splits_table, sweep_splits
+from utils.param_store import read_document
+from utils.result_cache import cached_result
+
+STAKEHOLDER_META = {
+    "label": "分成谈判",
+    "order": 10
+}
+
+USER_INPUT_PATH = "user_inputs.yaml"
+
+# 单次扫描的组合数上限
+MAX_SPLITS = 2_000_000
+
+
+def load_user_inputs(path):
+    data = read_document(path)
+    if data is None:
+        st.error(f"未找到参数文件：{path}")
+        return {}
+    return data
+
+
+def ratio_axis(label: str, key: str) -> list:
+    """
+    比例维度的取值范围与步长（%），返回 0~1 的取值列表
+    """
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        low, high = st.slider(label, 0, 100, (0, 100), key=f"negotiation_{key}_range")
+    with col2:
+        step = st.number_input("步长（%）", min_value=1, max_value=100, value=5, step=1, key=f"negotiation_{key}_step")
+    return (np.arange(low, high + 1e-9, step) / 100.0).tolist()
+
+
+def loan_settings(party: str) -> dict:
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        amount = st.number_input(f"{party}贷款额度（元）", min_value=0.0, value=0.0, step=1000.0)
+    with col2:
+        years = st.number_input(f"{party}贷款偿还期（年）", min_value=1, max_value=30, value=10, step=1)
+    with col3:
+        method = st.selectbox(f"{party}还款方式", REPAYMENT_METHODS)
+    return {"amount": amount, "years": int(years), "method": method}
+
+
+def build_frontier_figure(result: dict, mask: np.ndarray, front: np.ndarray, farmer_metric: str,
+                          enterprise_metric: str) -> go.Figure:
+    def values(party, metric):
+        v = result[party][metric]
+        return v * 100 if metric == "irr" else v
+
+    x, y = values("农户", farmer_metric), values("企业", enterprise_metric)
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=x[~mask], y=y[~mask], mode="markers", name="不满足约束",
+                             marker=dict(size=3, color="lightgray")))
+    fig.add_trace(go.Scatter(x=x[mask], y=y[mask], mode="markers", name="满足约束",
+                             marker=dict(size=4, color="steelblue")))
+    fig.add_trace(go.Scatter(x=x[front], y=y[front], mode="lines+markers", name="帕累托前沿",
+                             marker=dict(size=6, color="crimson")))
+    fig.update_layout(
+        title="📊 农户 / 企业 分成组合与帕累托前沿",
+        xaxis_title=f"农户{METRICS[farmer_metric][0]}",
+        yaxis_title=f"企业{METRICS[enterprise_metric][0]}",
+        height=550
+    )
+    return fig
+
+
+def render():
+    st.markdown("---")
+    st.markdown("### 🤝 农户 / 企业 分成谈判扫描")
+    st.caption("在出资、收入分成、支出分担比例与屋顶租金单价组成的组合空间中批量计算双方指标。"
+               "农户取比例 x、企业取 1 - x（各分项同比例，村集体不参与），屋顶租金由企业支付给农户。")
+
+    inputs = load_user_inputs(USER_INPUT_PATH)
+    if not inputs:
+        return
+
+    with st.form("split_negotiation_form"):
+        st.markdown("#### 📐 分成空间")
+        axes = {
+            "investment_ratio": ratio_axis("农户出资比例范围（%）", "investment"),
+            "income_ratio": ratio_axis("农户收入分成比例范围（%）", "income"),
+            "expense_ratio": ratio_axis("农户支出分担比例范围（%）", "expense"),
+        }
+
+        col1, col2, col3, col4, col5 = st.columns(5)
+        with col1:
+            rent_min = st.number_input("租金单价下限（元/㎡·年）", min_value=0.0, value=0.0, step=1.0)
+        with col2:
+            rent_max = st.number_input("租金单价上限（元/㎡·年）", min_value=0.0, value=20.0, step=1.0)
+        with col3:
+            rent_step = st.number_input("租金单价步长", min_value=0.1, value=1.0, step=0.5)
+        with col4:
+            rent_area = st.number_input("屋顶租赁面积（㎡）", min_value=0.0, value=50.0, step=10.0)
+        with col5:
+            rent_years = st.number_input("租赁年限", min_value=1, max_value=50, value=20, step=1)
+        axes["rent_price"] = np.arange(rent_min, rent_max + 1e-9, rent_step).tolist()
+
+        st.markdown("#### 💳 双方贷款条件")
+        loan_rate = st.number_input("贷款年利率（%）", min_value=0.0, value=4.0, step=0.1) / 100.0
+        loans = {party: {**loan_settings(party), "rate": loan_rate} for party in PARTIES}
+
+        submitted = st.form_submit_button("🚀 开始扫描")
+
+    if submitted:
+        n_splits = int(np.prod([len(v) for v in axes.values()], dtype=np.int64))
+        if n_splits == 0:
+            st.warning("⚠️ 请保证各维度至少有一个取值（租金单价上限不低于下限）。")
+            return
+        if n_splits > MAX_SPLITS:
+            st.warning(f"⚠️ 组合数 {n_splits:,} 超过上限 {MAX_SPLITS:,}，请增大步长或缩小范围。")
+            return
+
+        settings = dict(axes=axes, loans=loans, rent_area=rent_area, rent_years=int(rent_years))
+        progress = st.progress(0.0, text=f"正在评估 {n_splits:,} 个分成组合...")
+        # 相同输入与扫描设置在进程内跨会话复用结果
+        st.session_state["split_negotiation_result"] = cached_result(
+            "分成谈判", {"inputs": inputs, **settings},
+            lambda: sweep_splits(inputs, **settings,
+                                 progress=lambda done, total: progress.progress(done / total))
+        )
+        progress.empty()
+
+    result = st.session_state.get("split_negotiation_result")
+    if not result:
+        return
+
+    # ===== 谈判指标与双方最低回报约束（只筛选，不重新计算） =====
+    st.markdown("#### 🎯 谈判指标与最低回报约束")
+    st.caption("双方净现值之和与分成比例无关，按 NPV 比较时所有组合都在前沿上，建议以 IRR 或回收期作为谈判指标；"
+               "第 0 年没有净投入的一方不计 IRR。")
+    min_irr, min_npv, max_payback, metric = {}, {}, {}, {}
+    for party, col in zip(PARTIES, st.columns(2)):
+        with col:
+            st.markdown(f"**{party}**")
+            metric[party] = st.selectbox(f"{party}谈判指标", list(METRICS.keys()),
+                                         format_func=lambda m: METRICS[m][0], key=f"negotiation_{party}_metric")
+            irr = st.number_input(f"{party}最低 IRR（%，留空不限）", value=None, step=0.5,
+                                  key=f"negotiation_{party}_min_irr")
+            min_irr[party] = None if irr is None else irr / 100.0
+            min_npv[party] = st.number_input(f"{party}最低 NPV（元，留空不限）", value=None, step=1000.0,
+                                             key=f"negotiation_{party}_min_npv")
+            max_payback[party] = st.number_input(f"{party}最长回收期（年，留空不限）", value=None, min_value=0.0,
+                                                 step=1.0, key=f"negotiation_{party}_max_payback")
+
+    mask = feasible_mask(result, min_irr, min_npv, max_payback)
+    front = negotiation_frontier(result, metric["农户"], metric["企业"], mask)
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("分成组合总数", f"{result['n_splits']:,}")
+    col2.metric("满足双方约束", f"{int(mask.sum()):,}")
+    col3.metric("前沿方案数", f"{len(front):,}")
+
+    plotly_chart(build_frontier_figure(result, mask, front, metric["农户"], metric["企业"]),
+                 use_container_width=True)
+
+    if len(front) == 0:
+        st.warning("⚠️ 没有满足双方约束的分成组合，请放宽约束或调整分成空间。")
+        return
+
+    st.markdown("#### 📋 满足约束的前沿分成方案")
+    st.dataframe(splits_table(result, front).round(2), use_container_width=True, hide_index=True)
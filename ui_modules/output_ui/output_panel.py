@@ -5,6 +5,8 @@ import os
 import glob
 from collections import defaultdict
 
+from utils.parallel import call_render, prepare_modules
+
 OUTPUT_MODULE_FOLDER = "ui_modules/output_ui/output_modules"
 
 def load_module(file_path):
@@ -50,15 +52,26 @@ def render_output_panel():
         title = meta.get("title", module_name)
 
         category_groups[category].append({
+            "name": module_name,
+            "module": module,
             "order": order,
             "title": title,
             "render_fn": module.render
         })
 
+    # 计算阶段：并发执行各模块的 prepare()（不涉及页面绘制）
+    prepared = prepare_modules({
+        mod["name"]: mod["module"] for modules in category_groups.values() for mod in modules
+    })
+
     # 排序并渲染每个分类模块
     for category, modules in category_groups.items():
         st.subheader(f"📂 {category}")
         modules_sorted = sorted(modules, key=lambda x: x["order"])
         for mod in modules_sorted:
             st.markdown(f"### 📌 {mod['title']}")
-            mod["render_fn"]()
+            outcome = prepared.get(mod["name"])
+            if outcome and outcome["error"] is not None:
+                st.error(f"❌ 模块 `{mod['title']}` 计算失败：{outcome['error']}")
+                continue
+            call_render(mod["render_fn"], outcome)
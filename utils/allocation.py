@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+# 参与分配的利益相关方（列顺序固定）
+STAKEHOLDERS = ["农户", "企业", "村集体"]
+
+INCOME = 1.0
+EXPENSE = -1.0
+
+# 各方页面分成比例的默认值：农户默认全部承担 / 获得，企业默认取农户的余额，三方合计为 100%
+DEFAULT_SHARE = {"农户": 1.0}
+
+
+def build_item_matrix(income_details: list, expense_details: list) -> dict:
+    """
+    将年度收入 / 支出明细（每年一个字典）整理为 年份 × 分项 矩阵。
+    收入分项取带“（元）”的金额列（不含总收入），支出分项取除总支出外的全部列。
+    """
+    income_df = pd.DataFrame(income_details)
+    expense_df = pd.DataFrame(expense_details)
+    n_years = min(len(income_df), len(expense_df))
+
+    income_keys = [k for k in income_df.columns
+                   if k not in ("使用年份", "总收入（元）") and "（元）" in k]
+    expense_keys = [k for k in expense_df.columns
+                    if k not in ("使用年份", "总支出（元）")]
+
+    if "使用年份" in income_df.columns:
+        years = income_df["使用年份"].to_numpy()[:n_years].astype(int)
+    else:
+        years = np.arange(1, n_years + 1)
+
+    values = np.hstack([
+        income_df[income_keys].to_numpy(dtype=float)[:n_years],
+        expense_df[expense_keys].to_numpy(dtype=float)[:n_years],
+    ])
+
+    return {
+        "years": years,
+        "items": income_keys + expense_keys,
+        "kinds": np.array([INCOME] * len(income_keys) + [EXPENSE] * len(expense_keys)),
+        "values": np.nan_to_num(values),
+    }
+
+
+def build_share_matrix(items: list, shares: dict, stakeholders: list = None, residual: str = "村集体") -> np.ndarray:
+    """
+    构造 分项 × 利益相关方 的分成比例矩阵。
+    shares: {利益相关方: {分项: 比例}}，未给出的分项比例记为 0；
+    residual 指定的利益相关方承接其余各方未分配的部分（1 - 其余之和，不低于 0）。
+    """
+    stakeholders = stakeholders or STAKEHOLDERS
+    matrix = np.zeros((len(items), len(stakeholders)))
+
+    for col, name in enumerate(stakeholders):
+        ratio_map = shares.get(name, {})
+        matrix[:, col] = [ratio_map.get(item, 0.0) for item in items]
+    matrix = np.clip(matrix, 0.0, 1.0)
+
+    if residual in stakeholders and residual not in shares:
+        col = stakeholders.index(residual)
+        others = matrix.sum(axis=1) - matrix[:, col]
+        matrix[:, col] = np.clip(1.0 - others, 0.0, 1.0)
+
+    return matrix
+
+
+def conservation_error(share_matrix: np.ndarray) -> np.ndarray:
+    """
+    各分项在所有利益相关方之间的比例之和与 1 的偏差（支持批量 (..., 分项, 利益相关方)）
+    """
+    return np.asarray(share_matrix).sum(axis=-1) - 1.0
+
+
+def allocate(item_matrix: dict, share_matrix: np.ndarray, stakeholders: list = None,
+             check: bool = True, tol: float = 1e-6) -> dict:
+    """
+    通过一次矩阵乘法得到所有利益相关方的年度收入、支出与净现金流。
+
+    share_matrix 为 (分项, 利益相关方) 或批量 (B, 分项, 利益相关方)；
+    权重矩阵按 [收入 | 支出 | 净额] 横向拼接，values @ W 一次性给出三类结果。
+    check=True 时若分项比例之和不为 1（项目总额未守恒）抛出 ValueError。
+    """
+    stakeholders = stakeholders or STAKEHOLDERS
+    shares = np.asarray(share_matrix, dtype=float)
+    kinds = item_matrix["kinds"]
+    values = item_matrix["values"]
+
+    error = conservation_error(shares)
+    if check and np.any(np.abs(error) > tol):
+        items = np.asarray(item_matrix["items"])
+        bad = items[np.any(np.abs(error.reshape(-1, len(items))) > tol, axis=0)]
+        raise ValueError(f"以下分项的分成比例之和不等于 100%：{', '.join(bad)}")
+
+    income_mask = (kinds == INCOME)[:, None]
+    expense_mask = (kinds == EXPENSE)[:, None]
+    weights = np.concatenate([
+        shares * income_mask,
+        shares * expense_mask,
+        shares * kinds[:, None],
+    ], axis=-1)
+
+    result = np.matmul(values, weights)
+    k = len(stakeholders)
+
+    return {
+        "years": item_matrix["years"],
+        "items": item_matrix["items"],
+        "stakeholders": stakeholders,
+        "shares": shares,
+        "conservation_error": error,
+        "income": result[..., :k],
+        "expense": result[..., k:2 * k],
+        "net": result[..., 2 * k:],
+    }
+
+
+def stakeholder_table(item_matrix: dict, allocation: dict, stakeholder: str) -> list:
+    """
+    生成单个利益相关方的年度分成明细表（分项金额 + 总收入 / 总支出）
+    """
+    col = allocation["stakeholders"].index(stakeholder)
+    detail = item_matrix["values"] * allocation["shares"][:, col]
+
+    df = pd.DataFrame(detail, columns=item_matrix["items"])
+    df.insert(0, "使用年份", item_matrix["years"])
+    df[f"{stakeholder}总收入（元）"] = allocation["income"][:, col]
+    df[f"{stakeholder}总支出（元）"] = allocation["expense"][:, col]
+    return df.to_dict(orient="records")
+
+
+def default_share(stakeholder: str, item: str, shares: dict) -> float:
+    """
+    分项在某一方页面上的默认比例：农户为 DEFAULT_SHARE，企业取农户比例（未设置时取其默认值）的余额
+    """
+    if stakeholder == "企业":
+        return 1.0 - shares.get("农户", {}).get(item, default_share("农户", item, shares))
+    return DEFAULT_SHARE.get(stakeholder, 0.0)
+
+
+def resolve_shares(items: list, shares: dict, stakeholders: tuple = ("农户", "企业")) -> dict:
+    """
+    补全尚未在页面上设置的一方：按页面默认值（default_share）取各分项比例，已设置的保持不变
+    """
+    resolved = dict(shares)
+    for name in stakeholders:
+        if name not in resolved:
+            resolved[name] = {item: default_share(name, item, resolved) for item in items}
+    return resolved
@@ -0,0 +1,167 @@
+"""
+图表缓存与大数据量渲染：
+
+- cached_figure：按“构图函数 + 数据哈希 + 参数”缓存 Plotly 图表，数据不变时重跑页面不再重新构图；
+- optimize_figure：点数超过阈值的折线 / 散点自动改为 WebGL（scattergl），
+  折线在服务端用 LTTB 降采样，散点按步长抽稀，控制传给浏览器的数据量。
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+MAX_CACHED_FIGURES = 256
+WEBGL_THRESHOLD = 2000       # 超过该点数改用 WebGL
+MAX_LINE_POINTS = 2000       # 折线降采样后的点数
+MAX_SCATTER_POINTS = 20000   # 散点抽稀后的点数
+
+_figures = OrderedDict()
+_figures_lock = threading.Lock()
+
+# 与数据点一一对应、需要同步降采样的字段
+_POINT_FIELDS = ("x", "y", "text", "hovertext", "customdata", "ids")
+_MARKER_FIELDS = ("color", "size", "symbol", "opacity")
+
+
+# ===== 缓存 =====
+
+def _update_hash(h, value):
+    if isinstance(value, pd.DataFrame):
+        h.update(json.dumps([str(c) for c in value.columns], ensure_ascii=False).encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, pd.Series):
+        h.update(str(value.name).encode("utf-8"))
+        h.update(pd.util.hash_pandas_object(value, index=True).values.tobytes())
+    elif isinstance(value, np.ndarray):
+        h.update(f"{value.dtype}{value.shape}".encode("utf-8"))
+        h.update(np.ascontiguousarray(value).tobytes())
+    else:
+        h.update(json.dumps(value, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8"))
+
+
+def data_hash(*parts) -> str:
+    h = hashlib.sha1()
+    for part in parts:
+        _update_hash(h, part)
+    return h.hexdigest()
+
+
+def cached_figure(builder, *data, **params) -> go.Figure:
+    """
+    调用 builder(*data, **params) 构图并缓存；数据与参数的哈希不变时直接返回缓存的图表。
+    返回的图表为共享对象，调用方不应再修改。
+    """
+    key = data_hash(builder.__module__, builder.__qualname__, *data, params)
+    with _figures_lock:
+        if key in _figures:
+            _figures.move_to_end(key)
+            return _figures[key]
+
+    fig = optimize_figure(builder(*data, **params))
+
+    with _figures_lock:
+        _figures[key] = fig
+        while len(_figures) > MAX_CACHED_FIGURES:
+            _figures.popitem(last=False)
+    return fig
+
+
+def clear_figure_cache():
+    with _figures_lock:
+        _figures.clear()
+
+
+# ===== 降采样 =====
+
+def lttb_indices(x, y, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets 降采样，返回保留点的下标（保留首尾点与形状特征）
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def _is_numeric_sorted(x) -> bool:
+    try:
+        x = np.asarray(x, dtype=float)
+    except (TypeError, ValueError):
+        return False
+    return bool(np.all(np.diff(x) >= 0))
+
+
+def _subset(trace: dict, idx: np.ndarray, n: int) -> dict:
+    for field in _POINT_FIELDS:
+        value = trace.get(field)
+        if value is not None and np.ndim(value) >= 1 and len(value) == n:
+            trace[field] = np.asarray(value)[idx]
+    marker = trace.get("marker")
+    if isinstance(marker, dict):
+        for field in _MARKER_FIELDS:
+            value = marker.get(field)
+            if value is not None and np.ndim(value) == 1 and len(value) == n:
+                marker[field] = np.asarray(value)[idx]
+    return trace
+
+
+def optimize_figure(fig: go.Figure) -> go.Figure:
+    """
+    大数据量的 scatter 轨迹改为 scattergl，并对折线 LTTB 降采样、对散点按步长抽稀
+    """
+    if not any(t.type in ("scatter", "scattergl") and t.y is not None and len(t.y) > WEBGL_THRESHOLD
+               for t in fig.data):
+        return fig
+
+    traces = []
+    for trace in fig.data:
+        n = 0 if trace.y is None else len(trace.y)
+        if trace.type not in ("scatter", "scattergl") or n <= WEBGL_THRESHOLD:
+            traces.append(trace)
+            continue
+
+        data = trace.to_plotly_json()
+        mode = data.get("mode") or "lines"
+        x = data.get("x")
+        if x is None:
+            x = np.arange(n)
+            data["x"] = x
+        if "lines" in mode and _is_numeric_sorted(x):
+            idx = lttb_indices(x, data["y"], MAX_LINE_POINTS)
+        else:
+            idx = np.arange(0, n, max(1, int(np.ceil(n / MAX_SCATTER_POINTS))))
+
+        data = _subset(data, idx, n)
+        data.pop("type", None)
+        data.pop("uid", None)
+        traces.append(go.Scattergl(data))
+
+    return go.Figure(data=traces, layout=fig.layout)
+
+
+def plotly_chart(fig: go.Figure, **kwargs):
+    """
+    渲染前自动做 WebGL / 降采样优化的 st.plotly_chart
+    """
+    st.plotly_chart(optimize_figure(fig), **kwargs)
@@ -0,0 +1,232 @@
+import numpy as np
+
+# 项目参数由参数 YAML 生成的 ProjectParams 提取（字段表 PROJECT_FIELDS 见 utils.param_loader）
+from utils.param_loader import ProjectParams
+from utils.metrics import batch_lcoe, cashflow_metrics, discount_factors
+from utils.param_paths import parameter_paths
+
+INVESTMENT_ITEMS = ["光伏组件费用", "逆变器费用", "安装费用", "方案设计成本", "项目决策成本", "其他初期费用"]
+INCOME_ITEMS = ["售电收益（元）", "自用收益（元）"]
+EXPENSE_ITEMS = ["运维费用（元）", "税费（元）", "折旧费用（元）"]
+
+
+def extract_project_params(inputs: dict) -> dict:
+    """
+    从 user_inputs 结构中提取计算所需参数，并统一换算为小数形式（如百分比 /100）
+    """
+    return ProjectParams.from_inputs(inputs).as_dict()
+
+
+def broadcast_params(params: dict) -> dict:
+    """
+    将标量或数组参数广播为相同长度的一维数组
+    """
+    names = list(params.keys())
+    arrays = np.broadcast_arrays(*[np.atleast_1d(np.asarray(params[n], dtype=float)) for n in names])
+    return {n: np.ravel(a) for n, a in zip(names, arrays)}
+
+
+def evaluate_projects(params: dict, series: dict = None) -> dict:
+    """
+    批量计算项目口径的初始投入、年度收入、年度支出与净现金流。
+    params 的每个值可为标量或形状 (B,) 的数组，寿命不同的方案按最长寿命补零对齐；
+    电价、补贴与运维成本按年取值（见 utils.param_paths，series 为逐年参数表）。
+    """
+    p = broadcast_params(params)
+    lifetime = p["lifetime"].astype(int)
+    n_years = int(lifetime.max())
+    years = np.arange(1, n_years + 1)
+    mask = years[None, :] <= lifetime[:, None]
+
+    def col(name):
+        return p[name][:, None]
+
+    # 初始投入
+    panel_cost = p["panel_price"] * p["area"]
+    install_cost = p["install_cost"] * p["area"]
+    investment_items = {
+        "光伏组件费用": panel_cost,
+        "逆变器费用": p["inverter_price"],
+        "安装费用": install_cost,
+        "方案设计成本": p["design_cost"],
+        "项目决策成本": p["decision_cost"],
+        "其他初期费用": p["other_cost"],
+    }
+    initial_investment = sum(investment_items.values())
+
+    # 逐年电价、补贴与运维成本
+    paths = parameter_paths(p, years, series)
+
+    # 年发电量与收入
+    decay_factor = (1 - col("decay")) ** years[None, :]
+    generation = col("radiation") * col("area") * col("efficiency") * col("pr") * decay_factor * mask
+    sell_income = generation * col("sell_ratio") * (paths["sell_price"] + paths["subsidy"])
+    self_use_income = generation * (1 - col("sell_ratio")) * (paths["use_price"] - paths["sell_price"])
+    income = sell_income + self_use_income
+
+    # 年度支出
+    om = np.broadcast_to(paths["om_cost"] * col("area"), income.shape) * mask
+    tax = income * col("tax_rate")
+    depreciation = np.broadcast_to(col("depreciation_rate") * initial_investment[:, None], income.shape) * mask
+    expense = om + tax + depreciation
+
+    # 净现金流：初始投入计入第一年
+    net = income - expense
+    net[:, 0] -= initial_investment
+
+    return {
+        "years": years,
+        "mask": mask,
+        "investment_items": investment_items,
+        "initial_investment": initial_investment,
+        "generation": generation,
+        "income_items": {"售电收益（元）": sell_income, "自用收益（元）": self_use_income},
+        "expense_items": {"运维费用（元）": om, "税费（元）": tax, "折旧费用（元）": depreciation},
+        "income": income,
+        "expense": expense,
+        "net": net,
+    }
+
+
+def _weighted_sum(items: dict, ratio) -> np.ndarray:
+    """
+    按比例汇总各分项；ratio 可为统一比例（标量/数组）或 {分项: 比例} 字典
+    """
+    total = 0.0
+    for key, values in items.items():
+        r = ratio.get(key, 0.0) if isinstance(ratio, dict) else ratio
+        r = np.clip(np.asarray(r, dtype=float), 0.0, 1.0)
+        if np.ndim(values) == 2 and np.ndim(r) == 1:
+            r = r[:, None]
+        total = total + values * r
+    return total
+
+
+def stakeholder_cashflows(project: dict, investment_ratio=1.0, income_ratio=1.0, expense_ratio=1.0,
+                          rent=0.0, rent_years: int = 0, rent_sign: float = 1.0,
+                          loan_amount=0.0, loan_payments=None) -> np.ndarray:
+    """
+    批量计算利益相关方视角的年度净现金流，返回形状 (B, H+1) 的数组，第 0 列为第 0 年。
+    第 0 年：贷款到账 - 初期出资；之后每年：分成收入 - 分担支出 ± 屋顶租金 - 贷款偿还。
+    rent_sign 为 1 表示收取租金（农户），-1 表示支付租金（企业）。
+    """
+    investment = _weighted_sum(project["investment_items"], investment_ratio)
+    income = _weighted_sum(project["income_items"], income_ratio)
+    expense = _weighted_sum(project["expense_items"], expense_ratio)
+    n_rows, n_years = income.shape
+
+    loan_horizon = 0 if loan_payments is None else np.shape(loan_payments)[-1]
+    horizon = max(n_years, int(rent_years), loan_horizon)
+
+    flows = np.zeros((n_rows, horizon + 1))
+    flows[:, 0] = np.asarray(loan_amount, dtype=float) - investment
+    flows[:, 1:n_years + 1] = income - expense
+    if rent_years > 0:
+        flows[:, 1:int(rent_years) + 1] += rent_sign * np.asarray(rent, dtype=float).reshape(-1, 1)
+    if loan_horizon:
+        flows[:, 1:loan_horizon + 1] -= loan_payments
+
+    return flows
+
+
+def batch_npv(cashflows: np.ndarray, rate) -> np.ndarray:
+    """
+    批量净现值，首列视为第 0 期不折现（与 numpy_financial.npv 口径一致）
+    """
+    cashflows = np.atleast_2d(cashflows)
+    factors = discount_factors(rate, cashflows.shape[1])
+    if factors.ndim == 1:
+        return cashflows @ factors
+    return np.sum(cashflows * factors, axis=1)
+
+
+def batch_irr(cashflows: np.ndarray, low: float = -0.99, high: float = 10.0, tol: float = 1e-10,
+              max_iter: int = 60) -> np.ndarray:
+    """
+    批量内部收益率：先在利率网格上定位最接近 0 的变号区间，再用带区间保护的牛顿法收敛。
+    无变号（IRR 不存在）的行返回 NaN。
+    """
+    cashflows = np.atleast_2d(np.asarray(cashflows, dtype=float))
+    n_rows, n_periods = cashflows.shape
+    t = np.arange(n_periods)
+
+    grid = np.unique(np.concatenate([
+        np.linspace(low, 0.0, 40, endpoint=False),
+        np.geomspace(1e-4, high, 60),
+        [0.0],
+    ]))
+    values = cashflows @ ((1 + grid[None, :]) ** -t[:, None])
+    sign_change = np.signbit(values[:, :-1]) != np.signbit(values[:, 1:])
+
+    # 选取离 0 最近的变号区间
+    centers = 0.5 * (grid[:-1] + grid[1:])
+    distance = np.where(sign_change, np.abs(centers)[None, :], np.inf)
+    idx = np.argmin(distance, axis=1)
+    found = np.isfinite(distance[np.arange(n_rows), idx])
+
+    lo = grid[idx].copy()
+    hi = grid[idx + 1].copy()
+    f_lo = values[np.arange(n_rows), idx]
+    r = 0.5 * (lo + hi)
+
+    # 只对尚未收敛的行继续迭代
+    active = np.flatnonzero(found)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        cf, ra = cashflows[active], r[active]
+        weighted = cf * np.exp(-t[None, :] * np.log1p(ra)[:, None])
+        f = weighted.sum(axis=1)
+        df = -(weighted @ t) / (1 + ra)
+
+        # 更新区间
+        same = np.signbit(f) == np.signbit(f_lo[active])
+        lo[active] = np.where(same, ra, lo[active])
+        f_lo[active] = np.where(same, f, f_lo[active])
+        hi[active] = np.where(same, hi[active], ra)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = ra - f / df
+        inside = np.isfinite(step) & (step > lo[active]) & (step < hi[active])
+        r_next = np.where(inside, step, 0.5 * (lo[active] + hi[active]))
+
+        done = np.abs(r_next - ra) < tol
+        r[active] = r_next
+        active = active[~done]
+
+    return np.where(found, r, np.nan)
+
+
+def evaluate_metrics(params: dict, series: dict = None) -> dict:
+    """
+    批量计算项目口径的核心经济指标（与“净现金流分析”模块口径一致）：
+    静态 / 动态 NPV、IRR、投资回收期、盈亏平衡年、总净收益、投资回报率与平准化度电成本
+    """
+    project = evaluate_projects(params, series)
+    p = broadcast_params(params)
+    net = project["net"]
+    years = project["years"]
+
+    real_rate = (1 + p["discount_rate"]) / (1 + p["inflation_rate"]) - 1
+    kernel = cashflow_metrics(net, years, rate=real_rate, investment=project["initial_investment"])
+    irr = batch_irr(net)
+
+    # 平准化度电成本：初始投入计入第 1 年，年度成本只计运维费用（税费随收入变化、折旧已含在投入中）
+    costs = project["expense_items"]["运维费用（元）"].copy()
+    costs[:, 0] += project["initial_investment"]
+
+    return {
+        "project": project,
+        "initial_investment": project["initial_investment"],
+        "real_rate": real_rate,
+        "static_npv": batch_npv(net, p["discount_rate"]),
+        "static_irr": irr,
+        "dynamic_npv": kernel["present"].sum(axis=1),
+        "dynamic_irr": irr,
+        "payback": kernel["payback"],
+        "dynamic_payback": kernel["dynamic_payback"],
+        "breakeven": kernel["breakeven"],
+        "total_profit": kernel["total_profit"],
+        "roi": kernel["roi"],
+        "lcoe": batch_lcoe(costs, project["generation"], p["discount_rate"]),
+    }
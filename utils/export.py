@@ -0,0 +1,229 @@
+"""
+现金流结果导出：初始投入、年度收支、净现金流 / 现值现金流及利益相关方现金流，
+支持 CSV、Parquet（需 pyarrow）与 Excel（需 openpyxl）。
+
+批量组合按块计算、按块写出（CSV 追加写、Parquet 按行组写、Excel 使用 write-only 工作簿），
+内存占用只与块大小有关，与项目数无关。
+"""
+
+import io
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from utils.economics import broadcast_params, evaluate_projects, extract_project_params, stakeholder_cashflows
+from utils.param_loader import PROJECT_FIELDS
+
+EXPORT_FORMATS = {
+    "csv": "CSV（zip 压缩包）",
+    "parquet": "Parquet（zip 压缩包）",
+    "excel": "Excel（xlsx）",
+}
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+# ===== 写出器：write(表名, DataFrame) 可多次调用追加，close() 返回生成的文件列表 =====
+
+def _csv_writer(directory: str):
+    paths = {}
+
+    def write(table: str, df: pd.DataFrame):
+        first = table not in paths
+        path = paths.setdefault(table, os.path.join(directory, f"{table}.csv"))
+        df.to_csv(path, mode="w" if first else "a", header=first, index=False,
+                  encoding="utf-8-sig" if first else "utf-8")
+
+    def close():
+        return list(paths.values())
+
+    return write, close
+
+
+def _parquet_writer(directory: str):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("导出 Parquet 需要安装 pyarrow：pip install pyarrow")
+
+    writers = {}
+
+    def write(table: str, df: pd.DataFrame):
+        if table not in writers:
+            schema = pa.Schema.from_pandas(df, preserve_index=False)
+            path = os.path.join(directory, f"{table}.parquet")
+            writers[table] = (pq.ParquetWriter(path, schema, compression="snappy"), schema, path)
+        writer, schema, _ = writers[table]
+        writer.write_table(pa.Table.from_pandas(df, schema=schema, preserve_index=False))
+
+    def close():
+        for writer, _, _ in writers.values():
+            writer.close()
+        return [path for _, _, path in writers.values()]
+
+    return write, close
+
+
+def _excel_writer(directory: str):
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ImportError("导出 Excel 需要安装 openpyxl：pip install openpyxl")
+
+    workbook = Workbook(write_only=True)
+    sheets = {}
+    path = os.path.join(directory, "现金流导出.xlsx")
+
+    def write(table: str, df: pd.DataFrame):
+        if table not in sheets:
+            sheets[table] = workbook.create_sheet(title=table[:31])
+            sheets[table].append(list(df.columns))
+        sheet = sheets[table]
+        for row in df.itertuples(index=False, name=None):
+            sheet.append([v.item() if isinstance(v, np.generic) else v for v in row])
+
+    def close():
+        workbook.save(path)
+        return [path]
+
+    return write, close
+
+
+_WRITERS = {"csv": _csv_writer, "parquet": _parquet_writer, "excel": _excel_writer}
+
+
+def _package(paths: list, fmt: str) -> tuple:
+    """
+    单个 Excel 文件直接返回，CSV / Parquet 打包为 zip；返回 (文件名, 字节)
+    """
+    if fmt == "excel":
+        with open(paths[0], "rb") as f:
+            return os.path.basename(paths[0]), f.read()
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+        for path in paths:
+            zf.write(path, arcname=os.path.basename(path))
+    return f"现金流导出_{fmt}.zip", buffer.getvalue()
+
+
+def export_tables(table_chunks, fmt: str) -> tuple:
+    """
+    将 {表名: DataFrame} 的分块序列逐块写出并打包，返回 (文件名, 字节)
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"不支持的导出格式：{fmt}")
+    with tempfile.TemporaryDirectory() as directory:
+        write, close = _WRITERS[fmt](directory)
+        for tables in table_chunks:
+            for table, df in tables.items():
+                if df is not None and not df.empty:
+                    write(table, df)
+        return _package(close(), fmt)
+
+
+# ===== 当前方案：直接导出会话中的结果文档 =====
+
+def session_tables(outputs: dict, stakeholder_docs: dict = None) -> dict:
+    """
+    从 user_outputs 及各利益相关方文档中整理出导出用的表格
+    """
+    cashflow = outputs.get("现金流分析", {})
+    tables = {
+        "初始投入": pd.DataFrame([outputs.get("初始投入计算", {})]),
+        "年度收入": pd.DataFrame(cashflow.get("年度收入明细", [])),
+        "年度支出": pd.DataFrame(cashflow.get("年度支出明细", [])),
+        "年度净现金流": pd.DataFrame(cashflow.get("年度净现金流明细", [])),
+        "动态净现金流": pd.DataFrame(cashflow.get("动态净现金流明细", [])),
+    }
+    for label, doc in (stakeholder_docs or {}).items():
+        if doc and doc.get("年度现金流"):
+            tables[f"{label}现金流"] = pd.DataFrame(doc["年度现金流"])
+    return tables
+
+
+# ===== 批量组合：分块计算并生成长表 =====
+
+def portfolio_params(df: pd.DataFrame, base_inputs: dict) -> dict:
+    """
+    由上传的项目参数表生成批量参数：列名为输入参数名（如“太阳能板面积（㎡）”），
+    单位与输入面板一致；缺失的列取当前输入值。每个参数均为长度等于表行数的数组
+    """
+    base = extract_project_params(base_inputs)
+    params = {}
+    for name, (_, key, scale) in PROJECT_FIELDS.items():
+        if key in df.columns:
+            params[name] = pd.to_numeric(df[key], errors="raise").to_numpy(dtype=float) * scale
+        else:
+            # 按表行数展开：只有项目编号列的表同样得到每行一个项目
+            params[name] = np.full(len(df), base[name], dtype=float)
+    return params
+
+
+def _long_table(project_ids, years, mask, columns: dict) -> pd.DataFrame:
+    rows, cols = np.nonzero(mask)
+    data = {"项目编号": np.asarray(project_ids)[rows], "使用年份": years[cols]}
+    for name, values in columns.items():
+        data[name] = np.round(values[rows, cols], 2)
+    return pd.DataFrame(data)
+
+
+def iter_portfolio_tables(params: dict, project_ids=None, stakeholder_shares: dict = None,
+                          chunk_size: int = DEFAULT_CHUNK_SIZE, series: dict = None):
+    """
+    分块计算组合中每个项目的各类现金流，逐块产出 {表名: 长表 DataFrame}。
+    stakeholder_shares 为 {利益相关方: {收支分项: 比例}}，用于拆分各方的经营现金流；
+    series 为逐年参数表（见 utils.param_paths.series_from_inputs），对组合中所有项目生效。
+    """
+    p = broadcast_params(params)
+    n_projects = len(next(iter(p.values())))
+    if project_ids is None:
+        project_ids = np.arange(1, n_projects + 1)
+    project_ids = np.asarray(project_ids)
+
+    for start in range(0, n_projects, chunk_size):
+        end = min(start + chunk_size, n_projects)
+        chunk = {k: v[start:end] for k, v in p.items()}
+        ids = project_ids[start:end]
+        project = evaluate_projects(chunk, series)
+        years, mask, net = project["years"], project["mask"], project["net"]
+
+        real_rate = (1 + chunk["discount_rate"]) / (1 + chunk["inflation_rate"]) - 1
+        present = net * (1 + real_rate[:, None]) ** -np.arange(net.shape[1])[None, :]
+
+        investment = pd.DataFrame({"项目编号": ids})
+        for item, values in project["investment_items"].items():
+            investment[item] = np.round(values, 2)
+        investment["初始投入总计"] = np.round(project["initial_investment"], 2)
+
+        tables = {
+            "初始投入": investment,
+            "年度收支": _long_table(ids, years, mask, {
+                "年发电量（kWh）": project["generation"],
+                **project["income_items"],
+                **project["expense_items"],
+                "总收入（元）": project["income"],
+                "总支出（元）": project["expense"],
+            }),
+            "净现金流": _long_table(ids, years, mask, {
+                "当年净现金流（元）": net,
+                "累计现金流（元）": np.cumsum(net, axis=1),
+                "现值现金流（元）": present,
+                "累计现值现金流（元）": np.cumsum(present, axis=1),
+            }),
+        }
+
+        frames = []
+        for label, shares in (stakeholder_shares or {}).items():
+            flows = stakeholder_cashflows(project, investment_ratio=0.0, income_ratio=shares,
+                                          expense_ratio=shares)[:, 1:]
+            df = _long_table(ids, years, mask, {"经营净现金流（元）": flows})
+            df.insert(1, "利益相关方", label)
+            frames.append(df)
+        if frames:
+            tables["利益相关方现金流"] = pd.concat(frames, ignore_index=True)
+
+        yield tables
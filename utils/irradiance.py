@@ -0,0 +1,174 @@
+"""
+高分辨率辐照数据（县 / 乡镇 / 格点级）：
+
+- 数据以压缩 .npz 保存：lat、lon（度）、annual（年辐射量 kWh/m²），可选 monthly (N, 12) 与 names（地名）；
+- 首次使用时加载并建立均匀网格索引（CSR 结构），每个进程只加载一次；
+- 按坐标查询时在邻近网格中取最近的 k 个点做反距离加权（IDW）插值，按地名查询先定位坐标。
+
+从 CSV 生成数据文件：python -m utils.irradiance build 输入.csv [输出.npz]
+CSV 需包含列：纬度、经度、年辐射量，可选 1月 ~ 12月、地名。
+"""
+
+import argparse
+import math
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+GRID_PATH = os.environ.get(
+    "SOLAR_IRRADIANCE_GRID", "ui_modules/input_ui/input_param_modules/irradiance_grid.npz"
+)
+CELL_DEGREES = 0.1
+MONTH_COLUMNS = [f"{m}月" for m in range(1, 13)]
+
+_grids = {}
+_grids_lock = threading.Lock()
+
+
+def build_dataset(csv_path: str, npz_path: str = GRID_PATH) -> int:
+    """
+    将 CSV 格式的辐照数据转换为紧凑的 .npz（float32），返回点数
+    """
+    df = pd.read_csv(csv_path)
+    arrays = {
+        "lat": df["纬度"].to_numpy(np.float32),
+        "lon": df["经度"].to_numpy(np.float32),
+        "annual": df["年辐射量"].to_numpy(np.float32),
+    }
+    if all(c in df.columns for c in MONTH_COLUMNS):
+        arrays["monthly"] = df[MONTH_COLUMNS].to_numpy(np.float32)
+    if "地名" in df.columns:
+        arrays["names"] = df["地名"].astype(str).to_numpy(dtype="U")
+    np.savez_compressed(npz_path, **arrays)
+    return len(df)
+
+
+def _build_index(data: dict, cell: float) -> dict:
+    """
+    均匀网格索引：点按所在网格排序，offsets[i] ~ offsets[i+1] 为第 i 个网格内的点
+    """
+    lat = data["lat"].astype(float)
+    lon = data["lon"].astype(float)
+    lat0, lon0 = lat.min(), lon.min()
+    n_rows = int((lat.max() - lat0) / cell) + 1
+    n_cols = int((lon.max() - lon0) / cell) + 1
+
+    cell_id = ((lat - lat0) / cell).astype(int) * n_cols + ((lon - lon0) / cell).astype(int)
+    order = np.argsort(cell_id, kind="stable")
+    offsets = np.searchsorted(cell_id[order], np.arange(n_rows * n_cols + 1))
+
+    index = {
+        "cell": cell, "lat0": lat0, "lon0": lon0, "n_rows": n_rows, "n_cols": n_cols,
+        "offsets": offsets.tolist(),
+        "lat": lat[order].tolist(), "lon": lon[order].tolist(),
+        "annual": data["annual"][order].astype(float).tolist(),
+        "monthly": data["monthly"][order].astype(float) if "monthly" in data else None,
+        "names": {},
+    }
+    if "names" in data:
+        for i, name in enumerate(data["names"][order]):
+            index["names"].setdefault(str(name), i)
+    return index
+
+
+def get_grid(path: str = None, cell: float = CELL_DEGREES):
+    """
+    加载（并缓存）网格索引；数据文件不存在时返回 None
+    """
+    path = path or GRID_PATH
+    if path in _grids:
+        return _grids[path]
+    with _grids_lock:
+        if path not in _grids:
+            if not os.path.exists(path):
+                return None
+            with np.load(path, allow_pickle=False) as f:
+                data = {k: f[k] for k in f.files}
+            _grids[path] = _build_index(data, cell)
+    return _grids[path]
+
+
+def _neighbours(grid: dict, lat: float, lon: float, k: int):
+    """
+    由近到远逐圈扩展网格，直到第 k 近的候选点比下一圈可能出现的任何点都近，返回 [(距离², 下标)]
+    """
+    cell, n_rows, n_cols = grid["cell"], grid["n_rows"], grid["n_cols"]
+    offsets, lats, lons = grid["offsets"], grid["lat"], grid["lon"]
+    row = int((lat - grid["lat0"]) / cell)
+    col = int((lon - grid["lon0"]) / cell)
+    scale = math.cos(math.radians(lat)) ** 2
+    # 第 ring 圈之外的点与查询点的最小距离（按纬度方向与缩放后的经度方向取小者）
+    ring_step = cell * min(1.0, math.sqrt(scale))
+
+    candidates = []
+    for ring in range(max(n_rows, n_cols) + max(abs(row), abs(col)) + 1):
+        for r in range(row - ring, row + ring + 1):
+            if r < 0 or r >= n_rows:
+                continue
+            cols = range(col - ring, col + ring + 1) if r in (row - ring, row + ring) else (col - ring, col + ring)
+            for c in cols:
+                if c < 0 or c >= n_cols:
+                    continue
+                cell_id = r * n_cols + c
+                for i in range(offsets[cell_id], offsets[cell_id + 1]):
+                    candidates.append(((lats[i] - lat) ** 2 + scale * (lons[i] - lon) ** 2, i))
+        if len(candidates) >= k:
+            candidates.sort()
+            del candidates[k:]
+            if candidates[-1][0] <= (ring * ring_step) ** 2:
+                break
+    candidates.sort()
+    return candidates[:k]
+
+
+def lookup(lat: float, lon: float, k: int = 4, power: float = 2.0, path: str = None):
+    """
+    按坐标插值年辐射量（及逐月辐射量），返回 {"年辐射量", "逐月辐射量", "最近点距离（度）"}；
+    无数据文件时返回 None
+    """
+    grid = get_grid(path)
+    if grid is None:
+        return None
+
+    nearest = _neighbours(grid, float(lat), float(lon), k)
+    d2 = [d for d, _ in nearest]
+    idx = [i for _, i in nearest]
+    if d2[0] < 1e-18:
+        weights = [1.0] + [0.0] * (len(idx) - 1)
+    else:
+        weights = [d ** (-power / 2) for d in d2]
+    total = sum(weights)
+
+    annual = sum(w * grid["annual"][i] for w, i in zip(weights, idx)) / total
+    monthly = None
+    if grid["monthly"] is not None:
+        monthly = (np.asarray(weights) @ grid["monthly"][idx] / total).round(2).tolist()
+    return {"年辐射量": round(annual, 2), "逐月辐射量": monthly, "最近点距离（度）": round(math.sqrt(d2[0]), 4)}
+
+
+def lookup_place(name: str, k: int = 4, power: float = 2.0, path: str = None):
+    """
+    按地名查询：定位到数据集中同名点的坐标后插值；地名不存在时返回 None
+    """
+    grid = get_grid(path)
+    if grid is None or name not in grid["names"]:
+        return None
+    i = grid["names"][name]
+    return lookup(grid["lat"][i], grid["lon"][i], k, power, path)
+
+
+def place_names(path: str = None) -> list:
+    grid = get_grid(path)
+    return sorted(grid["names"]) if grid else []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="辐照数据工具")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="由 CSV 生成 .npz 数据文件")
+    build.add_argument("csv_path")
+    build.add_argument("npz_path", nargs="?", default=GRID_PATH)
+    args = parser.parse_args()
+    print(f"已写入 {build_dataset(args.csv_path, args.npz_path)} 个点：{args.npz_path}")
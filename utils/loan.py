@@ -0,0 +1,163 @@
+import numpy as np
+
+# 还款方式编码（批量计算时用整数数组表示）
+REPAYMENT_METHODS = ["等额本息", "等额本金"]
+EQUAL_PAYMENT = 0
+EQUAL_PRINCIPAL = 1
+
+# 计息方式 -> 每年还款期数
+COMPOUNDING_PERIODS = {
+    "按年计息": 1,
+    "按月计息": 12,
+}
+
+
+def encode_methods(methods) -> np.ndarray:
+    """
+    将还款方式名称转换为整数编码，未知方式编码为 -1（不还款）
+    """
+    methods = np.atleast_1d(np.asarray(methods, dtype=object))
+    codes = np.full(methods.shape, -1, dtype=np.int8)
+    for code, name in enumerate(REPAYMENT_METHODS):
+        codes[methods == name] = code
+    return codes
+
+
+def amortize(loan_amount, annual_rate, years, method, compounding: str = "按年计息",
+             grace_years=0, prepay_year=0, prepay_amount=0.0) -> dict:
+    """
+    批量生成完整还款计划（本金 / 利息拆分与剩余本金）。
+
+    - 参数均可为标量或形状 (B,) 的数组，method 为还款方式名称或整数编码
+    - compounding：按年计息每年还款一次；按月计息每月还款一次，月利率 = 年利率 / 12
+    - grace_years：宽限期内只付利息，本金在剩余期数内摊还；宽限期须短于贷款期限，否则抛出 ValueError
+    - prepay_year / prepay_amount：在该年末提前偿还本金（np.inf 表示一次性结清），
+      之后按剩余本金和剩余期数重新计算月供 / 年供（期限不变）
+
+    按期逐列推进、对所有贷款同时做数组运算，返回的每个数组形状均为 (B, 期数)。
+    """
+    if np.asarray(method).dtype.kind in "OU":
+        method = encode_methods(method)
+
+    amount, rate, n_years, code, grace, prepay_at, prepay = np.broadcast_arrays(
+        np.atleast_1d(np.asarray(loan_amount, dtype=float)),
+        np.atleast_1d(np.asarray(annual_rate, dtype=float)),
+        np.atleast_1d(np.asarray(years, dtype=int)),
+        np.atleast_1d(np.asarray(method, dtype=int)),
+        np.atleast_1d(np.asarray(grace_years, dtype=int)),
+        np.atleast_1d(np.asarray(prepay_year, dtype=int)),
+        np.atleast_1d(np.asarray(prepay_amount, dtype=float)),
+    )
+
+    # 宽限期不短于贷款期限时到期仍有本金未还
+    invalid = (amount > 0) & (n_years > 0) & (grace >= n_years)
+    if np.any(invalid):
+        i = int(np.flatnonzero(invalid)[0])
+        raise ValueError(f"宽限期（{grace[i]} 年）须短于贷款期限（{n_years[i]} 年），"
+                         f"共 {int(invalid.sum())} 笔贷款不满足")
+
+    per_year = COMPOUNDING_PERIODS[compounding]
+    period_rate = rate / per_year
+    n_periods = np.maximum(n_years, 0) * per_year
+    grace_periods = np.clip(grace, 0, None) * per_year
+    prepay_period = np.where(prepay_at > 0, prepay_at * per_year - 1, -1)
+    horizon = int(n_periods.max()) if n_periods.size else 0
+
+    shape = (amount.size, horizon)
+    payment = np.zeros(shape)
+    interest = np.zeros(shape)
+    principal = np.zeros(shape)
+    balance = np.zeros(shape)
+
+    remaining = np.where((amount > 0) & (n_periods > 0) & (code >= 0), amount, 0.0)
+
+    for k in range(horizon):
+        left = np.maximum(n_periods - k, 1)
+        active = (k < n_periods) & (remaining > 0)
+
+        period_interest = remaining * period_rate
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            growth = (1 + period_rate) ** left
+            annuity = np.where(period_rate != 0,
+                               remaining * period_rate * growth / (growth - 1),
+                               remaining / left)
+        scheduled = np.where(code == EQUAL_PAYMENT, annuity - period_interest, remaining / left)
+        scheduled = np.where(k < grace_periods, 0.0, scheduled)
+
+        # 提前还款：额外偿还的本金不超过剩余本金
+        extra = np.where(k == prepay_period, np.minimum(prepay, remaining - scheduled), 0.0)
+        paid = np.where(active, np.minimum(scheduled + extra, remaining), 0.0)
+
+        interest[:, k] = np.where(active, period_interest, 0.0)
+        principal[:, k] = paid
+        payment[:, k] = interest[:, k] + paid
+        remaining = remaining - paid
+        balance[:, k] = remaining
+
+    return {
+        "periods_per_year": per_year,
+        "payment": payment,
+        "interest": interest,
+        "principal": principal,
+        "balance": balance,
+    }
+
+
+def annual_schedule(schedule: dict) -> dict:
+    """
+    将按期还款计划汇总为按年口径（按年计息时原样返回）
+    """
+    per_year = schedule["periods_per_year"]
+    if per_year == 1:
+        return schedule
+
+    n_rows, horizon = schedule["payment"].shape
+    n_years = -(-horizon // per_year)
+    pad = n_years * per_year - horizon
+
+    def fold(values, how):
+        values = np.pad(values, ((0, 0), (0, pad)), mode="edge" if how == "last" else "constant")
+        values = values.reshape(n_rows, n_years, per_year)
+        return values[:, :, -1] if how == "last" else values.sum(axis=2)
+
+    return {
+        "periods_per_year": 1,
+        "payment": fold(schedule["payment"], "sum"),
+        "interest": fold(schedule["interest"], "sum"),
+        "principal": fold(schedule["principal"], "sum"),
+        "balance": fold(schedule["balance"], "last"),
+    }
+
+
+def amortize_grid(loan_amounts, annual_rates, years, methods, **kwargs) -> dict:
+    """
+    对 额度 × 利率 × 期限 × 还款方式 的全组合一次性生成还款计划，
+    返回 {"grid": 各组合参数, "schedule": 还款计划}
+    """
+    amount_grid, rate_grid, years_grid, method_grid = [g.ravel() for g in np.meshgrid(
+        np.asarray(loan_amounts, dtype=float),
+        np.asarray(annual_rates, dtype=float),
+        np.asarray(years, dtype=int),
+        encode_methods(methods),
+        indexing="ij",
+    )]
+    grid = {
+        "loan_amount": amount_grid,
+        "annual_rate": rate_grid,
+        "years": years_grid,
+        "method": method_grid,
+    }
+    return {"grid": grid, "schedule": amortize(amount_grid, rate_grid, years_grid, method_grid, **kwargs)}
+
+
+def loan_payment_matrix(loan_amount, annual_rate, years, method, horizon: int = None, **kwargs) -> np.ndarray:
+    """
+    批量计算每年还款金额。
+    参数均可为标量或形状 (B,) 的数组，method 为还款方式名称或整数编码。
+    返回形状 (B, horizon) 的数组，第 t 列为第 t+1 年的还款额，超出偿还期的年份为 0。
+    """
+    payments = annual_schedule(amortize(loan_amount, annual_rate, years, method, **kwargs))["payment"]
+    if horizon is not None:
+        payments = np.pad(payments, ((0, 0), (0, max(horizon - payments.shape[1], 0))))[:, :horizon]
+    return payments
@@ -0,0 +1,90 @@
+"""
+批量指标内核：输入形状 (B, T) 的现金流矩阵（每行一个方案，每列一期），
+一次性给出全部方案的静态 / 动态投资回收期、盈亏平衡期、总净收益、投资回报率与平准化度电成本。
+
+约定与“净现金流分析”模块一致：第 1 列不折现，回收期在累计现金流首次由负转非负的两期之间线性插值。
+"""
+
+import numpy as np
+
+
+def discount_factors(rate, n_periods: int, start: int = 0) -> np.ndarray:
+    """
+    返回折现因子 (1+r)^-(t)，t 从 start 开始；rate 为数组时返回形状 (B, n_periods)
+    """
+    t = np.arange(start, start + n_periods)
+    rate = np.asarray(rate, dtype=float)
+    if rate.ndim == 0:
+        return (1 + rate) ** -t
+    return (1 + rate[:, None]) ** -t[None, :]
+
+
+def _first_crossing(cumulative: np.ndarray):
+    """
+    累计现金流首次由负转非负的位置：返回 (是否存在, 转正前一期的列号)
+    """
+    crossing = (cumulative[:, :-1] < 0) & (cumulative[:, 1:] >= 0)
+    return crossing.any(axis=1), np.argmax(crossing, axis=1)
+
+
+def _interpolate(cumulative: np.ndarray, periods: np.ndarray, found, i) -> np.ndarray:
+    rows = np.arange(len(cumulative))
+    y0, y1 = cumulative[rows, i], cumulative[rows, i + 1]
+    x0, x1 = periods[i], periods[i + 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        payback = x0 + (-y0) * (x1 - x0) / (y1 - y0)
+    return np.where(found, payback, np.nan)
+
+
+def batch_payback(cashflows: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    """
+    批量投资回收期：累计现金流首次由负转非负的区间内线性插值；未回收的行返回 NaN
+    """
+    cumulative = np.cumsum(np.atleast_2d(cashflows), axis=1)
+    found, i = _first_crossing(cumulative)
+    return _interpolate(cumulative, np.asarray(periods), found, i)
+
+
+def breakeven_period(cashflows: np.ndarray, periods: np.ndarray) -> np.ndarray:
+    """
+    批量盈亏平衡期：累计现金流首次转为非负的那一期（不插值）；未达成的行返回 NaN
+    """
+    cumulative = np.cumsum(np.atleast_2d(cashflows), axis=1)
+    found, i = _first_crossing(cumulative)
+    return np.where(found, np.asarray(periods, dtype=float)[i + 1], np.nan)
+
+
+def batch_lcoe(costs: np.ndarray, generation: np.ndarray, rate) -> np.ndarray:
+    """
+    平准化度电成本（元/kWh）= 成本现值之和 / 发电量现值之和；costs 与 generation 形状均为 (B, T)
+    """
+    costs = np.atleast_2d(costs)
+    factors = discount_factors(np.atleast_1d(rate), costs.shape[1])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.sum(costs * factors, axis=1) / np.sum(np.atleast_2d(generation) * factors, axis=1)
+
+
+def cashflow_metrics(cashflows: np.ndarray, periods: np.ndarray, rate=None, investment=None) -> dict:
+    """
+    由现金流矩阵一次计算：
+    payback（静态回收期）、breakeven（盈亏平衡期）、total_profit（总净收益）；
+    给定 rate（每行的折现率）时另算 dynamic_payback，给定 investment 时另算 roi（总净收益 / 投资）
+    """
+    cashflows = np.atleast_2d(np.asarray(cashflows, dtype=float))
+    periods = np.asarray(periods)
+    cumulative = np.cumsum(cashflows, axis=1)
+    found, i = _first_crossing(cumulative)
+
+    result = {
+        "payback": _interpolate(cumulative, periods, found, i),
+        "breakeven": np.where(found, periods.astype(float)[i + 1], np.nan),
+        "total_profit": cumulative[:, -1],
+    }
+    if rate is not None:
+        present = cashflows * discount_factors(np.atleast_1d(rate), cashflows.shape[1])
+        result["present"] = present
+        result["dynamic_payback"] = batch_payback(present, periods)
+    if investment is not None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result["roi"] = cumulative[:, -1] / np.asarray(investment, dtype=float)
+    return result
@@ -0,0 +1,133 @@
+"""
+月度现金流模式：在年度口径（utils.economics.evaluate_projects）的基础上按月展开，
+所有量均为形状 (B, 寿命年数 × 12) 的数组，按月汇总后与年度表完全一致。
+
+- 发电量与收入（含与收入成正比的税费）按逐月辐射量占比分摊到各月；
+- 运维费用、折旧按月平均分摊，初始投入计入第 1 个月；
+- 贷款按月计息、按月还款（utils.loan.amortize）；
+- 按月折现（月利率 = (1 + 年利率)^(1/12) - 1），回收期精确到月内插值。
+"""
+
+import numpy as np
+
+from utils.economics import batch_irr, broadcast_params, evaluate_projects
+from utils.loan import amortize
+from utils.metrics import batch_payback
+
+MONTHS = 12
+DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=float)
+
+# 无逐月辐射数据时按天数分摊
+DEFAULT_MONTHLY_SHARES = DAYS_IN_MONTH / DAYS_IN_MONTH.sum()
+
+# 随辐射量（发电量）变化的分项，其余分项按月平均分摊
+_GENERATION_LINKED = {"售电收益（元）", "自用收益（元）", "税费（元）"}
+
+
+def monthly_shares(inputs: dict) -> np.ndarray:
+    """
+    从输入中的“逐月辐射量”（12 个值）得到各月占比，缺失或无效时按天数分摊
+    """
+    values = inputs.get("2光伏发电参数", {}).get("逐月辐射量")
+    if values is not None:
+        values = np.asarray(values, dtype=float)
+        if values.shape == (MONTHS,) and np.all(values >= 0) and values.sum() > 0:
+            return values / values.sum()
+    return DEFAULT_MONTHLY_SHARES
+
+
+def spread(annual: np.ndarray, shares=None) -> np.ndarray:
+    """
+    将 (B, 年数) 的年度量按占比展开为 (B, 年数 × 12) 的月度量；shares 为空时按月平均
+    """
+    shares = np.full(MONTHS, 1.0 / MONTHS) if shares is None else np.asarray(shares, dtype=float)
+    n_rows, n_years = annual.shape
+    return (annual[:, :, None] * shares[None, None, :]).reshape(n_rows, n_years * MONTHS)
+
+
+def to_annual(monthly: np.ndarray) -> np.ndarray:
+    """
+    月度量按年汇总为 (B, 年数)
+    """
+    n_rows, n_months = monthly.shape
+    return monthly.reshape(n_rows, n_months // MONTHS, MONTHS).sum(axis=2)
+
+
+def monthly_discount_factors(annual_rate, n_months: int) -> np.ndarray:
+    """
+    按月折现因子 (1 + r)^(-(k-1)/12)，第 1 个月不折现（与年度口径第 1 年不折现一致）
+    """
+    t = np.arange(n_months) / MONTHS
+    rate = np.atleast_1d(np.asarray(annual_rate, dtype=float))
+    return (1 + rate[:, None]) ** -t[None, :]
+
+
+def evaluate_monthly(params: dict, shares=None, loan: dict = None, series: dict = None) -> dict:
+    """
+    批量计算月度现金流与指标。params、series 同 evaluate_projects；
+    loan 可选 {"amount", "annual_rate", "years", "method"}（标量或 (B,) 数组），按月还款计入融资后现金流
+    """
+    shares = DEFAULT_MONTHLY_SHARES if shares is None else np.asarray(shares, dtype=float)
+    p = broadcast_params(params)
+    project = evaluate_projects(p, series)
+    n_rows, n_years = project["net"].shape
+    n_months = n_years * MONTHS
+
+    months = np.arange(1, n_months + 1)
+    mask = np.repeat(project["mask"], MONTHS, axis=1)
+    generation = spread(project["generation"], shares)
+    income_items = {k: spread(v, shares) for k, v in project["income_items"].items()}
+    expense_items = {
+        k: spread(v, shares if k in _GENERATION_LINKED else None) for k, v in project["expense_items"].items()
+    }
+    income = sum(income_items.values())
+    expense = sum(expense_items.values())
+
+    net = income - expense
+    net[:, 0] -= project["initial_investment"]
+
+    real_rate = (1 + p["discount_rate"]) / (1 + p["inflation_rate"]) - 1
+    present = net * monthly_discount_factors(real_rate, n_months)
+    static_npv = np.sum(net * monthly_discount_factors(p["discount_rate"], n_months), axis=1)
+    # 月度期数多，收益率下界取 -50%/月，避免 (1 + r)^-t 溢出
+    monthly_irr = batch_irr(net, low=-0.5)
+
+    # 回收期以年为单位：第 k 个月末对应 k / 12 年
+    period_end = months / MONTHS
+    result = {
+        "months": months,
+        "mask": mask,
+        "shares": shares,
+        "project": project,
+        "generation": generation,
+        "income_items": income_items,
+        "expense_items": expense_items,
+        "income": income,
+        "expense": expense,
+        "net": net,
+        "present": present,
+        "real_rate": real_rate,
+        "static_npv": static_npv,
+        "dynamic_npv": present.sum(axis=1),
+        "irr": (1 + monthly_irr) ** MONTHS - 1,
+        "payback": batch_payback(net, period_end),
+        "dynamic_payback": batch_payback(present, period_end),
+    }
+
+    if loan is not None:
+        schedule = amortize(loan["amount"], loan["annual_rate"], loan["years"], loan["method"],
+                            compounding="按月计息")
+        payment = np.zeros((n_rows, max(n_months, schedule["payment"].shape[1])))
+        payment[:, :schedule["payment"].shape[1]] = schedule["payment"]
+        financed = np.zeros_like(payment)
+        financed[:, :n_months] = net
+        financed[:, 0] += np.broadcast_to(np.asarray(loan["amount"], dtype=float), n_rows)
+        financed -= payment
+        result.update({
+            "loan_payment": payment,
+            "loan_interest": schedule["interest"],
+            "financed_net": financed,
+            "financed_payback": batch_payback(financed, np.arange(1, financed.shape[1] + 1) / MONTHS),
+        })
+
+    return result
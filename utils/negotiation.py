@@ -0,0 +1,165 @@
+"""
+农户 / 企业分成谈判扫描：在 出资比例 × 收入分成比例 × 支出分担比例 × 屋顶租金单价 的组合空间中
+按块批量计算双方的 NPV、IRR 与静态回收期，给出双方指标的帕累托前沿及满足双方最低回报约束的方案。
+
+- 双方分成：农户取比例 x，企业取 1 - x（各分项同比例，村集体不参与）；屋顶租金由企业支付给农户；
+- 双方贷款条件固定，还款计划只算一次，与各分成组合的现金流相加；
+- 现金流口径与利益相关方页面一致（utils.economics.stakeholder_cashflows，第 0 列为第 0 年）。
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.economics import (
+    batch_irr, batch_npv, evaluate_projects, extract_project_params, stakeholder_cashflows,
+)
+from utils.loan import loan_payment_matrix
+from utils.metrics import batch_payback
+from utils.optimizer import pareto_front
+from utils.param_paths import series_from_inputs
+
+PARTIES = ["农户", "企业"]
+
+# 扫描维度：内部名 -> 展示列名
+SHARE_AXES = {
+    "investment_ratio": "农户出资比例（%）",
+    "income_ratio": "农户收入分成比例（%）",
+    "expense_ratio": "农户支出分担比例（%）",
+    "rent_price": "屋顶租金单价（元/㎡·年）",
+}
+
+# 谈判指标：内部名 -> (展示名, 越大越好)
+METRICS = {
+    "irr": ("内部收益率（%）", True),
+    "npv": ("净现值（元）", True),
+    "payback": ("静态回收期（年）", False),
+}
+
+DEFAULT_BATCH_SIZE = 50_000
+
+
+def split_grid(axes: dict, start: int, stop: int) -> dict:
+    """
+    还原编号 [start, stop) 的分成组合（各维度笛卡尔积，不在内存中展开）
+    """
+    shape = tuple(len(v) for v in axes.values())
+    index = np.unravel_index(np.arange(start, stop), shape)
+    return {name: np.asarray(values, dtype=float)[idx] for (name, values), idx in zip(axes.items(), index)}
+
+
+def _party_metrics(flows: np.ndarray, rate: float) -> dict:
+    periods = np.arange(flows.shape[1])
+    payback = batch_payback(flows, periods)
+    # 累计现金流始终非负（无需回收）的方案回收期记为 0
+    payback = np.where(np.isnan(payback) & (np.cumsum(flows, axis=1).min(axis=1) >= 0), 0.0, payback)
+    upfront = -flows[:, 0]
+    return {
+        "npv": batch_npv(flows, rate),
+        # 第 0 年没有净投入（贷款覆盖出资）时现金流不是“先投入后回收”，IRR 没有意义
+        "irr": np.where(upfront > 0, batch_irr(flows), np.nan),
+        "payback": payback,
+        "upfront": upfront,
+    }
+
+
+def sweep_splits(inputs: dict, axes: dict, loans: dict, rent_area: float, rent_years: int,
+                 batch_size: int = DEFAULT_BATCH_SIZE, progress=None) -> dict:
+    """
+    批量评估全部分成组合。
+
+    - axes: {SHARE_AXES 中的内部名: 取值列表}，比例为 0~1，未给出的比例维度取 1（农户全部承担 / 获得）
+    - loans: {"农户" / "企业": {"amount", "rate", "years", "method"}}
+    返回 {"axes", "n_splits", "农户": {指标: (N,) 数组}, "企业": {...}}
+    """
+    params = extract_project_params(inputs)
+    project = evaluate_projects(params, series_from_inputs(inputs))
+    rate = params["discount_rate"]
+
+    axes = {name: np.asarray(axes.get(name, [1.0 if name != "rent_price" else 0.0]), dtype=float)
+            for name in SHARE_AXES}
+    n_total = int(np.prod([len(v) for v in axes.values()], dtype=np.int64))
+
+    payments = {}
+    for party in PARTIES:
+        loan = loans.get(party, {})
+        amount = float(loan.get("amount", 0.0))
+        payments[party] = (amount, loan_payment_matrix(amount, loan.get("rate", 0.0), int(loan.get("years", 0)),
+                                                       loan.get("method", "等额本息")) if amount > 0 else None)
+
+    results = {party: {name: np.empty(n_total) for name in ("npv", "irr", "payback", "upfront")}
+               for party in PARTIES}
+
+    for start in range(0, n_total, batch_size):
+        stop = min(start + batch_size, n_total)
+        split = split_grid(axes, start, stop)
+        rent = split["rent_price"] * rent_area
+        shares = {
+            "农户": (split["investment_ratio"], split["income_ratio"], split["expense_ratio"], 1.0),
+            "企业": (1 - split["investment_ratio"], 1 - split["income_ratio"], 1 - split["expense_ratio"], -1.0),
+        }
+        for party, (investment, income, expense, rent_sign) in shares.items():
+            loan_amount, loan_payments = payments[party]
+            flows = stakeholder_cashflows(project, investment, income, expense,
+                                          rent=rent, rent_years=rent_years, rent_sign=rent_sign,
+                                          loan_amount=loan_amount, loan_payments=loan_payments)
+            for name, values in _party_metrics(flows, rate).items():
+                results[party][name][start:stop] = values
+        if progress is not None:
+            progress(stop, n_total)
+
+    return {"axes": axes, "n_splits": n_total, **results}
+
+
+def _score(result: dict, party: str, metric: str) -> np.ndarray:
+    """
+    统一为“越大越好”的得分
+    """
+    values = result[party][metric]
+    return values if METRICS[metric][1] else -values
+
+
+def feasible_mask(result: dict, min_irr: dict = None, min_npv: dict = None, max_payback: dict = None) -> np.ndarray:
+    """
+    满足双方最低回报约束的组合：{参与方: 阈值}，未给出的约束不限制（IRR 不存在的方案不满足 IRR 约束）
+    """
+    mask = np.ones(result["n_splits"], dtype=bool)
+    for party in PARTIES:
+        if min_irr and min_irr.get(party) is not None:
+            mask &= result[party]["irr"] >= min_irr[party]
+        if min_npv and min_npv.get(party) is not None:
+            mask &= result[party]["npv"] >= min_npv[party]
+        if max_payback and max_payback.get(party) is not None:
+            mask &= result[party]["payback"] <= max_payback[party]
+    return mask
+
+
+def negotiation_frontier(result: dict, farmer_metric: str, enterprise_metric: str, mask: np.ndarray = None) -> np.ndarray:
+    """
+    双方所选指标意义下的帕累托前沿（组合编号），按农户指标从优到劣排列；指标不存在（NaN）的组合不参与
+    """
+    farmer = _score(result, "农户", farmer_metric)
+    enterprise = _score(result, "企业", enterprise_metric)
+    candidates = np.isfinite(farmer) & np.isfinite(enterprise)
+    if mask is not None:
+        candidates &= mask
+    rows = np.flatnonzero(candidates)
+    front = rows[pareto_front(enterprise[rows], -farmer[rows])]
+    return front[np.argsort(-farmer[front], kind="stable")]
+
+
+def splits_table(result: dict, rows: np.ndarray) -> pd.DataFrame:
+    """
+    生成指定组合的分成设置与双方指标明细表
+    """
+    rows = np.asarray(rows, dtype=int)
+    axes = result["axes"]
+    index = np.unravel_index(rows, tuple(len(v) for v in axes.values()))
+    df = pd.DataFrame({"组合编号": rows})
+    for (name, values), idx in zip(axes.items(), index):
+        df[SHARE_AXES[name]] = values[idx] * (1 if name == "rent_price" else 100)
+    for party in PARTIES:
+        df[f"{party}初期自付（元）"] = result[party]["upfront"][rows]
+        for metric, (label, _) in METRICS.items():
+            values = result[party][metric][rows]
+            df[f"{party}{label}"] = values * 100 if metric == "irr" else values
+    return df
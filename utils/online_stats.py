@@ -0,0 +1,261 @@
+"""
+敏感性日志的在线统计量：每对（输入参数, 输出指标）维护加权 Welford 充分统计量
+[权重和, 均值x, 均值y, M2x, M2y, Cxy]，新日志追加后只增量读取文件尾部更新，
+相关系数查询为 O(k)，与日志长度无关。
+
+- total：全部历史；
+- decayed：按条数指数衰减（不同半衰期）；
+- daily：按日期分桶，时间窗口查询时合并窗口内的桶。
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from utils.param_store import atomic_write_bytes, file_lock
+from utils.sensitivity_log import STATS_PATH, normalize_entry
+from utils.storage import yaml_load
+
+# 指数衰减的半衰期（条）
+DECAY_HALF_LIVES = (50, 200)
+
+_FINGERPRINT_BYTES = 256
+_SEP = "||"
+
+
+def flatten_entry(entry: dict):
+    """
+    展开一条日志，返回 ({[输入]模块/参数: 值}, {[输出]指标: 值})，只保留数值字段；
+    旧格式条目先统一结构，无效条目返回两个空字典
+    """
+    entry = normalize_entry(entry)
+    if entry is None:
+        return {}, {}
+
+    def numeric(v):
+        return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+    inputs = {}
+    for section, params in entry["input_parameters"].items():
+        for k, v in params.items():
+            if numeric(v):
+                inputs[f"[输入]{section}/{k}"] = float(v)
+    outputs = {
+        f"[输出]{k}": float(v) for k, v in entry["output_results"].items() if numeric(v)
+    }
+    return inputs, outputs
+
+
+def empty_stats() -> dict:
+    return {
+        "log_bytes": 0,
+        "log_head": "",
+        "log_tail": "",
+        "entries": 0,
+        "total": {},
+        "decayed": {str(h): {} for h in DECAY_HALF_LIVES},
+        "daily": {},
+    }
+
+
+# ===== 充分统计量的更新与合并 =====
+
+def _update(s: list, x: float, y: float, w: float = 1.0):
+    """
+    加权 Welford 增量更新
+    """
+    s[0] += w
+    dx = x - s[1]
+    dy = y - s[2]
+    s[1] += w * dx / s[0]
+    s[2] += w * dy / s[0]
+    s[3] += w * dx * (x - s[1])
+    s[4] += w * dy * (y - s[2])
+    s[5] += w * dx * (y - s[2])
+
+
+def _merge(a: list, b: list) -> list:
+    """
+    合并两组充分统计量（Chan 并行算法）
+    """
+    if a[0] == 0:
+        return list(b)
+    if b[0] == 0:
+        return list(a)
+    w = a[0] + b[0]
+    dx = b[1] - a[1]
+    dy = b[2] - a[2]
+    factor = a[0] * b[0] / w
+    return [
+        w,
+        a[1] + dx * b[0] / w,
+        a[2] + dy * b[0] / w,
+        a[3] + b[3] + dx * dx * factor,
+        a[4] + b[4] + dy * dy * factor,
+        a[5] + b[5] + dx * dy * factor,
+    ]
+
+
+def _update_pairs(pairs: dict, inputs: dict, outputs: dict):
+    for out_key, y in outputs.items():
+        for in_key, x in inputs.items():
+            _update(pairs.setdefault(f"{in_key}{_SEP}{out_key}", [0.0] * 6), x, y)
+
+
+def update_stats(stats: dict, entry: dict):
+    """
+    用一条新日志更新全部统计量
+    """
+    inputs, outputs = flatten_entry(entry)
+    stats["entries"] += 1
+    if not inputs or not outputs:
+        return
+
+    _update_pairs(stats["total"], inputs, outputs)
+
+    for half_life, pairs in stats["decayed"].items():
+        decay = 0.5 ** (1 / float(half_life))
+        for s in pairs.values():
+            s[0] *= decay
+            s[3] *= decay
+            s[4] *= decay
+            s[5] *= decay
+        _update_pairs(pairs, inputs, outputs)
+
+    day = str(entry.get("timestamp", ""))[:10]
+    if day:
+        _update_pairs(stats["daily"].setdefault(day, {}), inputs, outputs)
+
+
+# ===== 与日志文件同步 =====
+
+def _fingerprint(raw: bytes) -> str:
+    return hashlib.sha1(raw).hexdigest()
+
+
+def _read_range(f, start: int, stop: int) -> bytes:
+    f.seek(start)
+    return f.read(max(0, stop - start))
+
+
+def load_stats(stats_path: str = STATS_PATH) -> dict:
+    if not os.path.exists(stats_path):
+        return empty_stats()
+    try:
+        with open(stats_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return empty_stats()
+
+
+def _anchor(stats: dict, f, size: int):
+    """
+    记录已同步到的位置及该位置之前首尾各 _FINGERPRINT_BYTES 字节的指纹
+    """
+    stats["log_bytes"] = size
+    stats["log_head"] = _fingerprint(_read_range(f, 0, min(size, _FINGERPRINT_BYTES)))
+    stats["log_tail"] = _fingerprint(_read_range(f, max(0, size - _FINGERPRINT_BYTES), size))
+
+
+def _save_stats(stats: dict, stats_path: str):
+    atomic_write_bytes(stats_path, json.dumps(stats, ensure_ascii=False).encode("utf-8"))
+
+
+def sync_stats_locked(log_path: str, stats_path: str = STATS_PATH) -> dict:
+    """
+    sync_stats 的主体，调用方须已持有日志文件锁（供 compact_log 在压缩前同步）
+    """
+    stats = load_stats(stats_path)
+    if not os.path.exists(log_path):
+        return stats
+
+    with open(log_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        offset = stats["log_bytes"]
+        # 只读取首尾各 _FINGERPRINT_BYTES 字节校验已同步部分，未改写时从上次位置读取新增尾部
+        unchanged = (
+            offset <= size
+            and _fingerprint(_read_range(f, 0, min(offset, _FINGERPRINT_BYTES))) == stats["log_head"]
+            and _fingerprint(_read_range(f, max(0, offset - _FINGERPRINT_BYTES), offset)) == stats["log_tail"]
+        )
+        if not unchanged:
+            stats, offset = empty_stats(), 0
+        if offset == size:
+            return stats
+
+        tail = _read_range(f, offset, size)
+        _anchor(stats, f, size)
+
+    new_entries = yaml_load(tail.decode("utf-8")) or []
+    for entry in new_entries:
+        if isinstance(entry, dict):
+            update_stats(stats, entry)
+
+    _save_stats(stats, stats_path)
+    return stats
+
+
+def sync_stats(log_path: str, stats_path: str = STATS_PATH) -> dict:
+    """
+    将统计量同步到日志文件的最新状态：只解析上次同步位置之后追加的条目；
+    若日志被改写（文件变短或已同步部分的首尾指纹不一致）则整体重建
+    """
+    if not os.path.exists(log_path):
+        return load_stats(stats_path)
+    with file_lock(log_path):
+        return sync_stats_locked(log_path, stats_path)
+
+
+def rebase_stats(stats: dict, log_path: str, stats_path: str = STATS_PATH):
+    """
+    日志被压缩改写后，把已同步的统计量（含已并入月度汇总的条目）重新对应到改写后的文件，
+    之后的同步只读取新追加的条目而不会从保留的明细重建；调用方须已持有日志文件锁
+    """
+    with open(log_path, "rb") as f:
+        _anchor(stats, f, os.fstat(f.fileno()).st_size)
+    _save_stats(stats, stats_path)
+
+
+# ===== 查询 =====
+
+def _select_pairs(stats: dict, days: int = None, half_life: int = None, now: datetime = None) -> dict:
+    if half_life is not None:
+        return stats["decayed"].get(str(half_life), {})
+    if days is None:
+        return stats["total"]
+
+    start = ((now or datetime.now()) - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    merged = {}
+    for day, pairs in stats["daily"].items():
+        if day >= start:
+            for key, s in pairs.items():
+                merged[key] = _merge(merged.get(key, [0.0] * 6), s)
+    return merged
+
+
+def available_outputs(stats: dict) -> list:
+    return sorted({key.split(_SEP)[1] for key in stats["total"]})
+
+
+def correlations(stats: dict, output: str, days: int = None, half_life: int = None) -> pd.Series:
+    """
+    各输入参数与指定输出指标的 Pearson 相关系数；
+    days 为最近天数窗口，half_life 为指数衰减半衰期（条），均不指定时使用全部历史
+    """
+    pairs = _select_pairs(stats, days, half_life)
+    result = {}
+    for key, s in pairs.items():
+        in_key, out_key = key.split(_SEP)
+        if out_key != output or s[0] <= 0:
+            continue
+        denominator = (s[3] * s[4]) ** 0.5
+        result[in_key] = s[5] / denominator if denominator > 1e-12 else float("nan")
+    return pd.Series(result, dtype=float)
+
+
+def sample_size(stats: dict, output: str, days: int = None, half_life: int = None) -> float:
+    pairs = _select_pairs(stats, days, half_life)
+    return max((s[0] for key, s in pairs.items() if key.split(_SEP)[1] == output), default=0.0)
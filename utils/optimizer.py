@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+
+from utils.economics import (
+    extract_project_params, evaluate_projects, stakeholder_cashflows, batch_irr,
+)
+from utils.loan import REPAYMENT_METHODS, amortize_grid, annual_schedule
+from utils.metrics import discount_factors
+from utils.param_paths import series_from_inputs
+
+OBJECTIVES = {
+    "npv": "农户净现值（NPV）",
+    "irr": "农户内部收益率（IRR）",
+}
+
+
+def pareto_front(objective: np.ndarray, outlay: np.ndarray) -> np.ndarray:
+    """
+    返回 (目标值越大越好, 初期自付越小越好) 意义下非支配解的下标
+    """
+    order = np.lexsort((-objective, outlay))
+    ranked = np.asarray(objective, dtype=float)[order]
+    # 按自付金额升序扫描，目标值严格超过此前最优者即为非支配解（NaN 不参与）
+    best = np.fmax.accumulate(np.concatenate([[-np.inf], ranked[:-1]]))
+    return order[ranked > best].astype(int)
+
+
+def optimize_design(inputs: dict, areas, tiers, loan_amounts, loan_years, methods, loan_rate: float,
+                    investment_ratio=1.0, income_ratio=1.0, expense_ratio=1.0,
+                    rent: float = 0.0, rent_years: int = 0, objective: str = "npv",
+                    max_upfront: float = None, min_yearly_net: float = None,
+                    batch_size: int = 200_000, top_k: int = 20) -> dict:
+    """
+    在 面积 × 效率档位 × 贷款额度 × 偿还期 × 还款方式 空间中搜索农户最优方案。
+
+    - tiers: [(转换效率, 光伏组件单价), ...]，效率档位决定组件价格
+    - 目标：农户 NPV 或 IRR；约束：初期自付金额上限、最低年净现金流
+    - 设计方案（面积×档位）与贷款方案分别批量计算后按块组合评估；
+      利用 “贷款只会降低后续各年现金流” 与 “NPV 可分离” 两个性质剪除被支配的设计区域：
+      NPV 目标下，设计方案的 NPV 上界不超过已得第 top_k 名，且 (最低自付, NPV 上界) 被已得非支配解支配时才剪除，
+      保证返回的前 top_k 名与非支配解不受剪枝影响
+    """
+    base = extract_project_params(inputs)
+    rate = base["discount_rate"]
+
+    # ===== 设计方案批量计算 =====
+    areas = np.asarray(areas, dtype=float)
+    tier_eff = np.asarray([t[0] for t in tiers], dtype=float)
+    tier_price = np.asarray([t[1] for t in tiers], dtype=float)
+    area_grid, tier_grid = np.meshgrid(areas, np.arange(len(tiers)), indexing="ij")
+    area_grid, tier_grid = area_grid.ravel(), tier_grid.ravel()
+
+    params = dict(base)
+    params.update(area=area_grid, efficiency=tier_eff[tier_grid], panel_price=tier_price[tier_grid])
+    project = evaluate_projects(params, series_from_inputs(inputs))
+
+    base_flows = stakeholder_cashflows(project, investment_ratio, income_ratio, expense_ratio,
+                                       rent=rent, rent_years=rent_years)
+    investment = -base_flows[:, 0]
+
+    # ===== 贷款方案批量计算 =====
+    loans = amortize_grid(loan_amounts, [loan_rate], loan_years, methods)
+    amount_grid = loans["grid"]["loan_amount"]
+    years_grid = loans["grid"]["years"]
+    method_grid = loans["grid"]["method"]
+    payments = annual_schedule(loans["schedule"])["payment"]
+
+    horizon = max(base_flows.shape[1] - 1, payments.shape[1])
+    base_flows = np.pad(base_flows, ((0, 0), (0, horizon + 1 - base_flows.shape[1])))
+    loan_flows = np.zeros((len(amount_grid), horizon + 1))
+    loan_flows[:, 0] = amount_grid
+    loan_flows[:, 1:payments.shape[1] + 1] = -payments
+
+    factors = discount_factors(rate, horizon + 1)
+    design_npv = base_flows @ factors
+    loan_npv = loan_flows @ factors
+
+    # ===== 区域剪枝 =====
+    n_design, n_loan = len(base_flows), len(loan_flows)
+    feasible_design = np.ones(n_design, dtype=bool)
+    if max_upfront is not None:
+        feasible_design &= investment - amount_grid.max() <= max_upfront
+    if min_yearly_net is not None:
+        # 贷款偿还只会降低第 1 年以后的现金流，不贷款时的最低年现金流即为上界
+        feasible_design &= base_flows[:, 1:].min(axis=1) >= min_yearly_net
+
+    upper_bound = design_npv + loan_npv.max()
+    lowest_upfront = investment - amount_grid.max()
+    order = np.argsort(-upper_bound) if objective == "npv" else np.arange(n_design)
+    order = order[feasible_design[order]]
+
+    chunk = max(1, batch_size // n_loan)
+    top_values = np.empty(0)
+    front_upfront, front_value = np.empty(0), np.empty(0)
+    results = []
+    evaluated = 0
+
+    for start in range(0, len(order), chunk):
+        rows = order[start:start + chunk]
+        if objective == "npv":
+            kth_value = top_values[-1] if len(top_values) >= top_k else -np.inf
+            # 已得非支配解按自付升序时目标值递增：自付不超过该设计最低自付的解中，目标值最大者在最后
+            reachable = np.concatenate([[-np.inf], front_value])
+            pos = np.searchsorted(front_upfront, lowest_upfront[rows], side="right")
+            dominated = reachable[pos] >= upper_bound[rows]
+            rows = rows[(upper_bound[rows] > kth_value) | ~dominated]
+            if rows.size == 0:
+                continue
+
+        flows = (base_flows[rows][:, None, :] + loan_flows[None, :, :]).reshape(-1, horizon + 1)
+        design_idx = np.repeat(rows, n_loan)
+        loan_idx = np.tile(np.arange(n_loan), rows.size)
+        evaluated += len(flows)
+
+        upfront = investment[design_idx] - amount_grid[loan_idx]
+        min_net = flows[:, 1:].min(axis=1)
+        npv = design_npv[design_idx] + loan_npv[loan_idx]
+        value = npv if objective == "npv" else batch_irr(flows)
+
+        ok = np.isfinite(value)
+        if max_upfront is not None:
+            ok &= upfront <= max_upfront
+        if min_yearly_net is not None:
+            ok &= min_net >= min_yearly_net
+        if not ok.any():
+            continue
+
+        sel = np.flatnonzero(ok)
+        # 块内仅保留前 top_k 与非支配解，控制内存
+        top = sel[np.argsort(-value[sel])[:top_k]]
+        front = sel[pareto_front(value[sel], upfront[sel])]
+        keep = np.union1d(top, front)
+        top_values = np.sort(np.concatenate([top_values, value[top]]))[::-1][:top_k]
+        all_upfront = np.concatenate([front_upfront, upfront[front]])
+        all_value = np.concatenate([front_value, value[front]])
+        best_front = pareto_front(all_value, all_upfront)
+        best_front = best_front[np.argsort(all_upfront[best_front], kind="stable")]
+        front_upfront, front_value = all_upfront[best_front], all_value[best_front]
+
+        results.append(pd.DataFrame({
+            "太阳能板面积（㎡）": area_grid[design_idx[keep]],
+            "太阳能板转换效率（η）": tier_eff[tier_grid[design_idx[keep]]],
+            "光伏组件价格": tier_price[tier_grid[design_idx[keep]]],
+            "贷款额度（元）": amount_grid[loan_idx[keep]],
+            "贷款偿还期（年）": years_grid[loan_idx[keep]],
+            "还款方式": [REPAYMENT_METHODS[m] for m in method_grid[loan_idx[keep]]],
+            "初期自付金额（元）": upfront[keep],
+            "最低年净现金流（元）": min_net[keep],
+            OBJECTIVES["npv"]: npv[keep],
+            OBJECTIVES["irr"]: value[keep] if objective == "irr" else batch_irr(flows[keep]),
+        }))
+
+    total = n_design * n_loan
+    stats = {"候选方案总数": total, "实际评估数": evaluated, "剪枝数": total - evaluated}
+
+    if not results:
+        return {"best": pd.DataFrame(), "pareto": pd.DataFrame(), "stats": stats}
+
+    df = pd.concat(results, ignore_index=True)
+    target = OBJECTIVES[objective]
+    best = df.sort_values(target, ascending=False).head(top_k).reset_index(drop=True)
+    front = df.iloc[pareto_front(df[target].to_numpy(), df["初期自付金额（元）"].to_numpy())]
+    pareto = front.sort_values("初期自付金额（元）").reset_index(drop=True)
+
+    return {"best": best, "pareto": pareto, "stats": stats}
@@ -0,0 +1,62 @@
+"""
+输出模块的并发计算阶段：
+
+- 模块可选定义 prepare()：只做计算与文件 / 数据库 I/O，不调用任何 st.* 绘制函数，
+  也不依赖同一次运行中其他模块 render() 写入的会话文档；
+- 面板先用线程池并发执行同级模块的 prepare()，再按顺序调用 render(prepared) 输出结果，
+  重跑耗时接近最慢的模块而不是各模块之和；
+- 工作线程继承当前脚本的 ScriptRunContext，prepare() 中可正常读取 st.session_state / 会话文档。
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+MAX_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+
+def _with_context(fn, ctx):
+    def run():
+        if ctx is not None:
+            add_script_run_ctx(ctx=ctx)
+        return fn()
+    return run
+
+
+def run_tasks(tasks: dict, max_workers: int = MAX_WORKERS) -> dict:
+    """
+    并发执行 {名称: 无参函数}，返回 {名称: {"result": 返回值, "error": 异常或 None}}；
+    每次调用使用独立线程池，嵌套调用（父模块的 prepare 再并发子模块）不会互相等待而死锁
+    """
+    if not tasks:
+        return {}
+    ctx = get_script_run_ctx(suppress_warning=True)
+    outcomes = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as pool:
+        futures = {name: pool.submit(_with_context(fn, ctx)) for name, fn in tasks.items()}
+        for name, future in futures.items():
+            try:
+                outcomes[name] = {"result": future.result(), "error": None}
+            except Exception as e:
+                outcomes[name] = {"result": None, "error": e}
+    return outcomes
+
+
+def prepare_modules(modules: dict) -> dict:
+    """
+    对 {名称: 模块对象} 中定义了 prepare() 的模块并发执行计算阶段
+    """
+    return run_tasks({name: module.prepare for name, module in modules.items() if hasattr(module, "prepare")})
+
+
+def call_render(render_fn, outcome: dict = None):
+    """
+    渲染阶段：有预计算结果时传给 render(prepared)，prepare() 出错则抛出其异常；
+    未定义 prepare() 的模块照常调用 render()
+    """
+    if outcome is None:
+        return render_fn()
+    if outcome["error"] is not None:
+        raise outcome["error"]
+    return render_fn(outcome["result"])
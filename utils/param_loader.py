@@ -0,0 +1,167 @@
+"""
+类型化的项目参数：由 input_param_modules/ 下的参数 YAML 生成字段表，
+替代各模块中 data["4经济分析方法参数配置"]["售电电价"] 式的嵌套字典查找与重复的单位换算。
+
+- PROJECT_FIELDS：内部字段名 -> (输入模块, 参数名, 单位换算系数)，
+  标签含“（%）”的参数换算系数为 0.01，其余为 1；
+- ProjectParams：基于 __slots__ 的参数对象，字段为计算口径（已换算单位）的 float，
+  构造时预先计算规范化哈希，可直接作为缓存键；
+- pack / columns：批量参数打包为连续的结构化数组（每个方案一条记录），
+  或取出各字段列供 evaluate_projects 等批量函数使用。
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+from utils.storage import yaml_load
+
+PARAM_SCHEMA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ui_modules", "input_ui", "input_param_modules"
+)
+
+PERCENT_MARK = "（%）"
+
+# 内部字段名 -> (输入模块, 参数名)
+FIELD_SOURCES = {
+    "radiation": ("2光伏发电参数", "年辐射量"),
+    "area": ("2光伏发电参数", "太阳能板面积（㎡）"),
+    "efficiency": ("2光伏发电参数", "太阳能板转换效率（η）"),
+    "pr": ("2光伏发电参数", "系统效率因子（PR）"),
+    "decay": ("2光伏发电参数", "光伏发电衰减率（%/年）"),
+    "decision_cost": ("3项目建设参数配置", "项目决策成本"),
+    "design_cost": ("3项目建设参数配置", "方案设计成本"),
+    "panel_price": ("3项目建设参数配置", "光伏组件价格"),
+    "inverter_price": ("3项目建设参数配置", "逆变器总价"),
+    "install_cost": ("3项目建设参数配置", "安装费用"),
+    "other_cost": ("3项目建设参数配置", "其他初期费用"),
+    "lifetime": ("4经济分析方法参数配置", "产品使用寿命"),
+    "sell_ratio": ("4经济分析方法参数配置", "发电售卖比例"),
+    "use_price": ("4经济分析方法参数配置", "用电电价"),
+    "sell_price": ("4经济分析方法参数配置", "售电电价"),
+    "om_cost": ("4经济分析方法参数配置", "年运维成本"),
+    "subsidy": ("4经济分析方法参数配置", "年补贴金额"),
+    "tax_rate": ("4经济分析方法参数配置", "综合税率"),
+    "depreciation_rate": ("4经济分析方法参数配置", "年折旧率"),
+    "discount_rate": ("4经济分析方法参数配置", "折现率"),
+    "inflation_rate": ("4经济分析方法参数配置", "通货膨胀率"),
+    "sell_price_growth": ("4经济分析方法参数配置", "售电电价年增长率"),
+    "use_price_growth": ("4经济分析方法参数配置", "用电电价年增长率"),
+    "om_cost_growth": ("4经济分析方法参数配置", "年运维成本增长率"),
+    "subsidy_years": ("4经济分析方法参数配置", "补贴年限"),
+}
+
+# 后来新增的字段：早先保存的输入（历史方案、导出的 YAML）中缺少时取参数 YAML 中的默认值
+OPTIONAL_FIELDS = ("sell_price_growth", "use_price_growth", "om_cost_growth", "subsidy_years")
+
+
+def load_schemas(schema_dir: str = PARAM_SCHEMA_DIR) -> dict:
+    """
+    读取全部参数 YAML，返回 {输入模块名: {参数名: 参数定义}}
+    """
+    schemas = {}
+    if not os.path.isdir(schema_dir):
+        return schemas
+    for file_name in sorted(os.listdir(schema_dir)):
+        if file_name.endswith(".yaml"):
+            with open(os.path.join(schema_dir, file_name), "r", encoding="utf-8") as f:
+                schema = yaml_load(f) or {}
+            schemas[os.path.splitext(file_name)[0]] = schema.get("参数", {}) or {}
+    return schemas
+
+
+def build_project_fields(schemas: dict) -> dict:
+    """
+    由参数定义生成字段表：{内部字段名: (输入模块, 参数名, 单位换算系数)}
+    """
+    fields = {}
+    for name, (section, key) in FIELD_SOURCES.items():
+        label = str(schemas.get(section, {}).get(key, {}).get("label", key))
+        fields[name] = (section, key, 0.01 if PERCENT_MARK in label else 1.0)
+    return fields
+
+
+def build_field_defaults(schemas: dict, fields: dict) -> dict:
+    """
+    可选字段的默认值（计算口径）
+    """
+    return {
+        name: float(schemas.get(fields[name][0], {}).get(fields[name][1], {}).get("default", 0.0)) * fields[name][2]
+        for name in OPTIONAL_FIELDS
+    }
+
+
+SCHEMAS = load_schemas()
+PROJECT_FIELDS = build_project_fields(SCHEMAS)
+FIELD_NAMES = tuple(PROJECT_FIELDS)
+FIELD_DEFAULTS = build_field_defaults(SCHEMAS, PROJECT_FIELDS)
+
+# 每个方案一条记录的结构化类型（字段顺序与 PROJECT_FIELDS 一致）
+PARAMS_DTYPE = np.dtype([(name, np.float64) for name in FIELD_NAMES])
+
+
+class ProjectParams:
+    """
+    计算口径的项目参数（单位已换算），字段与 PROJECT_FIELDS 一一对应
+    """
+
+    __slots__ = FIELD_NAMES + ("canonical_hash",)
+
+    def __init__(self, **values):
+        for name in FIELD_NAMES:
+            object.__setattr__(self, name, float(values[name]))
+        record = np.array([getattr(self, name) for name in FIELD_NAMES], dtype=np.float64)
+        object.__setattr__(self, "canonical_hash", hashlib.sha256(record.tobytes()).hexdigest())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ProjectParams 不可修改，请使用 replace()")
+
+    @classmethod
+    def from_inputs(cls, inputs: dict) -> "ProjectParams":
+        """
+        从 user_inputs 结构构造，缺少字段时抛出 KeyError（OPTIONAL_FIELDS 取默认值）
+        """
+        values = {}
+        for name, (section, key, scale) in PROJECT_FIELDS.items():
+            if name in FIELD_DEFAULTS and key not in inputs.get(section, {}):
+                values[name] = FIELD_DEFAULTS[name]
+            else:
+                values[name] = float(inputs[section][key]) * scale
+        return cls(**values)
+
+    @classmethod
+    def from_record(cls, record) -> "ProjectParams":
+        return cls(**{name: record[name] for name in FIELD_NAMES})
+
+    def replace(self, **changes) -> "ProjectParams":
+        return ProjectParams(**{**self.as_dict(), **changes})
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in FIELD_NAMES}
+
+    def to_record(self) -> tuple:
+        return tuple(getattr(self, name) for name in FIELD_NAMES)
+
+    def __eq__(self, other):
+        return isinstance(other, ProjectParams) and self.canonical_hash == other.canonical_hash
+
+    def __hash__(self):
+        return hash(self.canonical_hash)
+
+    def __repr__(self):
+        return "ProjectParams(" + ", ".join(f"{name}={getattr(self, name)!r}" for name in FIELD_NAMES) + ")"
+
+
+def pack(params_list) -> np.ndarray:
+    """
+    将多个 ProjectParams 打包为形状 (B,) 的连续结构化数组
+    """
+    return np.array([p.to_record() for p in params_list], dtype=PARAMS_DTYPE)
+
+
+def columns(records: np.ndarray) -> dict:
+    """
+    结构化数组 -> {字段名: 形状 (B,) 的 float 数组}，可直接传给 evaluate_projects / evaluate_metrics
+    """
+    return {name: np.ascontiguousarray(records[name]) for name in FIELD_NAMES}
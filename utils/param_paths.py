@@ -0,0 +1,111 @@
+"""
+随年份变化的参数路径：售电电价、用电电价、年补贴金额与年运维成本按年取值。
+
+- 标量参数给出路径形状：售电电价、用电电价与年运维成本按年增长率 g 逐年变化（第 t 年为 基准值 ×(1+g)^(t-1)），
+  年补贴金额只在补贴年限内发放；
+- 逐年参数表（输入面板“逐年参数”，可上传 CSV）给出阶跃变化或完整序列：
+  自表中某年起取该值并保持到下一次变化，覆盖按增长率得到的路径；
+- parameter_paths 返回可与 (B, T) 发电量直接广播的数组：参数在各方案间相同时只算一行 (1, T)，
+  增长率为 0 且补贴覆盖全寿命时仍为列向量，批量计算的开销与标量参数相同。
+"""
+
+import numpy as np
+
+from utils.param_loader import PROJECT_FIELDS
+
+SERIES_SECTION = "逐年参数"
+YEAR_COLUMN = "使用年份"
+
+# 随年份变化的参数：内部字段名 -> 逐年参数表中的列名
+PATH_COLUMNS = {
+    "sell_price": "售电电价",
+    "use_price": "用电电价",
+    "subsidy": "年补贴金额",
+    "om_cost": "年运维成本",
+}
+
+# 按增长率变化的参数：内部字段名 -> 年增长率字段
+GROWTH_FIELDS = {
+    "sell_price": "sell_price_growth",
+    "use_price": "use_price_growth",
+    "om_cost": "om_cost_growth",
+}
+
+
+def series_from_inputs(inputs: dict) -> dict:
+    """
+    从 user_inputs 的逐年参数表提取 {内部字段名: {年份: 值}}（计算口径，空白单元格不计）
+    """
+    series = {}
+    for row in (inputs or {}).get(SERIES_SECTION) or []:
+        year = row.get(YEAR_COLUMN)
+        if year is None or year != year:
+            continue
+        for name, column in PATH_COLUMNS.items():
+            value = row.get(column)
+            if value is None or value != value:
+                continue
+            series.setdefault(name, {})[int(year)] = float(value) * PROJECT_FIELDS[name][2]
+    return series
+
+
+def _uniform(values: np.ndarray) -> bool:
+    return values.size == 0 or bool(np.all(values == values[0]))
+
+
+def _column(values) -> np.ndarray:
+    """
+    (B,) 参数转为列向量；各方案取值相同时压缩为 (1, 1)，后续逐年运算只算一行
+    """
+    values = np.atleast_1d(np.asarray(values, dtype=float))
+    return (values[:1] if _uniform(values) else values)[:, None]
+
+
+def escalate(base, growth, years: np.ndarray) -> np.ndarray:
+    """
+    第 t 年取值 base × (1+growth)^(t-1)
+    """
+    base, growth = _column(base), _column(growth)
+    if growth.size == 1 and growth[0, 0] == 0:
+        return base
+    return base * (1 + growth) ** (years - 1)[None, :]
+
+
+def limit_years(base, n_years, years: np.ndarray) -> np.ndarray:
+    """
+    只在前 n_years 年取 base，之后为 0（用于补贴年限）
+    """
+    base, n_years = _column(base), _column(n_years)
+    if n_years.size == 1 and n_years[0, 0] >= years[-1]:
+        return base
+    return base * (years[None, :] <= n_years)
+
+
+def apply_series(path: np.ndarray, years: np.ndarray, points: dict) -> np.ndarray:
+    """
+    按逐年参数表覆盖路径：自表中某年起取该值，保持到下一次变化；首个年份之前沿用原路径
+    """
+    if not points:
+        return path
+    marks = np.array(sorted(points), dtype=float)
+    values = np.array([points[int(y)] for y in marks])
+    idx = np.searchsorted(marks, years, side="right") - 1
+    override = values[np.maximum(idx, 0)]
+    return np.where((idx >= 0)[None, :], override[None, :], path)
+
+
+def parameter_paths(params: dict, years: np.ndarray, series: dict = None) -> dict:
+    """
+    返回 {内部字段名: 逐年取值}，形状为 (B, 1)、(1, T) 或 (B, T)，可与 (B, T) 数组直接广播。
+    params 为标量或 (B,) 数组的参数字典，缺少增长率 / 补贴年限字段时按不变 / 不限处理。
+    """
+    years = np.asarray(years)
+    series = series or {}
+    paths = {}
+    for name in PATH_COLUMNS:
+        if name in GROWTH_FIELDS:
+            path = escalate(params[name], params.get(GROWTH_FIELDS[name], 0.0), years)
+        else:
+            path = limit_years(params[name], params.get("subsidy_years", np.inf), years)
+        paths[name] = apply_series(path, years, series.get(name))
+    return paths
@@ -0,0 +1,277 @@
+"""
+会话级参数 / 结果存储。
+
+- user_inputs.yaml、user_outputs.yaml、farmer_cashflow.yaml、enterprise_cashflow.yaml 等
+  “文档”保存在各自的 st.session_state 中，不同用户互不干扰；
+- 设置环境变量 SOLAR_PERSIST_SESSIONS=1 时，每个会话的文档同时落盘到
+  session_data/<会话ID>/ 下（URL 参数 ?session=<会话ID> 可恢复），
+  落盘格式由 utils.storage 的后端决定（默认列式二进制）；
+- sensitivity_log.yaml 等跨会话共享文件通过文件锁 + 原子替换 / 追加写入保证并发安全。
+"""
+
+import copy
+import logging
+import os
+import re
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import streamlit as st
+
+from utils.storage import (
+    backend_for_path, dumps, export_yaml, load_file, storage_path, yaml_dump, yaml_load,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+SESSION_DATA_DIR = "session_data"
+PERSIST_SESSIONS = os.environ.get("SOLAR_PERSIST_SESSIONS", "0") == "1"
+
+_STATE_KEY = "_param_store"
+_process_locks = {}
+_process_locks_guard = threading.Lock()
+
+# 异步落盘：落盘路径 -> 最新待写入的数据；同一文档未写完前的多次写入只落盘最后一次
+_pending_writes = {}
+_pending_lock = threading.Lock()
+_persist_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-persist")
+# 后台落盘失败记录：(落盘路径, 异常)，由 wait_for_pending_writes 取出并抛出
+_write_errors = []
+
+logger = logging.getLogger(__name__)
+
+
+# ===== 共享文件：锁与原子写入 =====
+
+def _process_lock(path: str) -> threading.Lock:
+    with _process_locks_guard:
+        return _process_locks.setdefault(os.path.abspath(path), threading.Lock())
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    对共享文件加独占锁（进程内线程锁 + 跨进程文件锁）
+    """
+    lock_path = f"{path}.lock"
+    with _process_lock(path):
+        with open(lock_path, "a+") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def atomic_write_bytes(path: str, raw: bytes):
+    """
+    先写入同目录临时文件再原子替换，读者不会看到写了一半的文件
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def atomic_write_yaml(path: str, data):
+    atomic_write_bytes(path, yaml_dump(data).encode("utf-8"))
+
+
+def read_shared_yaml(path: str, default=None):
+    """
+    加锁读取共享 YAML 文件
+    """
+    if not os.path.exists(path):
+        return default
+    with file_lock(path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml_load(f)
+    return default if data is None else data
+
+
+def append_shared_yaml_list(path: str, entry):
+    """
+    向共享 YAML 列表文件追加一条记录：加锁后只追加新条目的文本，
+    不再整体读取与重写，写入耗时与文件长度无关
+    """
+    with file_lock(path):
+        text = yaml_dump([entry])
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "r", encoding="utf-8") as f:
+                head = f.read(16).strip()
+            if head.startswith("["):
+                # 流式风格（如 "[]"）无法直接追加，退化为整体重写
+                with open(path, "r", encoding="utf-8") as f:
+                    data = yaml_load(f) or []
+                data.append(entry)
+                atomic_write_yaml(path, data)
+                return
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+# ===== 会话文档 =====
+
+def _document_name(path: str) -> str:
+    return os.path.basename(path)
+
+
+def _session_dir(session_id: str) -> str:
+    return os.path.join(SESSION_DATA_DIR, session_id)
+
+
+def _session_state() -> dict:
+    """
+    当前会话的存储区：{"session_id": ..., "documents": {文档名: 数据}}
+    """
+    if _STATE_KEY not in st.session_state:
+        session_id = None
+        documents = {}
+        if PERSIST_SESSIONS:
+            requested = st.query_params.get("session")
+            if requested and re.fullmatch(r"[0-9a-f]{32}", requested):
+                session_id = requested
+                documents = _load_session_documents(session_id)
+        session_id = session_id or uuid.uuid4().hex
+        if PERSIST_SESSIONS:
+            st.query_params["session"] = session_id
+        st.session_state[_STATE_KEY] = {"session_id": session_id, "documents": documents}
+    return st.session_state[_STATE_KEY]
+
+
+def _load_session_documents(session_id: str) -> dict:
+    """
+    读取会话目录下的全部文档（任一已注册后端格式），统一以 *.yaml 文档名为键
+    """
+    directory = _session_dir(session_id)
+    documents = {}
+    if os.path.isdir(directory):
+        for file_name in os.listdir(directory):
+            if backend_for_path(file_name) is None:
+                continue
+            name = os.path.splitext(file_name)[0] + ".yaml"
+            documents[name] = load_file(os.path.join(directory, file_name))
+    return documents
+
+
+def get_session_id() -> str:
+    return _session_state()["session_id"]
+
+
+def document_exists(path: str) -> bool:
+    return _document_name(path) in _session_state()["documents"]
+
+
+def read_document(path: str, default=None):
+    """
+    读取当前会话的文档（返回副本，修改后需 write_document 才会生效）
+    """
+    documents = _session_state()["documents"]
+    name = _document_name(path)
+    if name not in documents or documents[name] is None:
+        return default
+    return copy.deepcopy(documents[name])
+
+
+def write_document(path: str, data):
+    """
+    覆盖写入当前会话的文档；开启持久化时同步原子落盘
+    """
+    state = _session_state()
+    name = _document_name(path)
+    state["documents"][name] = copy.deepcopy(data)
+    if PERSIST_SESSIONS:
+        path = os.path.join(_session_dir(state["session_id"]), storage_path(name))
+        atomic_write_bytes(path, dumps(data))
+
+
+def _flush_pending(path: str):
+    with _pending_lock:
+        data = _pending_writes.pop(path)
+    atomic_write_bytes(path, dumps(data))
+
+
+def _record_write_error(path: str, future):
+    """
+    后台落盘完成回调：磁盘已满、无权限或序列化失败等错误写入日志并记录，不静默丢失
+    """
+    error = future.exception()
+    if error is None:
+        return
+    logger.error("会话文档落盘失败：%s", path, exc_info=error)
+    with _pending_lock:
+        _write_errors.append((path, error))
+
+
+def write_document_async(path: str, data):
+    """
+    覆盖写入当前会话的文档：内存中立即生效，开启持久化时在后台线程落盘（不阻塞页面）
+    """
+    state = _session_state()
+    name = _document_name(path)
+    snapshot = copy.deepcopy(data)
+    state["documents"][name] = snapshot
+    if PERSIST_SESSIONS:
+        path = os.path.join(_session_dir(state["session_id"]), storage_path(name))
+        # 会话中的文档只会被整体替换、不会原地修改，快照可直接交给后台线程
+        with _pending_lock:
+            queued = path in _pending_writes
+            _pending_writes[path] = snapshot
+        if not queued:
+            future = _persist_executor.submit(_flush_pending, path)
+            future.add_done_callback(lambda f, path=path: _record_write_error(path, f))
+
+
+def wait_for_pending_writes():
+    """
+    等待已提交的异步落盘全部完成；期间有落盘失败时抛出 OSError（含失败的文件与原因）
+    """
+    _persist_executor.submit(lambda: None).result()
+    with _pending_lock:
+        errors = list(_write_errors)
+        _write_errors.clear()
+    if errors:
+        details = "；".join(f"{path}：{error}" for path, error in errors)
+        raise OSError(f"{len(errors)} 个会话文档落盘失败：{details}") from errors[0][1]
+
+
+def update_document(path: str, data_to_update: dict):
+    """
+    按顶层键合并更新当前会话的文档
+    """
+    existing = read_document(path, {}) or {}
+    existing.update(data_to_update)
+    write_document(path, existing)
+
+
+def export_session_yaml() -> str:
+    """
+    将当前会话的全部文档导出为人工可读的 YAML 文本
+    """
+    return export_yaml(_session_state()["documents"])
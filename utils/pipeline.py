@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+from utils.economics import extract_project_params, evaluate_metrics
+from utils.param_paths import series_from_inputs
+from utils.result_cache import cached_result
+
+# 方案输出指标（与 user_outputs.yaml 中的命名保持一致）
+OUTPUT_FIELDS = {
+    "static_npv": "静态净现值（NPV）",
+    "static_irr": "静态内部收益率（IRR）",
+    "dynamic_npv": "动态净现值（NPV）",
+    "dynamic_irr": "动态内部收益率（IRR）",
+    "payback": "静态投资回收期（年）",
+    "dynamic_payback": "动态投资回收期（年）",
+    "initial_investment": "初始投入总计",
+}
+
+
+def _to_float(value, digits: int):
+    value = float(value)
+    return None if np.isnan(value) else round(value, digits)
+
+
+def metrics_to_outputs(metrics: dict, row: int = 0) -> dict:
+    """
+    取批量指标中的一行，转换为中文键的输出字典（无法计算的指标记为 None）
+    """
+    return {
+        label: _to_float(metrics[name][row], 6 if "IRR" in label else 2)
+        for name, label in OUTPUT_FIELDS.items()
+    }
+
+
+def evaluate_scenario(inputs: dict) -> dict:
+    """
+    根据一组 user_inputs 直接计算项目核心指标（NPV / IRR / 回收期），结果在进程内跨会话缓存
+    """
+    return cached_result(
+        "方案指标", inputs,
+        lambda: metrics_to_outputs(evaluate_metrics(extract_project_params(inputs), series_from_inputs(inputs)))
+    )
+
+
+def _series_key(series: dict) -> tuple:
+    return tuple(sorted((name, tuple(sorted(points.items()))) for name, points in series.items()))
+
+
+def _merge_rows(parts: list, n_years: int, order: np.ndarray):
+    """
+    按行拼接多组批量结果并按 order 重排：(k,) 数组直接拼接，
+    (k, T) 数组按最长寿命在年份方向补零（mask 补 False）
+    """
+    if isinstance(parts[0], dict):
+        return {key: _merge_rows([part[key] for part in parts], n_years, order) for key in parts[0]}
+    arrays = [np.atleast_1d(part) for part in parts]
+    if arrays[0].ndim == 2:
+        arrays = [np.pad(a, ((0, 0), (0, n_years - a.shape[1]))) for a in arrays]
+    return np.concatenate(arrays)[order]
+
+
+def evaluate_variants(variants: dict) -> dict:
+    """
+    一次向量化计算多个方案：variants 为 {方案名: user_inputs}，
+    各方案参数堆叠为形状 (K,) 的数组后调用 evaluate_metrics。
+    固定的方案是固定时输入的快照，逐年参数表可能与当前输入不同：
+    逐年参数表相同的方案合并为一次计算，不同的分组计算后按原顺序拼接
+    """
+    names = list(variants.keys())
+    rows = [extract_project_params(variants[name]) for name in names]
+    params = {field: np.array([row[field] for row in rows]) for field in rows[0]}
+
+    groups = {}
+    for i, name in enumerate(names):
+        series = series_from_inputs(variants[name])
+        groups.setdefault(_series_key(series), (series, []))[1].append(i)
+
+    if len(groups) == 1:
+        series, _ = next(iter(groups.values()))
+        return {"names": names, "params": params, "metrics": evaluate_metrics(params, series)}
+
+    index, parts = [], []
+    for series, rows_in_group in groups.values():
+        index.extend(rows_in_group)
+        part = evaluate_metrics({field: values[rows_in_group] for field, values in params.items()}, series)
+        part["project"].pop("years")
+        parts.append(part)
+
+    # 分组结果拼接后恢复方案的原始顺序，年份补齐到最长寿命
+    n_years = int(params["lifetime"].max())
+    metrics = _merge_rows(parts, n_years, np.argsort(index))
+    metrics["project"]["years"] = np.arange(1, n_years + 1)
+    return {"names": names, "params": params, "metrics": metrics}
+
+
+def evaluate_cities(inputs: dict, cities: pd.DataFrame) -> pd.DataFrame:
+    """
+    当前方案参数在各城市年辐射量下的指标：cities 需含 省份 / 城市 / 年辐射量 列，
+    年辐射量作为形状 (城市数,) 的数组一次向量化计算，返回每城市一行的指标表
+    """
+    params = extract_project_params(inputs)
+    params["radiation"] = cities["年辐射量"].to_numpy(dtype=float)
+    metrics = evaluate_metrics(params, series_from_inputs(inputs))
+
+    result = cities[["省份", "城市", "年辐射量"]].reset_index(drop=True)
+    for name, label in OUTPUT_FIELDS.items():
+        result[label] = np.asarray(np.broadcast_to(metrics[name], len(result)), dtype=float)
+    return result
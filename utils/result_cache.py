@@ -0,0 +1,127 @@
+"""
+进程级计算结果缓存：多个会话评估同一组参数（如某城市的默认方案）时只计算一次。
+
+- 以“命名空间 + 规范化参数哈希”为键，命名空间区分不同的计算（如初始投入、年度收入）；
+- 存取都做深拷贝，会话对结果的修改不会影响缓存；键只由显式传入的参数决定，
+  不包含任何会话状态，缓存中也不保存控件状态；
+- 按内存预算（估算字节数）与 LRU 淘汰，条目超过 TTL 视为过期；
+- cache_stats() 返回命中 / 未命中 / 淘汰 / 过期次数与当前占用。
+
+环境变量：SOLAR_RESULT_CACHE_MB（默认 128）、SOLAR_RESULT_CACHE_TTL（秒，默认 3600）
+"""
+
+import copy
+import hashlib
+import json
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+MEMORY_BUDGET_BYTES = int(float(os.environ.get("SOLAR_RESULT_CACHE_MB", "128")) * 1024 * 1024)
+TTL_SECONDS = float(os.environ.get("SOLAR_RESULT_CACHE_TTL", "3600"))
+
+# 键 -> (值, 估算字节数, 写入时间)
+_entries = OrderedDict()
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "bytes": 0}
+
+
+# ===== 规范化哈希 =====
+
+def _canonical(value):
+    """
+    规范化参数：字典按键排序，数值统一为 12 位有效数字（50 与 50.0 视为相同）
+    """
+    if isinstance(value, dict):
+        return {str(k): _canonical(value[k]) for k in sorted(value, key=str)}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return format(float(value), ".12g")
+    return str(value)
+
+
+def canonical_hash(inputs: dict) -> str:
+    payload = json.dumps(_canonical(inputs), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ===== 缓存 =====
+
+def _estimate_bytes(value) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_estimate_bytes(k) + _estimate_bytes(v) for k, v in value.items())
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def _evict(key):
+    _, size, _ = _entries.pop(key)
+    _stats["bytes"] -= size
+
+
+def cached_result(namespace: str, params, compute, ttl: float = None):
+    """
+    返回 compute() 的结果：同一命名空间下 params 规范化哈希相同且未过期时直接取缓存；
+    compute() 抛出的异常不缓存
+    """
+    key = f"{namespace}:{canonical_hash(params)}"
+    ttl = TTL_SECONDS if ttl is None else ttl
+    now = time.monotonic()
+
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None:
+            if now - entry[2] <= ttl:
+                _entries.move_to_end(key)
+                _stats["hits"] += 1
+                return copy.deepcopy(entry[0])
+            _evict(key)
+            _stats["expirations"] += 1
+        _stats["misses"] += 1
+
+    value = compute()
+    size = _estimate_bytes(value)
+    if size > MEMORY_BUDGET_BYTES:
+        return value
+
+    with _lock:
+        if key in _entries:
+            _evict(key)
+        _entries[key] = (copy.deepcopy(value), size, now)
+        _stats["bytes"] += size
+        while _stats["bytes"] > MEMORY_BUDGET_BYTES:
+            _evict(next(iter(_entries)))
+            _stats["evictions"] += 1
+    return value
+
+
+def cache_stats() -> dict:
+    with _lock:
+        lookups = _stats["hits"] + _stats["misses"]
+        return {
+            **_stats,
+            "entries": len(_entries),
+            "budget_bytes": MEMORY_BUDGET_BYTES,
+            "hit_rate": _stats["hits"] / lookups if lookups else 0.0,
+        }
+
+
+def clear_result_cache():
+    with _lock:
+        _entries.clear()
+        _stats.update(hits=0, misses=0, evictions=0, expirations=0, bytes=0)
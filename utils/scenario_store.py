@@ -0,0 +1,272 @@
+"""
+方案历史库：把每次评估的方案（user_inputs 输入 + NPV / IRR / 回收期输出）写入内嵌 SQLite，
+以参与计算的参数（scenario_hash）的规范化哈希为主键，并对省份、城市、时间与关键指标建索引，支持快速筛选与复用。
+
+- 每次评估只由 record_scenario 记录一次（命中次数 +1），查询与 get_or_compute 只读；
+- 每条记录带计算口径版本 model_version，与 MODEL_VERSION 不一致的记录查询时视为未命中并重新计算；
+- 从 sensitivity_log.yaml 导入时记录已导入条目的哈希，重复导入不会重复计数；
+  日志只含三个参数模块，与实时记录按同一投影取哈希，已实时记录过的方案导入时合并到同一行。
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from utils.param_paths import SERIES_SECTION
+from utils.pipeline import evaluate_scenario
+from utils.result_cache import canonical_hash
+from utils.sensitivity_log import normalize_entry
+
+DB_PATH = os.environ.get("SOLAR_SCENARIO_DB", "scenario_history.db")
+
+# 计算口径版本：经济模型或输出指标结构变化时递增；从日志导入的记录口径未知，记为 0
+MODEL_VERSION = 2
+
+# 结构化列：列名 -> 输出指标名
+METRIC_COLUMNS = {
+    "static_npv": "静态净现值（NPV）",
+    "static_irr": "静态内部收益率（IRR）",
+    "dynamic_npv": "动态净现值（NPV）",
+    "dynamic_irr": "动态内部收益率（IRR）",
+    "payback": "静态投资回收期（年）",
+    "dynamic_payback": "动态投资回收期（年）",
+}
+
+# 参与计算的输入模块（与敏感性日志记录的模块一致）；制度配置等说明性输入不影响方案结果
+SCENARIO_SECTIONS = ("2光伏发电参数", "3项目建设参数配置", "4经济分析方法参数配置")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenarios (
+    param_hash      TEXT PRIMARY KEY,
+    province        TEXT,
+    city            TEXT,
+    created_at      TEXT NOT NULL,
+    last_seen_at    TEXT NOT NULL,
+    hit_count       INTEGER NOT NULL DEFAULT 1,
+    model_version   INTEGER NOT NULL DEFAULT 0,
+    static_npv      REAL,
+    static_irr      REAL,
+    dynamic_npv     REAL,
+    dynamic_irr     REAL,
+    payback         REAL,
+    dynamic_payback REAL,
+    inputs_json     TEXT NOT NULL,
+    outputs_json    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scenarios_province ON scenarios (province, static_irr);
+CREATE INDEX IF NOT EXISTS idx_scenarios_city ON scenarios (city);
+CREATE INDEX IF NOT EXISTS idx_scenarios_created ON scenarios (created_at);
+CREATE INDEX IF NOT EXISTS idx_scenarios_irr ON scenarios (static_irr);
+CREATE INDEX IF NOT EXISTS idx_scenarios_npv ON scenarios (static_npv);
+CREATE INDEX IF NOT EXISTS idx_scenarios_payback ON scenarios (payback);
+CREATE TABLE IF NOT EXISTS imported_log_entries (
+    entry_hash      TEXT PRIMARY KEY
+);
+"""
+
+_local = threading.local()
+_initialized = set()
+_init_lock = threading.Lock()
+
+
+def _connect(db_path: str = None) -> sqlite3.Connection:
+    """
+    每个线程复用一个连接；WAL 模式下读写互不阻塞
+    """
+    db_path = db_path or DB_PATH
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    if db_path not in connections:
+        conn = sqlite3.connect(db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        with _init_lock:
+            if db_path not in _initialized:
+                conn.executescript(_SCHEMA)
+                # 旧版数据库补充口径版本列（已有记录视为口径未知）
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(scenarios)")}
+                if "model_version" not in columns:
+                    conn.execute("ALTER TABLE scenarios ADD COLUMN model_version INTEGER NOT NULL DEFAULT 0")
+                _initialized.add(db_path)
+        connections[db_path] = conn
+    return connections[db_path]
+
+
+def scenario_hash(inputs: dict) -> str:
+    """
+    方案的参数哈希：只取参与计算的模块（及填写了的逐年参数表），实时记录与日志导入口径一致
+    """
+    projection = {section: inputs.get(section) or {} for section in SCENARIO_SECTIONS}
+    if inputs.get(SERIES_SECTION):
+        projection[SERIES_SECTION] = inputs[SERIES_SECTION]
+    return canonical_hash(projection)
+
+
+def record_scenario(inputs: dict, outputs: dict, db_path: str = None) -> str:
+    """
+    记录一次评估：写入（或更新）方案记录，返回参数哈希；重复方案更新最近时间、命中次数与当前口径的输出
+    """
+    param_hash = scenario_hash(inputs)
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    solar = inputs.get("2光伏发电参数", {})
+    metrics = [outputs.get(label) for label in METRIC_COLUMNS.values()]
+
+    conn = _connect(db_path)
+    with conn:
+        conn.execute(
+            f"""
+            INSERT INTO scenarios (param_hash, province, city, created_at, last_seen_at, model_version,
+                                   {", ".join(METRIC_COLUMNS)}, inputs_json, outputs_json)
+            VALUES (?, ?, ?, ?, ?, ?, {", ".join("?" * len(METRIC_COLUMNS))}, ?, ?)
+            ON CONFLICT(param_hash) DO UPDATE SET
+                last_seen_at = excluded.last_seen_at,
+                hit_count = hit_count + 1,
+                model_version = excluded.model_version,
+                outputs_json = excluded.outputs_json,
+                {", ".join(f"{c} = excluded.{c}" for c in METRIC_COLUMNS)}
+            """,
+            [param_hash, solar.get("省份"), solar.get("城市"), now, now, MODEL_VERSION, *metrics,
+             json.dumps(inputs, ensure_ascii=False), json.dumps(outputs, ensure_ascii=False)],
+        )
+    return param_hash
+
+
+def lookup_scenario(inputs: dict, db_path: str = None):
+    """
+    按参数哈希查找当前口径下已评估的方案，返回输出字典；未命中或口径版本不一致返回 None（只读）
+    """
+    row = _connect(db_path).execute(
+        "SELECT outputs_json FROM scenarios WHERE param_hash = ? AND model_version = ?",
+        (scenario_hash(inputs), MODEL_VERSION)
+    ).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def get_or_compute(inputs: dict, db_path: str = None) -> dict:
+    """
+    优先从历史库返回已有结果，未命中时直接计算；只读，入库由评估流程调用 record_scenario 完成
+    """
+    outputs = lookup_scenario(inputs, db_path)
+    if outputs is None:
+        outputs = evaluate_scenario(inputs)
+    return outputs
+
+
+def query_scenarios(province=None, city=None, min_irr=None, max_irr=None, min_npv=None,
+                    max_payback=None, since=None, until=None, order_by: str = "last_seen_at",
+                    descending: bool = True, limit: int = 500, db_path: str = None) -> pd.DataFrame:
+    """
+    组合条件查询历史方案，例如 query_scenarios(province="江苏", min_irr=0.08)。
+    province / city 可为单个值或列表；since / until 为 "YYYY-MM-DD[ HH:MM:SS]" 字符串。
+    """
+    clauses, params = [], []
+
+    def match(column, value):
+        if value is None:
+            return
+        values = [value] if isinstance(value, str) else list(value)
+        if values:
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+
+    match("province", province)
+    match("city", city)
+    for column, op, value in [
+        ("static_irr", ">=", min_irr),
+        ("static_irr", "<=", max_irr),
+        ("static_npv", ">=", min_npv),
+        ("payback", "<=", max_payback),
+        ("created_at", ">=", since),
+        ("created_at", "<=", until),
+    ]:
+        if value is not None:
+            clauses.append(f"{column} {op} ?")
+            params.append(value)
+
+    allowed = {"last_seen_at", "created_at", "hit_count", *METRIC_COLUMNS}
+    if order_by not in allowed:
+        raise ValueError(f"不支持的排序字段：{order_by}")
+
+    sql = (
+        f"SELECT param_hash, province, city, created_at, last_seen_at, hit_count, "
+        f"{', '.join(METRIC_COLUMNS)} FROM scenarios"
+        + (f" WHERE {' AND '.join(clauses)}" if clauses else "")
+        + f" ORDER BY {order_by} {'DESC' if descending else 'ASC'} LIMIT ?"
+    )
+    params.append(int(limit))
+
+    df = pd.read_sql_query(sql, _connect(db_path), params=params)
+    return df.rename(columns={"param_hash": "参数哈希", "province": "省份", "city": "城市",
+                              "created_at": "首次评估时间", "last_seen_at": "最近评估时间",
+                              "hit_count": "评估次数", **METRIC_COLUMNS})
+
+
+def load_scenarios(param_hashes: list, db_path: str = None) -> list:
+    """
+    读取若干方案的完整输入与输出，用于对比
+    """
+    if not param_hashes:
+        return []
+    rows = _connect(db_path).execute(
+        f"SELECT param_hash, inputs_json, outputs_json FROM scenarios "
+        f"WHERE param_hash IN ({', '.join('?' * len(param_hashes))})",
+        list(param_hashes),
+    ).fetchall()
+    return [{"参数哈希": h, "inputs": json.loads(i), "outputs": json.loads(o)} for h, i, o in rows]
+
+
+def import_log_entries(entries: list, db_path: str = None) -> int:
+    """
+    将 sensitivity_log.yaml 中的历史记录导入方案库（旧格式先统一结构，无效条目与已导入过的条目跳过），
+    返回新增的方案条数（与已有方案相同的条目只累加命中次数，不计入）
+    """
+    sections = {section[1:]: section for section in SCENARIO_SECTIONS}
+    count = 0
+    conn = _connect(db_path)
+    with conn:
+        for entry in entries:
+            entry = normalize_entry(entry)
+            if entry is None:
+                continue
+            params, outputs = entry["input_parameters"], entry["output_results"]
+            # 已导入过的条目（按规范化后的整条记录哈希）不再计数
+            imported = conn.execute("INSERT OR IGNORE INTO imported_log_entries (entry_hash) VALUES (?)",
+                                    (canonical_hash(entry),))
+            if imported.rowcount == 0:
+                continue
+            inputs = {sections.get(k, k): v for k, v in params.items()}
+            param_hash = scenario_hash(inputs)
+            solar = inputs.get("2光伏发电参数", {})
+            exists = conn.execute("SELECT 1 FROM scenarios WHERE param_hash = ?", (param_hash,)).fetchone()
+            timestamp = str(entry.get("timestamp") or datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            conn.execute(
+                f"""
+                INSERT INTO scenarios (param_hash, province, city, created_at, last_seen_at,
+                                       {", ".join(METRIC_COLUMNS)}, inputs_json, outputs_json)
+                VALUES (?, ?, ?, ?, ?, {", ".join("?" * len(METRIC_COLUMNS))}, ?, ?)
+                ON CONFLICT(param_hash) DO UPDATE SET
+                    hit_count = hit_count + 1,
+                    created_at = MIN(created_at, excluded.created_at),
+                    last_seen_at = MAX(last_seen_at, excluded.last_seen_at)
+                """,
+                [param_hash, solar.get("省份"), solar.get("城市"), timestamp, timestamp,
+                 *[outputs.get(label) for label in METRIC_COLUMNS.values()],
+                 json.dumps(inputs, ensure_ascii=False), json.dumps(outputs, ensure_ascii=False)],
+            )
+            if exists is None:
+                count += 1
+    return count
+
+
+def distinct_values(column: str, db_path: str = None) -> list:
+    if column not in ("province", "city"):
+        raise ValueError(f"不支持的字段：{column}")
+    rows = _connect(db_path).execute(
+        f"SELECT DISTINCT {column} FROM scenarios WHERE {column} IS NOT NULL ORDER BY {column}"
+    ).fetchall()
+    return [r[0] for r in rows]
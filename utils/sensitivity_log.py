@@ -0,0 +1,194 @@
+"""
+敏感性日志（sensitivity_log.yaml）的读取与压缩：
+
+- iter_log_entries：按顶层列表项逐条流式解析，内存占用与日志长度无关；
+- normalize_entry：统一为 timestamp / input_parameters / output_results 结构，
+  兼容旧格式（输入参数 / 输出参数、带序号的模块名），空条目或格式错误的条目返回 None；
+- compact_log：在文件锁内流式重写日志，保留期之外的条目按月汇总
+  （条数、最小 / 最大 / 均值）写入 sensitivity_log_summary.yaml；
+  龙卷风图的全历史统计量（utils.online_stats）在改写前同步、改写后对应到新文件，不因压缩而丢失。
+
+命令行：python -m utils.sensitivity_log --retention-days 90
+"""
+
+import argparse
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+from utils.param_store import atomic_write_yaml, file_lock, read_shared_yaml
+from utils.storage import yaml_dump, yaml_load
+
+LOG_PATH = "sensitivity_log.yaml"
+SUMMARY_PATH = "sensitivity_log_summary.yaml"
+DEFAULT_RETENTION_DAYS = 90
+# 龙卷风图的在线统计量文件（见 utils.online_stats）
+STATS_PATH = "sensitivity_stats.json"
+
+# 旧格式字段名 -> 统一字段名
+_KEY_ALIASES = {
+    "input_parameters": "input_parameters",
+    "输入参数": "input_parameters",
+    "output_results": "output_results",
+    "输出参数": "output_results",
+    "timestamp": "timestamp",
+    "时间": "timestamp",
+}
+
+# user_inputs 中带序号的模块名 -> 日志中的模块名
+_SECTION_ALIASES = {
+    "2光伏发电参数": "光伏发电参数",
+    "3项目建设参数配置": "项目建设参数配置",
+    "4经济分析方法参数配置": "经济分析方法参数配置",
+}
+
+
+def iter_log_entries(path: str = LOG_PATH):
+    """
+    逐条产出日志中的列表项（块格式按行切分，每次只解析一条）
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        head = f.read(16).lstrip()
+        f.seek(0)
+        if head.startswith("["):
+            # 流式风格的整体列表无法按行切分
+            yield from (yaml_load(f) or [])
+            return
+
+        chunk = []
+        for line in f:
+            if line.startswith("-") and chunk:
+                yield from (yaml_load("".join(chunk)) or [])
+                chunk = []
+            if line.strip() or chunk:
+                chunk.append(line)
+        if chunk:
+            yield from (yaml_load("".join(chunk)) or [])
+
+
+def normalize_entry(entry):
+    """
+    统一日志条目结构；输入或输出为空、结构不合法时返回 None
+    """
+    if not isinstance(entry, dict):
+        return None
+
+    normalized = {}
+    for key, value in entry.items():
+        target = _KEY_ALIASES.get(key)
+        if target and value not in (None, {}, ""):
+            normalized[target] = value
+
+    inputs = normalized.get("input_parameters")
+    outputs = normalized.get("output_results")
+    if not isinstance(inputs, dict) or not isinstance(outputs, dict) or not inputs or not outputs:
+        return None
+
+    sections = {}
+    for section, params in inputs.items():
+        if isinstance(params, dict) and params:
+            sections[_SECTION_ALIASES.get(section, section)] = params
+    if not sections:
+        return None
+
+    timestamp = normalized.get("timestamp")
+    return {
+        "timestamp": str(timestamp) if timestamp else None,
+        "input_parameters": sections,
+        "output_results": outputs,
+    }
+
+
+def _summarize(bucket: dict, entry: dict):
+    """
+    将一条日志累加到月度汇总桶：条数、起止时间及各数值字段的 min / max / sum
+    """
+    bucket["条数"] = bucket.get("条数", 0) + 1
+    ts = entry["timestamp"]
+    bucket["起始时间"] = min(bucket.get("起始时间", ts), ts)
+    bucket["结束时间"] = max(bucket.get("结束时间", ts), ts)
+
+    fields = bucket.setdefault("字段", {})
+    values = {f"[输出]{k}": v for k, v in entry["output_results"].items()}
+    for section, params in entry["input_parameters"].items():
+        values.update({f"[输入]{section}/{k}": v for k, v in params.items()})
+    for name, v in values.items():
+        if isinstance(v, bool) or not isinstance(v, (int, float)):
+            continue
+        s = fields.setdefault(name, {"n": 0, "min": v, "max": v, "sum": 0.0})
+        s["n"] += 1
+        s["min"] = min(s["min"], v)
+        s["max"] = max(s["max"], v)
+        s["sum"] += v
+        s["mean"] = s["sum"] / s["n"]
+
+
+def compact_log(path: str = LOG_PATH, summary_path: str = SUMMARY_PATH,
+                retention_days: int = DEFAULT_RETENTION_DAYS, now: datetime = None,
+                stats_path: str = STATS_PATH) -> dict:
+    """
+    压缩日志：统一格式、剔除无效条目，早于保留期的条目并入月度汇总。
+    流式读写，整个过程持有日志文件锁；返回各类条目计数。
+    stats_path 为在线统计量文件，压缩前先同步全部条目、压缩后对应到改写后的日志（None 表示不维护）。
+    """
+    # online_stats 依赖本模块，延迟导入
+    from utils.online_stats import rebase_stats, sync_stats_locked
+
+    cutoff = ((now or datetime.now()) - timedelta(days=retention_days)).strftime("%Y-%m-%d %H:%M:%S")
+    counts = {"读取": 0, "保留": 0, "汇总": 0, "剔除": 0}
+
+    with file_lock(path):
+        stats = sync_stats_locked(path, stats_path) if stats_path else None
+        summary = read_shared_yaml(summary_path, {}) or {}
+        months = summary.setdefault("月度汇总", {})
+        compacted_until = summary.get("汇总截至")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as out:
+                for raw in iter_log_entries(path):
+                    counts["读取"] += 1
+                    entry = normalize_entry(raw)
+                    if entry is None:
+                        counts["剔除"] += 1
+                        continue
+                    ts = entry["timestamp"]
+                    # 已压缩过的日志中不再有保留期之外的条目，重复执行不会重复计数；
+                    # 时间早于上次汇总截至的条目（如后补的记录）同样并入对应月份
+                    if ts and ts < cutoff:
+                        _summarize(months.setdefault(ts[:7], {}), entry)
+                        counts["汇总"] += 1
+                        continue
+                    out.write(yaml_dump([entry]))
+                    counts["保留"] += 1
+
+            if counts["汇总"]:
+                summary["汇总截至"] = max(compacted_until or cutoff, cutoff)
+                atomic_write_yaml(summary_path, summary)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if stats is not None:
+            rebase_stats(stats, path, stats_path)
+
+    return counts
+
+
+def load_summary(summary_path: str = SUMMARY_PATH) -> dict:
+    return (read_shared_yaml(summary_path, {}) or {}).get("月度汇总", {})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="压缩敏感性日志")
+    parser.add_argument("--log", default=LOG_PATH)
+    parser.add_argument("--summary", default=SUMMARY_PATH)
+    parser.add_argument("--retention-days", type=int, default=DEFAULT_RETENTION_DAYS)
+    parser.add_argument("--stats", default=STATS_PATH)
+    args = parser.parse_args()
+    print(compact_log(args.log, args.summary, args.retention_days, stats_path=args.stats))
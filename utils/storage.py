@@ -0,0 +1,183 @@
+"""
+可插拔的文档序列化后端。
+
+- columnar（默认）：按年明细等 “字典列表” 转为按列数组，与其余结构（JSON）一起写入 .npz，
+  读写速度远快于纯 Python YAML，且不依赖 pickle；
+- yaml：人工可读格式，优先使用 libyaml 的 C 加速 Loader / Dumper；
+- 任意后端写出的文档都可以通过 export_yaml 随时导出为 YAML 文本。
+"""
+
+import io
+import json
+import os
+import zipfile
+
+import numpy as np
+import yaml
+
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:  # 未编译 libyaml 时退回纯 Python 实现
+    from yaml import SafeLoader, SafeDumper
+
+DEFAULT_BACKEND = os.environ.get("SOLAR_STORAGE_BACKEND", "columnar")
+
+_TABLE_TAG = "__table__"
+_META_KEY = "__meta__"
+
+
+# ===== YAML =====
+
+def yaml_load(stream):
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def yaml_dump(data, stream=None):
+    return yaml.dump(data, stream, Dumper=SafeDumper, allow_unicode=True)
+
+
+def _dump_yaml(data, f):
+    f.write(yaml_dump(data).encode("utf-8"))
+
+
+def _load_yaml(f):
+    return yaml_load(f.read().decode("utf-8"))
+
+
+# ===== 列式二进制 =====
+
+def _is_table(value) -> bool:
+    """
+    判断是否为可按列存储的记录列表：元素均为键相同、值为数字 / 字符串的字典
+    """
+    if not isinstance(value, list) or not value or not isinstance(value[0], dict):
+        return False
+    keys = list(value[0].keys())
+    for row in value:
+        if not isinstance(row, dict) or list(row.keys()) != keys:
+            return False
+        for v in row.values():
+            if isinstance(v, bool) or not isinstance(v, (int, float, str)):
+                return False
+    return True
+
+
+def _column_array(values: list) -> np.ndarray:
+    if all(isinstance(v, int) for v in values):
+        return np.asarray(values, dtype=np.int64)
+    if all(isinstance(v, (int, float)) for v in values):
+        return np.asarray(values, dtype=np.float64)
+    return np.asarray([str(v) for v in values])
+
+
+def to_columnar(data, arrays: dict):
+    """
+    将嵌套结构中的记录列表替换为列引用，列数组收集到 arrays 中
+    """
+    if _is_table(data):
+        columns = list(data[0].keys())
+        refs = []
+        for col in columns:
+            ref = f"a{len(arrays)}"
+            arrays[ref] = _column_array([row[col] for row in data])
+            refs.append(ref)
+        return {_TABLE_TAG: {"columns": columns, "refs": refs}}
+    if isinstance(data, dict):
+        return {k: to_columnar(v, arrays) for k, v in data.items()}
+    if isinstance(data, list):
+        return [to_columnar(v, arrays) for v in data]
+    return data
+
+
+def from_columnar(data, arrays, as_records: bool = True):
+    """
+    to_columnar 的逆过程；as_records=False 时按年明细以 {列名: ndarray} 形式返回
+    """
+    if isinstance(data, dict) and _TABLE_TAG in data:
+        table = data[_TABLE_TAG]
+        columns = {c: arrays[r] for c, r in zip(table["columns"], table["refs"])}
+        if not as_records:
+            return columns
+        lists = [columns[c].tolist() for c in table["columns"]]
+        return [dict(zip(table["columns"], row)) for row in zip(*lists)]
+    if isinstance(data, dict):
+        return {k: from_columnar(v, arrays, as_records) for k, v in data.items()}
+    if isinstance(data, list):
+        return [from_columnar(v, arrays, as_records) for v in data]
+    return data
+
+
+def _dump_columnar(data, f):
+    arrays = {}
+    structure = to_columnar(data, arrays)
+    meta = np.frombuffer(json.dumps(structure, ensure_ascii=False).encode("utf-8"), dtype=np.uint8)
+    np.savez(f, **{_META_KEY: meta}, **arrays)
+
+
+def _load_columnar(f, as_records: bool = True):
+    with np.load(f, allow_pickle=False) as npz:
+        arrays = {k: npz[k] for k in npz.files}
+    structure = json.loads(arrays.pop(_META_KEY).tobytes().decode("utf-8"))
+    return from_columnar(structure, arrays, as_records)
+
+
+# ===== 后端注册 =====
+
+BACKENDS = {
+    "columnar": {"suffix": ".npz", "dump": _dump_columnar, "load": _load_columnar},
+    "yaml": {"suffix": ".yaml", "dump": _dump_yaml, "load": _load_yaml},
+}
+
+
+def register_backend(name: str, suffix: str, dump, load):
+    """
+    注册新的序列化后端：dump(data, 二进制文件对象)，load(二进制文件对象) -> data
+    """
+    BACKENDS[name] = {"suffix": suffix, "dump": dump, "load": load}
+
+
+def backend_for_path(path: str) -> str:
+    suffix = os.path.splitext(path)[1]
+    for name, backend in BACKENDS.items():
+        if backend["suffix"] == suffix:
+            return name
+    return None
+
+
+def storage_path(path: str, backend: str = None) -> str:
+    """
+    将文档名（如 user_outputs.yaml）映射为所用后端的文件名（如 user_outputs.npz）
+    """
+    backend = backend or DEFAULT_BACKEND
+    return os.path.splitext(path)[0] + BACKENDS[backend]["suffix"]
+
+
+def dumps(data, backend: str = None) -> bytes:
+    buffer = io.BytesIO()
+    BACKENDS[backend or DEFAULT_BACKEND]["dump"](data, buffer)
+    return buffer.getvalue()
+
+
+def loads(raw: bytes, backend: str = None):
+    return BACKENDS[backend or DEFAULT_BACKEND]["load"](io.BytesIO(raw))
+
+
+def load_file(path: str):
+    """
+    按文件后缀选择后端读取
+    """
+    backend = backend_for_path(path)
+    if backend is None:
+        raise ValueError(f"无法识别的存储格式：{path}")
+    with open(path, "rb") as f:
+        try:
+            return BACKENDS[backend]["load"](f)
+        except (zipfile.BadZipFile, ValueError, yaml.YAMLError) as e:
+            raise ValueError(f"读取 {path} 失败：{e}") from e
+
+
+def export_yaml(data) -> str:
+    """
+    导出为人工可读的 YAML 文本
+    """
+    return yaml_dump(data)
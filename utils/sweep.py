@@ -0,0 +1,254 @@
+"""
+超大规模参数扫描（10⁷ 个方案以上）：方案按块流经批量经济模型，
+每个方案的指标（及可选的逐年净现金流）写入磁盘上的 float32 内存映射数组。
+
+- 方案为若干参数取值的笛卡尔积，按编号在块内用 unravel_index 还原，不在内存中展开；
+- 每块只映射本块对应的文件区段，写完即 flush 并释放，进程内存与扫描规模无关；
+- manifest.json 记录扫描定义与已完成块数，每块完成后原子更新，中断后重新运行即从断点继续；
+- open_sweep / load_results 以只读映射打开结果，可按编号区间切片读取。
+
+命令行：
+    python -m utils.sweep run 网格.yaml 输出目录 --base user_inputs.yaml [--chunk-size N] [--cashflows]
+    python -m utils.sweep info 输出目录
+网格文件中键为输入参数名（单位与输入面板一致），值为取值列表或 {min, max, num}。
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.economics import evaluate_metrics, extract_project_params
+from utils.param_loader import PROJECT_FIELDS
+from utils.param_store import atomic_write_bytes
+from utils.result_cache import canonical_hash
+from utils.storage import yaml_load
+
+MANIFEST_NAME = "manifest.json"
+METRICS_FILE = "metrics.f32"
+CASHFLOWS_FILE = "cashflows.f32"
+DEFAULT_CHUNK_SIZE = 50_000
+
+# 写入 metrics.f32 的指标（列顺序）
+METRICS = [
+    "initial_investment", "static_npv", "static_irr", "dynamic_npv",
+    "payback", "dynamic_payback", "breakeven", "total_profit", "roi", "lcoe",
+]
+
+_KEY_TO_FIELD = {key: (name, scale) for name, (_, key, scale) in PROJECT_FIELDS.items()}
+
+
+# ===== 扫描定义 =====
+
+def grid_axes(grid: dict) -> dict:
+    """
+    网格定义（输入参数名 -> 取值列表或 {min, max, num}，面板单位）-> {内部字段名: 计算口径取值数组}
+    """
+    axes = {}
+    for key, values in grid.items():
+        if key not in _KEY_TO_FIELD:
+            raise KeyError(key)
+        name, scale = _KEY_TO_FIELD[key]
+        if isinstance(values, dict):
+            values = np.linspace(float(values["min"]), float(values["max"]), int(values["num"]))
+        values = np.asarray(values, dtype=float).ravel() * scale
+        if values.size == 0:
+            raise ValueError(f"参数“{key}”没有取值")
+        axes[name] = values
+    return axes
+
+
+def scenario_params(base: dict, axes: dict, start: int, stop: int) -> dict:
+    """
+    还原编号 [start, stop) 的方案参数：扫描参数按编号取值，其余取基准值
+    """
+    shape = tuple(len(v) for v in axes.values())
+    index = np.unravel_index(np.arange(start, stop), shape)
+    params = dict(base)
+    for (name, values), idx in zip(axes.items(), index):
+        params[name] = values[idx]
+    return params
+
+
+def _spec(base: dict, axes: dict, chunk_size: int, cashflows: bool) -> dict:
+    n_years = int(max(np.max(axes.get("lifetime", base["lifetime"])), base["lifetime"]))
+    return {
+        "base": {k: float(v) for k, v in base.items()},
+        "axes": {k: v.tolist() for k, v in axes.items()},
+        "n_scenarios": int(np.prod([len(v) for v in axes.values()], dtype=np.int64)),
+        "n_years": n_years,
+        "chunk_size": int(chunk_size),
+        "cashflows": bool(cashflows),
+        "metrics": METRICS,
+    }
+
+
+# ===== 磁盘文件 =====
+
+def _read_manifest(directory: str):
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_manifest(directory: str, manifest: dict):
+    atomic_write_bytes(os.path.join(directory, MANIFEST_NAME),
+                       json.dumps(manifest, ensure_ascii=False, indent=1).encode("utf-8"))
+
+
+def _allocate(path: str, n_rows: int, n_cols: int):
+    """
+    预分配 float32 文件（稀疏文件，不实际占用内存）
+    """
+    with open(path, "wb") as f:
+        f.truncate(n_rows * n_cols * 4)
+
+
+def _map_rows(path: str, n_cols: int, start: int, stop: int, mode: str) -> np.memmap:
+    """
+    只映射 [start, stop) 行对应的文件区段
+    """
+    return np.memmap(path, dtype=np.float32, mode=mode, offset=start * n_cols * 4, shape=(stop - start, n_cols))
+
+
+# ===== 运行 =====
+
+def run_sweep(directory: str, base: dict = None, axes: dict = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+              cashflows: bool = False, progress=None, max_chunks: int = None) -> dict:
+    """
+    运行（或续跑）扫描，返回 manifest。
+    目录中已有 manifest 时按其定义从断点继续；同时给出 base / axes 时须与已有定义一致。
+    progress(已完成方案数, 总方案数) 每块调用一次；max_chunks 限制本次最多计算的块数。
+    """
+    manifest = _read_manifest(directory)
+    if base is not None and axes is not None:
+        spec = _spec(base, axes, chunk_size, cashflows)
+        if manifest is None:
+            os.makedirs(directory, exist_ok=True)
+            _allocate(os.path.join(directory, METRICS_FILE), spec["n_scenarios"], len(METRICS))
+            if cashflows:
+                _allocate(os.path.join(directory, CASHFLOWS_FILE), spec["n_scenarios"], spec["n_years"])
+            manifest = {**spec, "spec_hash": canonical_hash(spec), "completed_chunks": 0,
+                        "created_at": time.strftime("%Y-%m-%d %H:%M:%S")}
+            _write_manifest(directory, manifest)
+        elif manifest["spec_hash"] != canonical_hash(spec):
+            raise ValueError(f"目录 {directory} 中已有不同定义的扫描结果")
+    elif manifest is None:
+        raise FileNotFoundError(os.path.join(directory, MANIFEST_NAME))
+
+    base = manifest["base"]
+    axes = {k: np.asarray(v) for k, v in manifest["axes"].items()}
+    n_total, chunk_size = manifest["n_scenarios"], manifest["chunk_size"]
+    n_chunks = -(-n_total // chunk_size)
+    metrics_path = os.path.join(directory, METRICS_FILE)
+    cashflows_path = os.path.join(directory, CASHFLOWS_FILE)
+
+    done = 0
+    for chunk in range(manifest["completed_chunks"], n_chunks):
+        if max_chunks is not None and done >= max_chunks:
+            break
+        start, stop = chunk * chunk_size, min((chunk + 1) * chunk_size, n_total)
+        result = evaluate_metrics(scenario_params(base, axes, start, stop))
+
+        out = _map_rows(metrics_path, len(METRICS), start, stop, "r+")
+        out[:] = np.column_stack([result[m] for m in METRICS])
+        out.flush()
+        del out
+        if manifest["cashflows"]:
+            net = result["project"]["net"]
+            out = _map_rows(cashflows_path, manifest["n_years"], start, stop, "r+")
+            out[:, :net.shape[1]] = net
+            out[:, net.shape[1]:] = 0
+            out.flush()
+            del out
+
+        # 先落盘数据再更新进度，中断时最多重算一块
+        manifest["completed_chunks"] = chunk + 1
+        manifest["updated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        _write_manifest(directory, manifest)
+        done += 1
+        if progress is not None:
+            progress(stop, n_total)
+
+    return manifest
+
+
+# ===== 读取 =====
+
+def open_sweep(directory: str) -> dict:
+    """
+    只读打开扫描结果：{"manifest", "metrics": (N, 指标数) 映射, "cashflows": (N, 年数) 映射或 None}
+    """
+    manifest = _read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(os.path.join(directory, MANIFEST_NAME))
+    n = manifest["n_scenarios"]
+    metrics = np.memmap(os.path.join(directory, METRICS_FILE), dtype=np.float32, mode="r",
+                        shape=(n, len(manifest["metrics"])))
+    cashflows = None
+    if manifest["cashflows"]:
+        cashflows = np.memmap(os.path.join(directory, CASHFLOWS_FILE), dtype=np.float32, mode="r",
+                              shape=(n, manifest["n_years"]))
+    return {"manifest": manifest, "metrics": metrics, "cashflows": cashflows}
+
+
+def load_results(directory: str, start: int = 0, stop: int = None) -> pd.DataFrame:
+    """
+    读取编号 [start, stop) 的方案参数与指标（只限已完成的部分）
+    """
+    sweep = open_sweep(directory)
+    manifest = sweep["manifest"]
+    completed = min(manifest["completed_chunks"] * manifest["chunk_size"], manifest["n_scenarios"])
+    stop = completed if stop is None else min(stop, completed)
+    start = min(start, stop)
+
+    axes = {k: np.asarray(v) for k, v in manifest["axes"].items()}
+    params = scenario_params({}, axes, start, stop)
+    df = pd.DataFrame({"方案编号": np.arange(start, stop)})
+    for name, values in params.items():
+        df[PROJECT_FIELDS[name][1]] = values / PROJECT_FIELDS[name][2]
+    for i, name in enumerate(manifest["metrics"]):
+        df[name] = np.asarray(sweep["metrics"][start:stop, i])
+    return df
+
+
+def _main():
+    parser = argparse.ArgumentParser(description="大规模参数扫描")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="运行或续跑扫描")
+    run.add_argument("grid_path", help="网格定义 YAML")
+    run.add_argument("directory", help="输出目录")
+    run.add_argument("--base", default="user_inputs.yaml", help="基准参数（输入面板导出的 YAML）")
+    run.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    run.add_argument("--cashflows", action="store_true", help="同时保存逐年净现金流")
+    info = sub.add_parser("info", help="查看扫描进度")
+    info.add_argument("directory")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        manifest = open_sweep(args.directory)["manifest"]
+        completed = min(manifest["completed_chunks"] * manifest["chunk_size"], manifest["n_scenarios"])
+        print(f"已完成 {completed:,} / {manifest['n_scenarios']:,} 个方案")
+        return
+
+    with open(args.grid_path, "r", encoding="utf-8") as f:
+        axes = grid_axes(yaml_load(f) or {})
+    with open(args.base, "r", encoding="utf-8") as f:
+        base = extract_project_params(yaml_load(f))
+
+    started = time.monotonic()
+
+    def report(completed, total):
+        print(f"\r{completed:,} / {total:,}（{time.monotonic() - started:,.0f} 秒）", end="", flush=True)
+
+    manifest = run_sweep(args.directory, base, axes, args.chunk_size, args.cashflows, progress=report)
+    print(f"\n结果已写入 {args.directory}（{manifest['n_scenarios']:,} 个方案）")
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,188 @@
+"""
+批量输入校验：把参数 YAML 中的 min / max / step / options 约束编译为列向量，
+对上传的方案表（每行一个方案，列名为参数名，单位与输入面板一致）整列校验。
+
+- 数值列逐列与下限 / 上限（滑块列另加步长）比较，合并为出错行掩码，
+  只对出错行组成 (出错行数, 参数数) 矩阵区分错误类型；已是数值类型的列不再逐值转换；
+- 选项列（select / select_from_csv）用 isin 整列判断；
+- 只校验表中出现的列，缺失的列由调用方取当前输入值；
+- 返回逐行错误明细（行号、参数、值、错误、约束）。
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.param_loader import SCHEMAS
+
+IRRADIATION_CSV_PATH = "ui_modules/input_ui/input_param_modules/solar_insolation_city.csv"
+
+# 错误类型编码（0 为通过）
+ERROR_TYPES = ["", "不是有效数值", "小于下限", "大于上限", "不符合步长", "不在可选项中"]
+
+ERROR_COLUMNS = ["行号", "参数", "值", "错误", "约束"]
+
+
+def _csv_options() -> dict:
+    try:
+        df = pd.read_csv(IRRADIATION_CSV_PATH)
+    except FileNotFoundError:
+        return {}
+    return {"省份": df["省份"].astype(str).unique(), "城市": df["城市"].astype(str).unique()}
+
+
+def _constraint_text(low: float, high: float, step: float) -> str:
+    parts = []
+    if not np.isnan(low):
+        parts.append(f"≥ {low:g}")
+    if not np.isnan(high):
+        parts.append(f"≤ {high:g}")
+    if not np.isnan(step):
+        parts.append(f"步长 {step:g}")
+    return "，".join(parts) or "数值"
+
+
+def compile_rules(schemas: dict = None, csv_options: dict = None) -> dict:
+    """
+    编译校验规则：
+    numeric 为数值参数名列表，low / high / step 为对应的约束向量（无约束处为 nan），
+    options 为 {参数名: 允许取值}
+    """
+    schemas = SCHEMAS if schemas is None else schemas
+    csv_options = _csv_options() if csv_options is None else csv_options
+
+    names, low, high, step, options = [], [], [], [], {}
+    for params in schemas.values():
+        for key, param in params.items():
+            param_type = param.get("type", "number")
+            if param_type == "select":
+                options[key] = np.asarray([str(o) for o in param.get("options", [])])
+                continue
+            if param_type == "select_from_csv":
+                if key in csv_options:
+                    options[key] = np.asarray(csv_options[key])
+                continue
+            lo, hi = float(param.get("min", np.nan)), float(param.get("max", np.nan))
+            # 上下限相同或颠倒的参数视为范围未配置（与 utils.sensitivity.load_schema_ranges 一致）
+            if not hi > lo:
+                lo = hi = np.nan
+            names.append(key)
+            low.append(lo)
+            high.append(hi)
+            # 面板中只有滑块按步长取值
+            step.append(float(param["step"]) if param_type == "slider" and "step" in param else np.nan)
+
+    # 年辐射量来自城市数据，只要求为有效数值
+    if "年辐射量" not in names:
+        names.append("年辐射量")
+        low.append(0.0)
+        high.append(np.nan)
+        step.append(np.nan)
+
+    constraint = [_constraint_text(*c) for c in zip(low, high, step)]
+    constraint += ["、".join(o[:10]) + ("等" if len(o) > 10 else "") for o in options.values()]
+    constraint_texts, constraint_index = np.unique(constraint, return_inverse=True)
+    return {
+        "numeric": names,
+        "low": np.asarray(low),
+        "high": np.asarray(high),
+        "step": np.asarray(step),
+        "options": options,
+        # 全部参数（数值在前、选项在后）及其约束说明，错误明细中按位置编码
+        "labels": names + list(options),
+        "constraint_texts": list(constraint_texts),
+        "constraint_index": constraint_index,
+    }
+
+
+def _numeric_column(column: pd.Series) -> np.ndarray:
+    """
+    转为浮点数组；已是数值类型的列直接取值，其余逐值转换（无法转换的记为 nan）
+    """
+    if pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column):
+        return column.to_numpy(dtype=float, na_value=np.nan)
+    return pd.to_numeric(column, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+
+def validate_frame(df: pd.DataFrame, rules: dict = None) -> pd.DataFrame:
+    """
+    校验方案表，返回错误明细 DataFrame（列见 ERROR_COLUMNS，行号从 1 开始）；为空表示全部通过
+    """
+    rules = compile_rules() if rules is None else rules
+    # 各部分错误：(行位置, 参数编号, 值, 错误类型编码)
+    parts = []
+
+    # ===== 数值列：矩阵化比较 =====
+    positions = np.asarray([i for i, name in enumerate(rules["numeric"]) if name in df.columns], dtype=int)
+    if len(positions) and len(df):
+        low, high, step = rules["low"][positions], rules["high"][positions], rules["step"][positions]
+        names = [rules["numeric"][i] for i in positions]
+
+        # 逐列一次比较，合并为出错行掩码：无约束处取最大有限值，NaN 与 ±inf 均不满足
+        largest = np.finfo(float).max
+        floor = np.where(np.isnan(low), -largest, low)
+        ceiling = np.where(np.isnan(high), largest, high)
+        origin = np.where(np.isnan(low), 0.0, low)
+        values = []
+        bad = np.zeros(len(df), dtype=bool)
+        for j, name in enumerate(names):
+            column = _numeric_column(df[name])
+            values.append(column)
+            with np.errstate(invalid="ignore"):
+                ok = (column >= floor[j]) & (column <= ceiling[j])
+                if not np.isnan(step[j]):
+                    offset = (column - origin[j]) / step[j]
+                    ok &= np.abs(offset - np.rint(offset)) <= 1e-6
+            bad |= ~ok
+
+        # 只对出错行区分错误类型
+        bad_rows = np.flatnonzero(bad)
+        if len(bad_rows):
+            sub = np.column_stack([column[bad_rows] for column in values])
+            with np.errstate(invalid="ignore"):
+                offset = (sub - origin) / step
+                code = np.select(
+                    [~np.isfinite(sub), sub < low, sub > high, np.abs(offset - np.rint(offset)) > 1e-6],
+                    [1, 2, 3, 4],
+                    default=0,
+                )
+            rows, cols = np.nonzero(code)
+            shown = df[names].iloc[bad_rows].to_numpy(dtype=object)[rows, cols]
+            parts.append((bad_rows[rows], positions[cols], shown, code[rows, cols]))
+
+    # ===== 选项列 =====
+    offset = len(rules["numeric"])
+    for i, (name, allowed) in enumerate(rules["options"].items()):
+        if name not in df.columns:
+            continue
+        column = df[name]
+        rows = np.flatnonzero(~column.isin(allowed).to_numpy())
+        # 数值型选项（如 CSV 读入的整数）按字符串再比较一次
+        if len(rows) and column.dtype != object:
+            rows = rows[~column.iloc[rows].astype(str).isin(allowed).to_numpy()]
+        if len(rows):
+            parts.append((rows, np.full(len(rows), offset + i), column.to_numpy(dtype=object)[rows],
+                          np.full(len(rows), ERROR_TYPES.index("不在可选项中"))))
+
+    if not parts:
+        return pd.DataFrame(columns=ERROR_COLUMNS)
+
+    rows, fields, shown, codes = (np.concatenate(arrays) for arrays in zip(*parts))
+    order = np.argsort(rows, kind="stable")
+    rows, fields, shown, codes = rows[order], fields[order], shown[order], codes[order]
+    # 参数 / 错误 / 约束取值很少，用分类编码避免逐条构造字符串
+    return pd.DataFrame({
+        "行号": rows + 1,
+        "参数": pd.Categorical.from_codes(fields, rules["labels"]),
+        "值": shown,
+        "错误": pd.Categorical.from_codes(codes, ERROR_TYPES),
+        "约束": pd.Categorical.from_codes(rules["constraint_index"][fields], rules["constraint_texts"]),
+    })
+
+
+def invalid_rows(errors: pd.DataFrame, n_rows: int) -> np.ndarray:
+    """
+    由错误明细得到形状 (n_rows,) 的布尔数组，True 表示该行有错误
+    """
+    mask = np.zeros(n_rows, dtype=bool)
+    mask[errors["行号"].to_numpy(dtype=int) - 1] = True
+    return mask
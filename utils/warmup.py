@@ -0,0 +1,128 @@
+"""
+启动预热：进程启动后在后台线程中完成首个用户原本要承担的开销。
+
+- 执行一遍全部输出模块（含各子模块文件夹），完成 plotly / numpy_financial 等依赖的导入；
+- 解析参数 YAML、城市辐射量 CSV 与高分辨率辐照数据；
+- 对默认配置（参数 YAML 中的默认值，江苏 / 南京）及历史库中评估次数最多的前 N 个配置，
+  调用各模块可选的 warmup(inputs) 钩子，把计算结果写入进程级结果缓存（utils.result_cache）。
+
+模块的 warmup(inputs) 只做纯计算，不调用任何 st.*，且须与页面使用相同的缓存命名空间和参数。
+
+环境变量：SOLAR_WARMUP（设为 0 关闭）、SOLAR_WARMUP_TOP_N（默认 5）
+"""
+
+import glob
+import importlib.util
+import os
+import threading
+import time
+
+import pandas as pd
+
+from utils.irradiance import get_grid
+from utils.param_loader import SCHEMAS
+from utils.scenario_store import DB_PATH, load_scenarios, query_scenarios
+
+WARMUP_ENABLED = os.environ.get("SOLAR_WARMUP", "1") != "0"
+TOP_N = int(os.environ.get("SOLAR_WARMUP_TOP_N", "5"))
+
+OUTPUT_MODULE_FOLDER = "ui_modules/output_ui/output_modules"
+IRRADIATION_CSV_PATH = "ui_modules/input_ui/input_param_modules/solar_insolation_city.csv"
+
+_lock = threading.Lock()
+_thread = None
+_status = {"state": "未启动", "configs": 0, "seconds": None, "errors": []}
+
+
+def default_inputs() -> dict:
+    """
+    与输入面板未做任何修改时写入的 user_inputs 结构一致
+    """
+    cities = pd.read_csv(IRRADIATION_CSV_PATH)
+    inputs = {}
+    for section, params in SCHEMAS.items():
+        values = {}
+        for key, param in params.items():
+            default = param.get("default", "")
+            if param.get("type") == "select":
+                options = param.get("options", [])
+                default = default if default in options else options[0]
+            values[key] = default
+        if "年辐射量" not in values and "城市" in values:
+            # 光伏发电参数：省市联动得到年辐射量（与输入面板一致）
+            row = cities[(cities["省份"] == values.get("省份")) & (cities["城市"] == values["城市"])]
+            values["年辐射量"] = float(row["年辐射量"].values[0]) if not row.empty else 0.0
+        inputs[section] = values
+    return inputs
+
+
+def popular_inputs(n: int = TOP_N) -> list:
+    """
+    历史库中评估次数最多的前 n 个配置（库不存在时为空，不因预热而创建）
+    """
+    if n <= 0 or not os.path.exists(DB_PATH):
+        return []
+    hashes = query_scenarios(order_by="hit_count", limit=n)["参数哈希"].tolist()
+    return [scenario["inputs"] for scenario in load_scenarios(hashes)]
+
+
+def load_plugin_modules(folder: str = OUTPUT_MODULE_FOLDER) -> list:
+    """
+    执行全部输出模块与子模块文件，返回成功加载的模块；加载失败的留给页面渲染时提示
+    """
+    modules = []
+    for file_path in sorted(glob.glob(os.path.join(folder, "*.py")) + glob.glob(os.path.join(folder, "*", "*.py"))):
+        module_name = os.path.splitext(os.path.basename(file_path))[0]
+        spec = importlib.util.spec_from_file_location(module_name, file_path)
+        module = importlib.util.module_from_spec(spec)
+        try:
+            spec.loader.exec_module(module)
+        except Exception as e:
+            _status["errors"].append(f"{module_name}：{e}")
+            continue
+        modules.append(module)
+    return modules
+
+
+def run_warmup(top_n: int = TOP_N):
+    started = time.monotonic()
+    _status["state"] = "进行中"
+
+    modules = load_plugin_modules()
+    get_grid()
+
+    configs = [default_inputs()]
+    try:
+        configs += popular_inputs(top_n)
+    except Exception as e:
+        _status["errors"].append(f"历史方案：{e}")
+
+    for inputs in configs:
+        for module in modules:
+            hook = getattr(module, "warmup", None)
+            if hook is None:
+                continue
+            try:
+                hook(inputs)
+            except Exception as e:
+                _status["errors"].append(f"{module.__name__}：{e}")
+
+    _status.update(state="完成", configs=len(configs), seconds=time.monotonic() - started)
+
+
+def start_warmup():
+    """
+    每个进程只启动一次的后台预热（守护线程，不阻塞页面）
+    """
+    global _thread
+    if not WARMUP_ENABLED:
+        return
+    with _lock:
+        if _thread is not None:
+            return
+        _thread = threading.Thread(target=run_warmup, name="solar-warmup", daemon=True)
+        _thread.start()
+
+
+def warmup_status() -> dict:
+    return dict(_status)